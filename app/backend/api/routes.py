@@ -1,10 +1,18 @@
-from flask import Blueprint, request, jsonify, send_file
+from flask import Blueprint, Response, request, jsonify, send_file, stream_with_context
 from werkzeug.utils import secure_filename
 import os
+import json
+import time
+import uuid
+import zipfile
 import logging
 
-from ..processors import PPTParser, DataExtractor, OutputGenerator
-from ..utils import FileHandler
+from ..processors import (
+    PPTParser, DataExtractor, XMLDataExtractor, ExtractionOptions, OutputGenerator, PresentationCache,
+    ExtractionCache, AssetStore, ColumnarExport, BrandProfileRegistry, BrandingHistory,
+    OutputCache
+)
+from ..utils import FileHandler, UploadSessionManager, SearchIndex, JobQueue, JobWorker, JobWorkerPool
 
 logger = logging.getLogger(__name__)
 
@@ -12,8 +20,46 @@ api = Blueprint('api', __name__)
 
 UPLOAD_DIR = os.path.join(os.path.dirname(__file__), '..', 'uploads')
 OUTPUT_DIR = os.path.join(os.path.dirname(__file__), '..', 'outputs')
+CACHE_DIR = os.path.join(os.path.dirname(__file__), '..', 'cache')
+BRAND_CONFIG_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'config', 'branding_config.json')
 
-file_handler = FileHandler(UPLOAD_DIR, OUTPUT_DIR)
+PRESENTATION_CACHE_MAX_BYTES = 512 * 1024 * 1024
+EXTRACTION_CACHE_MAX_BYTES = 256 * 1024 * 1024
+OUTPUT_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+OUTPUT_CACHE_MAX_AGE = 24 * 3600
+ASSET_MAX_AGE = 365 * 24 * 3600
+ASSET_RETENTION_HOURS = 7 * 24
+EXTRACTION_ENGINES = ('pptx', 'xml')
+DEFAULT_EXTRACTION_ENGINE = 'pptx'
+DEFAULT_BRANDING_ENGINE = 'xml'
+BRANDING_WORKERS = os.cpu_count() or 1
+BRANDING_PARALLEL_THRESHOLD = OutputGenerator.PARALLEL_THRESHOLD
+JOB_WORKERS = os.cpu_count() or 1
+JOB_EVENT_INTERVAL = 0.5
+JOB_EVENT_KEEPALIVE = 15
+BATCH_MAX_INFLIGHT_FILES = os.cpu_count() or 1
+BATCH_MAX_FILES = 500
+BATCH_MAX_INFLIGHT_BYTES = 512 * 1024 * 1024
+BATCH_POLL_INTERVAL = 0.2
+
+file_handler = FileHandler(UPLOAD_DIR, OUTPUT_DIR, content_addressed=True)
+presentation_cache = PresentationCache(max_bytes=PRESENTATION_CACHE_MAX_BYTES)
+upload_sessions = UploadSessionManager(file_handler)
+extraction_cache = ExtractionCache(
+    os.path.join(CACHE_DIR, 'extractions'),
+    max_bytes=EXTRACTION_CACHE_MAX_BYTES
+)
+asset_store = AssetStore(os.path.join(CACHE_DIR, 'assets'))
+search_index = SearchIndex(os.path.join(CACHE_DIR, 'search.db'))
+SEARCH_INDEX_OPTIONS = ExtractionOptions.parse('text,tables,notes')
+brand_profiles = BrandProfileRegistry(BRAND_CONFIG_PATH)
+branding_history = BrandingHistory(os.path.join(CACHE_DIR, 'branding_history'))
+output_cache = OutputCache(
+    os.path.join(CACHE_DIR, 'outputs'),
+    OUTPUT_DIR,
+    max_bytes=OUTPUT_CACHE_MAX_BYTES,
+    max_age=OUTPUT_CACHE_MAX_AGE
+)
 
 
 @api.route('/health', methods=['GET'])
@@ -35,37 +81,158 @@ def upload_file():
         if file.filename == '':
             return jsonify({'error': 'No file selected'}), 400
         
-        file_path = file_handler.save_uploaded_file(file)
+        saved = file_handler.stream_uploaded_file(file)
         
-        if not file_path:
+        if not saved:
             return jsonify({'error': 'Invalid file or file too large'}), 400
         
-        try:
-            parser = PPTParser(file_path)
-            parser.load_presentation()
+        return _describe_upload(saved, file.filename)
+    
+    except Exception as e:
+        logger.error(f"Upload error: {str(e)}")
+        return jsonify({'error': 'Upload failed'}), 500
+
+
+def _describe_upload(saved, filename):
+    file_path = saved['path']
+    file_id = os.path.basename(file_path)
+    
+    try:
+        cached = file_handler.get_cached_inspection(saved['sha256'])
+        
+        if cached:
+            info = cached['info']
+            validation = cached['validation']
+        else:
+            parser = PPTParser(file_path, cache=presentation_cache)
             validation = parser.validate_presentation_structure()
             info = parser.get_presentation_info()
-            
-            file_id = os.path.basename(file_path)
-            
-            return jsonify({
-                'success': True,
-                'file_id': file_id,
-                'filename': secure_filename(file.filename),
+            file_handler.cache_inspection(saved['sha256'], {
                 'info': info,
                 'validation': validation
-            }), 200
+            })
         
-        except Exception as e:
-            file_handler.delete_file(file_path)
-            logger.error(f"Error processing uploaded file: {str(e)}")
-            return jsonify({'error': f'Invalid PowerPoint file: {str(e)}'}), 400
+        _index_upload(file_id, saved['sha256'], secure_filename(filename), file_path)
+        
+        return jsonify({
+            'success': True,
+            'file_id': file_id,
+            'filename': secure_filename(filename),
+            'info': info,
+            'validation': validation,
+            'deduplicated': saved['deduplicated']
+        }), 200
     
     except Exception as e:
-        logger.error(f"Upload error: {str(e)}")
+        presentation_cache.invalidate(file_path)
+        file_handler.delete_file(file_path)
+        logger.error(f"Error processing uploaded file: {str(e)}")
+        return jsonify({'error': f'Invalid PowerPoint file: {str(e)}'}), 400
+
+
+def _index_upload(file_id, digest, filename, file_path):
+    # Search indexing must never fail an upload that validated. Content
+    # indexed before is copied here; a new deck's text is extracted by a
+    # job worker, so the upload does not wait for a full parse.
+    try:
+        if not search_index.index_known_digest(file_id, digest, filename):
+            job_queue.enqueue('index', {'file_id': file_id, 'digest': digest, 'filename': filename})
+            job_workers.ensure_started()
+    except Exception as e:
+        logger.warning(f"Could not index {file_id} for search: {str(e)}")
+
+
+@api.route('/upload/sessions', methods=['POST'])
+def create_upload_session():
+    try:
+        data = request.get_json()
+        
+        if not data or 'filename' not in data or 'total_size' not in data:
+            return jsonify({'error': 'filename and total_size are required'}), 400
+        
+        session = upload_sessions.create_session(
+            data['filename'],
+            int(data['total_size']),
+            int(data.get('chunk_size', UploadSessionManager.DEFAULT_CHUNK_SIZE))
+        )
+        
+        return jsonify({
+            'success': True,
+            'session': session
+        }), 201
+    
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Upload session error: {str(e)}")
+        return jsonify({'error': 'Could not create upload session'}), 500
+
+
+@api.route('/upload/sessions/<session_id>', methods=['GET'])
+def get_upload_session(session_id):
+    try:
+        return jsonify({
+            'success': True,
+            'session': upload_sessions.get_status(session_id)
+        }), 200
+    
+    except KeyError:
+        return jsonify({'error': 'Upload session not found'}), 404
+
+
+@api.route('/upload/sessions/<session_id>/chunks/<int:index>', methods=['PUT'])
+def upload_chunk(session_id, index):
+    try:
+        session = upload_sessions.write_chunk(session_id, index, request.stream)
+        
+        return jsonify({
+            'success': True,
+            'session': session
+        }), 200
+    
+    except KeyError:
+        return jsonify({'error': 'Upload session not found'}), 404
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Chunk upload error: {str(e)}")
+        return jsonify({'error': 'Chunk upload failed'}), 500
+
+
+@api.route('/upload/sessions/<session_id>/finalize', methods=['POST'])
+def finalize_upload_session(session_id):
+    try:
+        filename = upload_sessions.get_status(session_id)['filename']
+        saved = upload_sessions.finalize(session_id)
+        
+        if not saved:
+            return jsonify({'error': 'Invalid file or file too large'}), 400
+        
+        return _describe_upload(saved, filename)
+    
+    except KeyError:
+        return jsonify({'error': 'Upload session not found'}), 404
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Finalize upload error: {str(e)}")
         return jsonify({'error': 'Upload failed'}), 500
 
 
+@api.route('/upload/sessions/<session_id>', methods=['DELETE'])
+def abort_upload_session(session_id):
+    try:
+        upload_sessions.abort(session_id)
+        
+        return jsonify({
+            'success': True,
+            'message': 'Upload session aborted'
+        }), 200
+    
+    except KeyError:
+        return jsonify({'error': 'Upload session not found'}), 404
+
+
 @api.route('/process', methods=['POST'])
 def process_presentation():
     try:
@@ -80,25 +247,355 @@ def process_presentation():
         if not os.path.exists(file_path):
             return jsonify({'error': 'File not found'}), 404
         
-        branding_config = data.get('branding_config', None)
+        profile, engine, mode, error = _parse_branding_options(data)
+        if error:
+            return jsonify({'error': error}), 400
         
-        generator = OutputGenerator(file_path, OUTPUT_DIR)
-        output_path = generator.generate_enhanced_presentation(branding_config)
+        # Only the client knows which uploads are revisions of one deck, so
+        # slides are reused from earlier outputs only when it names a lineage.
+        lineage = data.get('lineage')
+        if lineage is not None and not isinstance(lineage, str):
+            return jsonify({'error': 'lineage must be a string'}), 400
+        
+        if data.get('async'):
+            # The compiled profile's normalized config travels with the job,
+            # so later edits to the profile file do not change queued work.
+            job_id = job_queue.enqueue('process', {
+                'file_id': file_id,
+                'profile': {'name': profile.name, 'config': profile.config},
+                'engine': engine,
+                'mode': mode,
+                'lineage': lineage
+            })
+            job_workers.ensure_started()
+            
+            return jsonify({
+                'success': True,
+                'job_id': job_id,
+                'status_url': f'/api/jobs/{job_id}',
+                'events_url': f'/api/jobs/{job_id}/events',
+                'message': 'Processing queued'
+            }), 202
         
-        if not generator.validate_output(output_path):
+        result = _brand_presentation(file_path, profile, engine, mode, lineage, BRANDING_WORKERS)
+        if result is None:
             return jsonify({'error': 'Output validation failed'}), 500
         
-        output_file_id = os.path.basename(output_path)
+        return jsonify(dict(result, success=True, message='Presentation processed successfully')), 200
+    
+    except ValueError as e:
+        return jsonify({'error': f'Invalid branding config: {str(e)}'}), 400
+    except Exception as e:
+        logger.error(f"Processing error: {str(e)}")
+        return jsonify({'error': f'Processing failed: {str(e)}'}), 500
+
+
+def _parse_branding_options(data):
+    # Returns (profile, engine, mode, error); error is a message for a 400.
+    try:
+        profile = brand_profiles.resolve(data.get('profile'), data.get('branding_config'))
+    except KeyError:
+        return None, None, None, f"Unknown brand profile: {data.get('profile')}"
+    
+    engine = data.get('engine', DEFAULT_BRANDING_ENGINE)
+    if engine not in OutputGenerator.ENGINES:
+        return None, None, None, f"engine must be one of {', '.join(OutputGenerator.ENGINES)}"
+    
+    mode = data.get('mode', 'shapes')
+    if mode not in OutputGenerator.MODES:
+        return None, None, None, f"mode must be one of {', '.join(OutputGenerator.MODES)}"
+    
+    return profile, engine, mode, None
+
+
+def _brand_presentation(file_path, profile, engine, mode, lineage, workers, progress=None):
+    # Shared by /process and its job workers; None when the output fails validation.
+    digest = file_handler.get_file_digest(file_path)
+    variant = OutputCache.variant(profile.hash, mode)
+    output_file_id = output_cache.get(digest, variant)
+    if output_file_id is not None:
+        return {
+            'output_file_id': output_file_id,
+            'profile': {'name': profile.name, 'hash': profile.hash},
+            'cached': True,
+            'slides_reused': 0
+        }
+    
+    generator = OutputGenerator(file_path, OUTPUT_DIR, cache=presentation_cache, engine=engine, mode=mode,
+                                history=branding_history, lineage=lineage, workers=workers,
+                                parallel_threshold=BRANDING_PARALLEL_THRESHOLD, progress=progress)
+    output_path = generator.generate_enhanced_presentation(profile=profile)
+    
+    if not generator.validate_output(output_path):
+        return None
+    
+    output_cache.put(digest, variant, output_path)
+    return {
+        'output_file_id': os.path.basename(output_path),
+        'profile': {'name': profile.name, 'hash': profile.hash},
+        'cached': False,
+        'slides_reused': generator.reused_slides
+    }
+
+
+def run_job(kind, params, progress):
+    # Entry point of the job worker processes. Each worker runs one deck at
+    # a time, so decks are branded serially within it; daemonic workers
+    # could not start a process pool anyway. Batches fan out as one
+    # 'process' job per deck instead.
+    if kind == 'batch':
+        return _run_batch(params, progress)
+    if kind == 'index':
+        return _run_index(params)
+    if kind != 'process':
+        raise ValueError(f"Unknown job kind: {kind}")
+    
+    file_path = os.path.join(UPLOAD_DIR, params['file_id'])
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"File not found: {params['file_id']}")
+    
+    profile = brand_profiles.compile(params['profile']['config'], params['profile']['name'])
+    result = _brand_presentation(file_path, profile, params['engine'], params['mode'], params['lineage'], 1,
+                                 progress)
+    if result is None:
+        raise RuntimeError('Output validation failed')
+    return result
+
+
+def _run_index(params):
+    file_id, digest, filename = params['file_id'], params['digest'], params['filename']
+    file_path = os.path.join(UPLOAD_DIR, file_id)
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"File not found: {file_id}")
+    
+    # An upload of the same content may have been indexed since this was queued.
+    if not search_index.index_known_digest(file_id, digest, filename):
+        slides = XMLDataExtractor(file_path, options=SEARCH_INDEX_OPTIONS).extract_all_data()['slides']
+        search_index.index_deck(file_id, digest, filename, slides)
+    return {'file_id': file_id}
+
+
+job_queue = JobQueue(os.path.join(CACHE_DIR, 'jobs.db'))
+job_workers = JobWorkerPool(job_queue.db_path, run_job, JOB_WORKERS)
+
+
+@api.record_once
+def _resume_jobs(state):
+    # Jobs queued or interrupted before a restart are picked up as soon as
+    # the app is created, not when the next async job happens to arrive.
+    try:
+        job_workers.start_if_pending()
+    except Exception as e:
+        logger.error(f"Could not resume pending jobs: {str(e)}")
+
+
+@api.route('/process/batch', methods=['POST'])
+def process_batch():
+    try:
+        data = request.get_json()
+        
+        file_ids = data.get('file_ids') if data else None
+        if not file_ids or not isinstance(file_ids, list) or not all(isinstance(f, str) for f in file_ids):
+            return jsonify({'error': 'file_ids must be a non-empty list of file ids'}), 400
+        
+        if len(file_ids) > BATCH_MAX_FILES:
+            return jsonify({'error': f'At most {BATCH_MAX_FILES} files per batch'}), 400
+        
+        # The profile is compiled once here; its normalized config travels
+        # with the job and every deck job compiles it through the
+        # registry's cache, once per worker.
+        lineages = data.get('lineages', {})
+        if not isinstance(lineages, dict) or not all(isinstance(v, str) for v in lineages.values()):
+            return jsonify({'error': 'lineages must map file ids to lineage strings'}), 400
+        
+        profile, engine, mode, error = _parse_branding_options(data)
+        if error:
+            return jsonify({'error': error}), 400
+        
+        job_id = job_queue.enqueue('batch', {
+            'file_ids': file_ids,
+            'lineages': lineages,
+            'profile': {'name': profile.name, 'config': profile.config},
+            'engine': engine,
+            'mode': mode
+        })
+        job_workers.ensure_started()
         
         return jsonify({
             'success': True,
-            'output_file_id': output_file_id,
-            'message': 'Presentation processed successfully'
+            'job_id': job_id,
+            'status_url': f'/api/jobs/{job_id}',
+            'events_url': f'/api/jobs/{job_id}/events',
+            'message': f'Batch of {len(file_ids)} files queued'
+        }), 202
+    
+    except ValueError as e:
+        return jsonify({'error': f'Invalid branding config: {str(e)}'}), 400
+    except Exception as e:
+        logger.error(f"Batch processing error: {str(e)}")
+        return jsonify({'error': f'Batch processing failed: {str(e)}'}), 500
+
+
+def _run_batch(params, progress):
+    # Queues one 'process' job per deck while at most
+    # BATCH_MAX_INFLIGHT_FILES decks and BATCH_MAX_INFLIGHT_BYTES of input
+    # are outstanding, so the job workers brand them in parallel. While
+    # waiting, this worker runs deck jobs itself (never other batches), so
+    # a batch also completes with a single worker.
+    file_ids = params['file_ids']
+    results = [{'file_id': file_id} for file_id in file_ids]
+    pending = []
+    for index, file_id in enumerate(file_ids):
+        file_id = secure_filename(file_id)
+        file_path = os.path.join(UPLOAD_DIR, file_id)
+        if not file_id or not os.path.exists(file_path):
+            results[index].update(success=False, error='File not found')
+        else:
+            pending.append((index, file_id, os.path.getsize(file_path)))
+    pending.reverse()
+    
+    helper = JobWorker(job_queue, run_job)
+    in_flight = {}
+    in_flight_bytes = 0
+    done = len(file_ids) - len(pending)
+    progress(done, len(file_ids))
+    
+    while pending or in_flight:
+        while pending and len(in_flight) < BATCH_MAX_INFLIGHT_FILES and (
+                not in_flight or in_flight_bytes + pending[-1][2] <= BATCH_MAX_INFLIGHT_BYTES):
+            index, file_id, size = pending.pop()
+            child_id = job_queue.enqueue('process', {
+                'file_id': file_id,
+                'profile': params['profile'],
+                'engine': params['engine'],
+                'mode': params['mode'],
+                'lineage': params.get('lineages', {}).get(file_ids[index])
+            })
+            in_flight[child_id] = (index, size)
+            in_flight_bytes += size
+        
+        if not helper.run_once(kinds=('process',)):
+            time.sleep(BATCH_POLL_INTERVAL)
+        
+        for child_id in list(in_flight):
+            child = job_queue.get(child_id)
+            if child is None or child['state'] in ('done', 'failed'):
+                index, size = in_flight.pop(child_id)
+                in_flight_bytes -= size
+                done += 1
+                if child is not None and child['state'] == 'done':
+                    results[index].update(child['result'], success=True)
+                else:
+                    results[index].update(success=False, error=child['error'] if child else 'Job lost')
+        # Also keeps this job's lease fresh while decks are in flight.
+        progress(done, len(file_ids))
+    
+    profile = brand_profiles.compile(params['profile']['config'], params['profile']['name'])
+    succeeded = sum(1 for result in results if result['success'])
+    return {
+        'archive_id': _write_batch_archive(results),
+        'profile': {'name': profile.name, 'hash': profile.hash},
+        'succeeded': succeeded,
+        'failed': len(results) - succeeded,
+        'results': results
+    }
+
+
+def _write_batch_archive(results):
+    # Bundles the outputs under their upload's original file name, recorded
+    # on each result as archive_name. Decks are already compressed, so
+    # members are stored as-is. None when nothing succeeded.
+    succeeded = [result for result in results if result['success']]
+    if not succeeded:
+        return None
+    
+    archive_id = f"batch_{uuid.uuid4().hex}.zip"
+    names = set()
+    with zipfile.ZipFile(os.path.join(OUTPUT_DIR, archive_id), 'w', zipfile.ZIP_STORED) as archive:
+        for result in succeeded:
+            stem, ext = os.path.splitext(result['file_id'].split('_', 1)[-1])
+            name = f"{stem}{ext}"
+            counter = 1
+            while name in names:
+                counter += 1
+                name = f"{stem}_{counter}{ext}"
+            names.add(name)
+            
+            archive.write(os.path.join(OUTPUT_DIR, result['output_file_id']), name)
+            result['archive_name'] = name
+    
+    return archive_id
+
+
+@api.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    try:
+        job = job_queue.get(job_id)
+        if job is None:
+            return jsonify({'error': 'Job not found'}), 404
+        
+        if job['state'] in ('queued', 'running'):
+            job_workers.ensure_started()
+        
+        return jsonify({
+            'success': True,
+            'job': job
         }), 200
     
     except Exception as e:
-        logger.error(f"Processing error: {str(e)}")
-        return jsonify({'error': f'Processing failed: {str(e)}'}), 500
+        logger.error(f"Job status error: {str(e)}")
+        return jsonify({'error': 'Failed to get job status'}), 500
+
+
+@api.route('/jobs/<job_id>/events', methods=['GET'])
+def job_events(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    if job['state'] in ('queued', 'running'):
+        job_workers.ensure_started()
+    
+    def generate():
+        # Polls the queue and sends the job whenever its state or progress
+        # changes, ending with a 'done' or 'failed' event.
+        last = None
+        last_sent = time.monotonic()
+        while True:
+            job = job_queue.get(job_id)
+            if job is None:
+                yield 'event: failed\ndata: {"error": "Job not found"}\n\n'
+                return
+            
+            snapshot = (job['state'], job['progress']['done'], job['progress']['total'])
+            if snapshot != last:
+                last = snapshot
+                last_sent = time.monotonic()
+                event = job['state'] if job['state'] in ('done', 'failed') else 'progress'
+                yield f"event: {event}\ndata: {json.dumps(job)}\n\n"
+                if event != 'progress':
+                    return
+            elif time.monotonic() - last_sent >= JOB_EVENT_KEEPALIVE:
+                last_sent = time.monotonic()
+                yield ': keepalive\n\n'
+            
+            time.sleep(JOB_EVENT_INTERVAL)
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+@api.route('/profiles', methods=['GET'])
+def list_profiles():
+    try:
+        return jsonify({
+            'success': True,
+            'profiles': brand_profiles.list_profiles()
+        }), 200
+    
+    except Exception as e:
+        logger.error(f"Profile listing error: {str(e)}")
+        return jsonify({'error': 'Failed to list profiles'}), 500
 
 
 @api.route('/extract', methods=['POST'])
@@ -115,8 +612,38 @@ def extract_data():
         if not os.path.exists(file_path):
             return jsonify({'error': 'File not found'}), 404
         
-        extractor = DataExtractor(file_path)
-        extracted_data = extractor.extract_all_data()
+        engine = data.get('engine', DEFAULT_EXTRACTION_ENGINE)
+        if engine not in EXTRACTION_ENGINES:
+            return jsonify({'error': f"engine must be one of {', '.join(EXTRACTION_ENGINES)}"}), 400
+        
+        try:
+            options = ExtractionOptions.parse(
+                data.get('fields', request.args.get('fields')),
+                data.get('slides', request.args.get('slides'))
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # Full results are cached and projections are served from them;
+        # requests that never walk slides (metadata only) skip the cache.
+        use_cache = options.walk_slides and options.can_project_full_result()
+        digest = file_handler.get_file_digest(file_path) if use_cache else None
+        variant = f"v{DataExtractor.EXTRACTOR_VERSION}-{engine}"
+        full_data = extraction_cache.get(digest, variant) if use_cache else None
+        extracted_data = options.project(full_data) if full_data is not None else None
+        
+        asset_ids = None
+        if extracted_data is None and options.wants('images'):
+            asset_ids = asset_store.export_deck(file_path, digest or file_handler.get_file_digest(file_path))
+        
+        if _wants_ndjson():
+            return _stream_extraction(file_path, engine, options, extracted_data, asset_ids)
+        
+        if extracted_data is None:
+            extractor = _make_extractor(file_path, engine, options, asset_ids)
+            extracted_data = extractor.extract_all_data()
+            if use_cache and options.is_default:
+                extraction_cache.put(digest, variant, extracted_data)
         
         return jsonify({
             'success': True,
@@ -128,6 +655,142 @@ def extract_data():
         return jsonify({'error': f'Extraction failed: {str(e)}'}), 500
 
 
+def _wants_ndjson():
+    if request.args.get('stream') in ('1', 'true'):
+        return True
+    best = request.accept_mimetypes.best_match(['application/json', 'application/x-ndjson'])
+    return best == 'application/x-ndjson'
+
+
+def _make_extractor(file_path, engine, options=None, asset_ids=None):
+    if engine == 'xml':
+        return XMLDataExtractor(file_path, options=options, asset_ids=asset_ids)
+    return DataExtractor(file_path, cache=presentation_cache, options=options, asset_ids=asset_ids)
+
+
+def _stream_extraction(file_path, engine, options, cached_data=None, asset_ids=None):
+    if cached_data is not None:
+        records = [{'type': 'slide', 'data': slide} for slide in cached_data.get('slides', [])]
+        for section in ('branding', 'metadata'):
+            if section in cached_data:
+                records.append({'type': section, 'data': cached_data[section]})
+    else:
+        records = _make_extractor(file_path, engine, options, asset_ids).iter_records()
+    
+    def generate():
+        try:
+            for record in records:
+                yield json.dumps(record, separators=(',', ':')) + '\n'
+        except Exception as e:
+            logger.error(f"Streaming extraction error: {str(e)}")
+            yield json.dumps({'type': 'error', 'error': f'Extraction failed: {str(e)}'}) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
+@api.route('/export/columnar', methods=['POST'])
+def export_columnar():
+    try:
+        data = request.get_json()
+        
+        if not data or not data.get('file_ids'):
+            return jsonify({'error': 'file_ids is required'}), 400
+        
+        engine = data.get('engine', 'xml')
+        if engine not in EXTRACTION_ENGINES:
+            return jsonify({'error': f"engine must be one of {', '.join(EXTRACTION_ENGINES)}"}), 400
+        
+        file_paths = [os.path.join(UPLOAD_DIR, secure_filename(file_id)) for file_id in data['file_ids']]
+        missing = [os.path.basename(path) for path in file_paths if not os.path.exists(path)]
+        if missing:
+            return jsonify({'error': 'File not found', 'missing': missing}), 404
+        
+        export = ColumnarExport()
+        for file_path in file_paths:
+            extractor = _make_extractor(file_path, engine, ColumnarExport.EXPORT_OPTIONS)
+            export.add_deck(extractor, os.path.basename(file_path))
+        
+        export_id = f"columnar_{uuid.uuid4().hex}.zip"
+        row_counts = export.save_archive(os.path.join(OUTPUT_DIR, export_id))
+        
+        return jsonify({
+            'success': True,
+            'export_id': export_id,
+            'rows': row_counts
+        }), 200
+    
+    except Exception as e:
+        logger.error(f"Columnar export error: {str(e)}")
+        return jsonify({'error': f'Export failed: {str(e)}'}), 500
+
+
+@api.route('/search', methods=['GET'])
+def search_decks():
+    try:
+        query = request.args.get('q', '')
+        limit = request.args.get('limit', SearchIndex.DEFAULT_LIMIT, type=int)
+        
+        try:
+            results = search_index.search(query, limit=limit)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        return jsonify({
+            'success': True,
+            'query': query,
+            'results': results
+        }), 200
+    
+    except Exception as e:
+        logger.error(f"Search error: {str(e)}")
+        return jsonify({'error': 'Search failed'}), 500
+
+
+@api.route('/assets/<asset_id>', methods=['GET'])
+def download_asset(asset_id):
+    try:
+        asset_path = asset_store.find(asset_id)
+        
+        if not asset_path:
+            return jsonify({'error': 'Asset not found'}), 404
+        
+        # Asset ids are content hashes, so responses never go stale. Media
+        # comes from uploaded decks, so anything but plain raster images is
+        # sent as an opaque download that browsers will not render here.
+        if AssetStore.serves_inline(asset_path):
+            response = send_file(os.path.abspath(asset_path), max_age=ASSET_MAX_AGE)
+        else:
+            response = send_file(
+                os.path.abspath(asset_path),
+                mimetype='application/octet-stream',
+                as_attachment=True,
+                download_name=os.path.basename(asset_path),
+                max_age=ASSET_MAX_AGE
+            )
+        response.headers['X-Content-Type-Options'] = 'nosniff'
+        response.headers['Content-Security-Policy'] = "default-src 'none'; sandbox"
+        return response
+    
+    except Exception as e:
+        logger.error(f"Asset download error: {str(e)}")
+        return jsonify({'error': 'Download failed'}), 500
+
+
+@api.route('/assets/<asset_id>/thumbnail', methods=['GET'])
+def download_asset_thumbnail(asset_id):
+    try:
+        thumbnail_path = asset_store.find_thumbnail(asset_id)
+        
+        if not thumbnail_path:
+            return jsonify({'error': 'Thumbnail not found'}), 404
+        
+        return send_file(os.path.abspath(thumbnail_path), mimetype='image/png', max_age=ASSET_MAX_AGE)
+    
+    except Exception as e:
+        logger.error(f"Thumbnail download error: {str(e)}")
+        return jsonify({'error': 'Download failed'}), 500
+
+
 @api.route('/download/<file_id>', methods=['GET'])
 def download_file(file_id):
     try:
@@ -136,11 +799,15 @@ def download_file(file_id):
         if not os.path.exists(file_path):
             return jsonify({'error': 'File not found'}), 404
         
+        mimetype = 'application/vnd.openxmlformats-officedocument.presentationml.presentation'
+        if file_id.endswith('.zip'):
+            mimetype = 'application/zip'
+        
         return send_file(
             file_path,
             as_attachment=True,
             download_name=file_id,
-            mimetype='application/vnd.openxmlformats-officedocument.presentationml.presentation'
+            mimetype=mimetype
         )
     
     except Exception as e:
@@ -174,8 +841,15 @@ def list_files():
 @api.route('/cleanup', methods=['POST'])
 def cleanup_files():
     try:
-        file_handler.cleanup_old_files(UPLOAD_DIR, max_age_hours=24)
+        removed = file_handler.cleanup_old_files(UPLOAD_DIR, max_age_hours=24)
+        search_index.remove(os.path.basename(path) for path in removed)
         file_handler.cleanup_old_files(OUTPUT_DIR, max_age_hours=24)
+        output_cache.evict()
+        extraction_cache.evict()
+        asset_store.collect_garbage(max_age_hours=ASSET_RETENTION_HOURS)
+        job_queue.remove_finished(max_age_hours=24)
+        upload_sessions.cleanup_stale_sessions(max_age_hours=24)
+        presentation_cache.clear()
         
         return jsonify({
             'success': True,
@@ -42,9 +42,16 @@ def create_app(config=None):
             'endpoints': {
                 'health': '/api/health',
                 'upload': '/api/upload',
+                'upload_sessions': '/api/upload/sessions',
                 'process': '/api/process',
+                'process_batch': '/api/process/batch',
+                'profiles': '/api/profiles',
+                'jobs': '/api/jobs/<job_id>',
                 'extract': '/api/extract',
+                'search': '/api/search',
+                'export_columnar': '/api/export/columnar',
                 'download': '/api/download/<file_id>',
+                'assets': '/api/assets/<asset_id>',
                 'files': '/api/files',
                 'cleanup': '/api/cleanup'
             }
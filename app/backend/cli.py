@@ -0,0 +1,312 @@
+import argparse
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import List, Tuple
+
+from .processors import (
+    DataExtractor, XMLDataExtractor, ExtractionOptions, ColumnarExport, OutputGenerator, BrandProfileRegistry
+)
+from .processors.branding_history import BRANDING_VERSION
+from .utils import BatchRunner, CheckpointManifest
+from .utils.checkpoint_manifest import file_digest
+
+logger = logging.getLogger(__name__)
+
+BRAND_CONFIG_PATH = os.path.join(os.path.dirname(__file__), '..', 'config', 'branding_config.json')
+CHECKPOINT_NAME = '.checkpoint.jsonl'
+PROGRESS_INTERVAL = 5.0
+MAX_INFLIGHT_MB = 512
+
+
+def _walk_decks(paths: List[str]) -> List[Tuple[str, str]]:
+    # (path, path relative to the input it was found under)
+    decks = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirnames, filenames in os.walk(path):
+                dirnames.sort()
+                decks.extend(
+                    (os.path.join(root, filename), os.path.relpath(os.path.join(root, filename), path))
+                    for filename in sorted(filenames)
+                    if filename.lower().endswith('.pptx') and not filename.startswith('~$')
+                )
+        else:
+            decks.append((path, os.path.basename(path)))
+    return decks
+
+
+def _collect_decks(paths: List[str]) -> List[str]:
+    return [path for path, _ in _walk_decks(paths)]
+
+
+def _make_extractor(path: str, engine: str, options=None):
+    if engine == 'xml':
+        return XMLDataExtractor(path, options=options)
+    return DataExtractor(path, options=options)
+
+
+def export_columnar(args) -> int:
+    decks = _collect_decks(args.inputs)
+    if not decks:
+        print("No .pptx files found", file=sys.stderr)
+        return 1
+    
+    export = ColumnarExport()
+    failed = 0
+    for path in decks:
+        try:
+            export.add_deck(_make_extractor(path, args.engine, ColumnarExport.EXPORT_OPTIONS), path)
+        except Exception as e:
+            failed += 1
+            logger.error(f"Skipping {path}: {str(e)}")
+    
+    if args.output.endswith('.zip'):
+        counts = export.save_archive(args.output)
+    else:
+        counts = export.save(args.output)
+    
+    print(f"Exported {len(decks) - failed} decks to {args.output}: " +
+          ', '.join(f"{table}={rows}" for table, rows in counts.items()))
+    return 1 if failed else 0
+
+
+def _init_worker(level: int):
+    logging.getLogger().setLevel(level)
+
+
+def _brand_deck(path: str, target: str, profile, engine: str, mode: str) -> str:
+    # Runs in a pool worker: the same generator and validation as /process.
+    # The output is moved into place only once valid, so an interrupted run
+    # never leaves a partial deck behind.
+    digest = file_digest(path)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    work_dir = tempfile.mkdtemp(prefix='.brand-', dir=os.path.dirname(target))
+    try:
+        generator = OutputGenerator(path, work_dir, engine=engine, mode=mode)
+        output_path = generator.generate_enhanced_presentation(profile=profile)
+        if not generator.validate_output(output_path):
+            raise RuntimeError('Output validation failed')
+        os.replace(output_path, target)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return digest
+
+
+def _extract_deck(path: str, target: str, engine: str, options: ExtractionOptions) -> str:
+    # Runs in a pool worker; writes what /extract returns as data.
+    digest = file_digest(path)
+    data = _make_extractor(path, engine, options).extract_all_data()
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    temp_path = f"{target}.part"
+    with open(temp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(temp_path, target)
+    return digest
+
+
+def _format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+
+class ProgressReporter:
+    """Prints decks done, throughput and ETA at most every ``interval`` seconds."""
+    
+    def __init__(self, total: int, interval: float = PROGRESS_INTERVAL, stream=None):
+        self.total = total
+        self.interval = interval
+        self.stream = stream or sys.stderr
+        self.started = time.monotonic()
+        self._last = self.started
+    
+    def update(self, done: int, failed: int):
+        now = time.monotonic()
+        if done < self.total and now - self._last < self.interval:
+            return
+        self._last = now
+        
+        elapsed = now - self.started
+        rate = done / elapsed if elapsed > 0 else 0.0
+        eta = _format_duration((self.total - done) / rate) if rate else '-'
+        print(f"{done}/{self.total} decks ({failed} failed), {rate:.2f} decks/s, "
+              f"elapsed {_format_duration(elapsed)}, ETA {eta}", file=self.stream, flush=True)
+
+
+def _run_bulk(args, signature, output_name, worker, worker_args) -> int:
+    # Shared by brand and extract: skips decks the checkpoint manifest has
+    # finished, runs the rest in a process pool and records each success.
+    output_root = os.path.abspath(args.output)
+    decks = [
+        (path, os.path.join(output_root, output_name(relpath)))
+        for path, relpath in _walk_decks(args.inputs)
+        if not os.path.abspath(path).startswith(output_root + os.sep)
+    ]
+    if not decks:
+        print("No .pptx files found", file=sys.stderr)
+        return 1
+    
+    checkpoint = args.checkpoint or os.path.join(output_root, CHECKPOINT_NAME)
+    with CheckpointManifest(checkpoint, signature) as manifest:
+        pending = []
+        for path, target in decks:
+            entry = manifest.find(path)
+            if entry is None and manifest.has_entries:
+                # Renamed, copied or touched files are matched by content.
+                digest = file_digest(path)
+                entry = manifest.find_digest(digest)
+                if entry is not None:
+                    if entry['output'] != target:
+                        os.makedirs(os.path.dirname(target), exist_ok=True)
+                        shutil.copyfile(entry['output'], target)
+                    manifest.record(path, digest, target)
+            if entry is None:
+                pending.append((path, target))
+        
+        skipped = len(decks) - len(pending)
+        if skipped:
+            print(f"Skipping {skipped} decks already done according to {checkpoint}", file=sys.stderr)
+        
+        progress = ProgressReporter(len(pending), args.progress_interval)
+        runner = BatchRunner(args.workers, max_bytes=args.max_inflight_mb * 1024 * 1024,
+                             initializer=_init_worker, initargs=(logging.getLogger().level,))
+        failed = 0
+        try:
+            tasks = [(path, target) + worker_args for path, target in pending]
+            weights = [os.path.getsize(path) for path, _ in pending]
+            for done, (index, digest, error) in enumerate(runner.run(worker, tasks, weights), 1):
+                path, target = pending[index]
+                if error is not None:
+                    failed += 1
+                    logger.error(f"Failed {path}: {str(error)}")
+                else:
+                    manifest.record(path, digest, target)
+                progress.update(done, failed)
+        finally:
+            runner.close()
+    
+    print(f"Processed {len(pending) - failed} decks into {args.output}, skipped {skipped}, failed {failed} "
+          f"in {_format_duration(time.monotonic() - progress.started)}")
+    return 1 if failed else 0
+
+
+def brand(args) -> int:
+    try:
+        overrides = None
+        if args.branding_config:
+            with open(args.branding_config, 'r') as f:
+                overrides = json.load(f)
+        profile = BrandProfileRegistry(args.profiles).resolve(args.profile, overrides)
+    except KeyError:
+        print(f"Unknown brand profile: {args.profile}", file=sys.stderr)
+        return 2
+    except (OSError, ValueError) as e:
+        print(f"Invalid branding config: {str(e)}", file=sys.stderr)
+        return 2
+    
+    # Both engines write identical output, so the engine is not part of
+    # the signature, as in the API's output cache.
+    signature = {'command': 'brand', 'profile': profile.hash, 'mode': args.mode, 'version': BRANDING_VERSION}
+    return _run_bulk(args, signature, lambda relpath: relpath, _brand_deck, (profile, args.engine, args.mode))
+
+
+def extract(args) -> int:
+    try:
+        options = ExtractionOptions.parse(args.fields, args.slides)
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return 2
+    
+    signature = {
+        'command': 'extract',
+        'engine': args.engine,
+        'fields': sorted(options.fields),
+        'slides': sorted(options.slides) if options.slides is not None else None,
+        'version': DataExtractor.EXTRACTOR_VERSION
+    }
+    return _run_bulk(args, signature, lambda relpath: os.path.splitext(relpath)[0] + '.json', _extract_deck,
+                     (args.engine, options))
+
+
+def summarize_columnar(args) -> int:
+    import numpy as np
+    
+    tables = ColumnarExport.load(args.directory)
+    runs = tables['runs']
+    fonts = tables['dictionaries']['fonts']
+    
+    sizes = runs['font_size'][~np.isnan(runs['font_size'])]
+    values, counts = np.unique(sizes, return_counts=True)
+    print(f"{len(tables['dictionaries']['decks'])} decks, {len(tables['slides']['slide'])} slides, "
+          f"{len(runs['font'])} runs")
+    print("Font sizes (pt):")
+    for value, count in zip(values, counts):
+        print(f"  {value:g}\t{count}")
+    
+    font_ids = runs['font'][runs['font'] >= 0]
+    font_counts = np.bincount(font_ids, minlength=len(fonts)) if len(fonts) else np.empty(0, dtype=np.int64)
+    print("Fonts:")
+    for font_id in np.argsort(font_counts)[::-1]:
+        if font_counts[font_id]:
+            print(f"  {fonts[font_id]}\t{font_counts[font_id]}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m backend.cli', description='PowerPoint processing tools')
+    parser.add_argument('-v', '--verbose', action='store_true')
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    columnar = commands.add_parser('export-columnar', help='Export decks as flat .npy column tables')
+    columnar.add_argument('inputs', nargs='+', help='.pptx files or directories')
+    columnar.add_argument('-o', '--output', required=True, help='Output directory, or a .zip path')
+    columnar.add_argument('--engine', choices=('xml', 'pptx'), default='xml')
+    columnar.set_defaults(handler=export_columnar)
+    
+    summary = commands.add_parser('summarize-columnar', help='Font statistics over a columnar export')
+    summary.add_argument('directory')
+    summary.set_defaults(handler=summarize_columnar)
+    
+    branding = commands.add_parser('brand', help='Brand decks the way /api/process does')
+    _add_bulk_arguments(branding, 'Output directory; decks keep their paths relative to the input')
+    branding.add_argument('--profile', help='Brand profile name or hash (default: the default profile)')
+    branding.add_argument('--profiles', default=BRAND_CONFIG_PATH, help='Brand profile file')
+    branding.add_argument('--branding-config', help='JSON file overriding parts of the profile')
+    branding.add_argument('--engine', choices=OutputGenerator.ENGINES, default='xml')
+    branding.add_argument('--mode', choices=OutputGenerator.MODES, default='shapes')
+    branding.set_defaults(handler=brand)
+    
+    extraction = commands.add_parser('extract', help='Extract deck data as JSON the way /api/extract does')
+    _add_bulk_arguments(extraction, 'Output directory; one .json per deck, mirroring the input paths')
+    extraction.add_argument('--engine', choices=('xml', 'pptx'), default='pptx')
+    extraction.add_argument('--fields', help='Comma-separated fields, as for /api/extract')
+    extraction.add_argument('--slides', help='1-based slide selection such as 1-10,12')
+    extraction.set_defaults(handler=extract)
+    
+    return parser
+
+
+def _add_bulk_arguments(parser: argparse.ArgumentParser, output_help: str):
+    parser.add_argument('inputs', nargs='+', help='.pptx files or directories, walked recursively')
+    parser.add_argument('-o', '--output', required=True, help=output_help)
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count() or 1, help='Worker processes')
+    parser.add_argument('--max-inflight-mb', type=int, default=MAX_INFLIGHT_MB,
+                        help='Only start decks while the input sizes in flight stay within this many MB')
+    parser.add_argument('--checkpoint', help=f'Checkpoint manifest (default: <output>/{CHECKPOINT_NAME})')
+    parser.add_argument('--progress-interval', type=float, default=PROGRESS_INTERVAL,
+                        help='Seconds between progress reports')
+
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.getLogger().setLevel(logging.INFO if args.verbose else logging.WARNING)
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,5 +2,34 @@ from .ppt_parser import PPTParser
 from .data_extractor import DataExtractor
 from .branding_engine import BrandingEngine
 from .output_generator import OutputGenerator
+from .presentation_cache import PresentationCache
+from .pptx_inspector import PPTXInspector
+from .extraction_cache import ExtractionCache
+from .xml_extractor import XMLDataExtractor
+from .collectors import Collector, ExtractionPass
+from .extraction_options import ExtractionOptions
+from .asset_store import AssetStore
+from .columnar_export import ColumnarExport
+from .brand_profiles import BrandProfile, BrandProfileRegistry
+from .branding_history import BrandingHistory
+from .output_cache import OutputCache
 
-__all__ = ['PPTParser', 'DataExtractor', 'BrandingEngine', 'OutputGenerator']
+__all__ = [
+    'PPTParser',
+    'DataExtractor',
+    'BrandingEngine',
+    'OutputGenerator',
+    'PresentationCache',
+    'PPTXInspector',
+    'ExtractionCache',
+    'XMLDataExtractor',
+    'Collector',
+    'ExtractionPass',
+    'ExtractionOptions',
+    'AssetStore',
+    'ColumnarExport',
+    'BrandProfile',
+    'BrandProfileRegistry',
+    'BrandingHistory',
+    'OutputCache',
+]
@@ -0,0 +1,273 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import posixpath
+import re
+import threading
+import time
+import zipfile
+
+logger = logging.getLogger(__name__)
+
+
+def _write_thumbnail(source: str, target: str, size: Tuple[int, int]) -> bool:
+    from PIL import Image
+    
+    try:
+        with Image.open(source) as image:
+            image.thumbnail(size)
+            if image.mode not in ('RGB', 'RGBA'):
+                image = image.convert('RGBA')
+            temp_path = f"{target}.{os.getpid()}.tmp"
+            image.save(temp_path, format='PNG')
+        os.replace(temp_path, target)
+        return True
+    except Exception as e:
+        logger.warning(f"Could not create thumbnail for {source}: {str(e)}")
+        return False
+
+
+class AssetStore:
+    """Content-addressed store of the images embedded in decks.
+    
+    Each image is stored once under its SHA-256, whichever deck or slide it
+    came from, with a PNG thumbnail next to it. The asset ids of a deck are
+    remembered by deck digest so re-exporting a known deck reads nothing.
+    A missing thumbnail is attempted again whenever a deck containing the
+    image is exported. ``collect_garbage`` drops deck indexes unused for a
+    while and the images no remaining index refers to.
+    """
+    
+    IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tif', '.tiff', '.emf', '.wmf', '.svg'}
+    # Formats Pillow can rasterize; vector images get no thumbnail.
+    THUMBNAIL_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tif', '.tiff'}
+    # Raster formats browsers render without running anything. Others, SVG
+    # above all since it can carry script, are only served as downloads.
+    INLINE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.bmp'}
+    MEDIA_PREFIX = 'ppt/media/'
+    THUMBNAIL_SIZE = (256, 256)
+    THUMBNAIL_SUFFIX = '.thumb.png'
+    POOL_MIN_IMAGES = 4
+    ASSET_ID_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+    
+    def __init__(self, asset_dir: str, max_workers: Optional[int] = None):
+        self.asset_dir = asset_dir
+        self.deck_dir = os.path.join(asset_dir, 'decks')
+        self.max_workers = max_workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        os.makedirs(self.deck_dir, exist_ok=True)
+    
+    def export_deck(self, ppt_path: str, deck_digest: Optional[str] = None) -> Dict[str, str]:
+        if deck_digest:
+            known = self._load_deck_index(deck_digest)
+            if known is not None:
+                return known
+        
+        asset_ids = {}
+        seen = set()
+        pending = []
+        new = 0
+        
+        with zipfile.ZipFile(ppt_path) as archive:
+            for info in archive.infolist():
+                ext = posixpath.splitext(info.filename)[1].lower()
+                if not info.filename.startswith(self.MEDIA_PREFIX) or ext not in self.IMAGE_EXTENSIONS:
+                    continue
+                
+                blob = archive.read(info)
+                asset_id = hashlib.sha256(blob).hexdigest()
+                asset_ids[info.filename] = asset_id
+                
+                if asset_id in seen:
+                    continue
+                seen.add(asset_id)
+                
+                stored = self._store_blob(asset_id, ext, blob)
+                if ext in self.THUMBNAIL_EXTENSIONS and not os.path.exists(self.thumbnail_path(asset_id)):
+                    pending.append(asset_id)
+                new += stored
+        
+        self._make_thumbnails(pending)
+        
+        if deck_digest:
+            self._save_deck_index(deck_digest, asset_ids)
+        
+        logger.info(
+            f"Exported {len(seen)} unique images from {os.path.basename(ppt_path)} "
+            f"({new} new)"
+        )
+        return asset_ids
+    
+    def _shard_dir(self, asset_id: str) -> str:
+        return os.path.join(self.asset_dir, asset_id[:2])
+    
+    def _store_blob(self, asset_id: str, ext: str, blob: bytes) -> bool:
+        existing = self.find(asset_id)
+        if existing:
+            # Marks the image as used for collect_garbage.
+            os.utime(existing)
+            return False
+        
+        shard_dir = self._shard_dir(asset_id)
+        os.makedirs(shard_dir, exist_ok=True)
+        path = os.path.join(shard_dir, f"{asset_id}{ext}")
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        
+        with open(temp_path, 'wb') as f:
+            f.write(blob)
+        os.replace(temp_path, path)
+        return True
+    
+    def _make_thumbnails(self, asset_ids: List[str]):
+        jobs = [(self.find(asset_id), self.thumbnail_path(asset_id)) for asset_id in asset_ids]
+        if not jobs:
+            return
+        
+        if len(jobs) < self.POOL_MIN_IMAGES:
+            for source, target in jobs:
+                _write_thumbnail(source, target, self.THUMBNAIL_SIZE)
+            return
+        
+        pool = self._get_pool()
+        try:
+            futures = [
+                pool.submit(_write_thumbnail, source, target, self.THUMBNAIL_SIZE)
+                for source, target in jobs
+            ]
+            for future in futures:
+                future.result()
+        except BrokenProcessPool:
+            # Thumbnails still missing are made on the next export.
+            logger.error('Thumbnail worker process died; starting a fresh pool next time')
+            with self._pool_lock:
+                if self._pool is pool:
+                    self._pool = None
+            pool.shutdown(wait=False, cancel_futures=True)
+    
+    def _get_pool(self) -> ProcessPoolExecutor:
+        # Started on first use with the spawn method, so request threads are
+        # never forked, and kept for later exports.
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._pool
+    
+    def close(self):
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+    
+    def find(self, asset_id: str) -> Optional[str]:
+        if not self.ASSET_ID_PATTERN.match(asset_id or ''):
+            return None
+        
+        shard_dir = self._shard_dir(asset_id)
+        try:
+            filenames = os.listdir(shard_dir)
+        except FileNotFoundError:
+            return None
+        
+        for filename in filenames:
+            stem, ext = os.path.splitext(filename)
+            if stem == asset_id and ext.lower() in self.IMAGE_EXTENSIONS:
+                return os.path.join(shard_dir, filename)
+        return None
+    
+    @classmethod
+    def serves_inline(cls, asset_path: str) -> bool:
+        return os.path.splitext(asset_path)[1].lower() in cls.INLINE_EXTENSIONS
+    
+    def thumbnail_path(self, asset_id: str) -> str:
+        return os.path.join(self._shard_dir(asset_id), f"{asset_id}{self.THUMBNAIL_SUFFIX}")
+    
+    def find_thumbnail(self, asset_id: str) -> Optional[str]:
+        if not self.ASSET_ID_PATTERN.match(asset_id or ''):
+            return None
+        path = self.thumbnail_path(asset_id)
+        return path if os.path.exists(path) else None
+    
+    def _deck_index_path(self, deck_digest: str) -> str:
+        return os.path.join(self.deck_dir, f"{deck_digest}.json")
+    
+    def _load_deck_index(self, deck_digest: str) -> Optional[Dict[str, str]]:
+        try:
+            with open(self._deck_index_path(deck_digest), 'r') as f:
+                asset_ids = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        # Assets removed from disk since the deck was indexed are re-exported.
+        if not all(self.find(asset_id) for asset_id in set(asset_ids.values())):
+            return None
+        try:
+            # Marks the index as used for collect_garbage.
+            os.utime(self._deck_index_path(deck_digest))
+        except OSError:
+            pass
+        return asset_ids
+    
+    def _save_deck_index(self, deck_digest: str, asset_ids: Dict[str, str]):
+        path = self._deck_index_path(deck_digest)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump(asset_ids, f)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not save asset index for {deck_digest[:12]}: {str(e)}")
+    
+    def collect_garbage(self, max_age_hours: int) -> int:
+        """Drop deck indexes unused for ``max_age_hours`` and unreferenced images.
+        
+        An image is kept while a remaining deck index refers to it or it was
+        stored within ``max_age_hours``, which also covers exports still in
+        progress. Returns the number of images removed.
+        """
+        cutoff = time.time() - max_age_hours * 3600
+        referenced = set()
+        for entry in os.scandir(self.deck_dir):
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    self._remove(entry.path)
+                    continue
+                if entry.name.endswith('.json'):
+                    with open(entry.path, 'r') as f:
+                        referenced.update(json.load(f).values())
+            except (OSError, ValueError, AttributeError) as e:
+                logger.warning(f"Could not read asset index {entry.path}: {str(e)}")
+        
+        removed = 0
+        for shard in os.scandir(self.asset_dir):
+            if not shard.is_dir() or shard.path == self.deck_dir:
+                continue
+            # An image, its thumbnail and any temporary files go together.
+            files: Dict[str, List[Tuple[float, str]]] = {}
+            for entry in os.scandir(shard.path):
+                try:
+                    files.setdefault(entry.name.split('.', 1)[0], []).append((entry.stat().st_mtime, entry.path))
+                except FileNotFoundError:
+                    continue
+            for asset_id, entries in files.items():
+                if asset_id in referenced or max(mtime for mtime, _ in entries) >= cutoff:
+                    continue
+                for _, path in entries:
+                    self._remove(path)
+                removed += 1
+        
+        logger.info(f"Removed {removed} unreferenced images from the asset store")
+        return removed
+    
+    def _remove(self, path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
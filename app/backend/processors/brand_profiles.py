@@ -0,0 +1,413 @@
+from pptx.util import Pt, Inches, Length
+from pptx.enum.text import PP_ALIGN
+from pptx.dml.color import RGBColor
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional, NamedTuple, Tuple
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BRAND_CONFIG = {
+    'fonts': {
+        'primary': 'Frutiger LT',
+        'fallback': ['Calibri', 'Arial', 'Helvetica'],
+        'title_size': 44,
+        'heading_size': 32,
+        'body_size': 18,
+        'small_size': 14
+    },
+    'colors': {
+        'primary': [0, 102, 204],
+        'secondary': [102, 102, 102],
+        'accent': [255, 107, 53],
+        'text_dark': [51, 51, 51],
+        'text_light': [255, 255, 255],
+        'background': [255, 255, 255]
+    },
+    'spacing': {
+        'title_margin_top': 0.5,
+        'heading_margin_top': 0.3,
+        'body_margin_top': 0.2,
+        'line_spacing': 1.2
+    },
+    'alignment': {
+        'title': 'center',
+        'heading': 'left',
+        'body': 'left'
+    },
+    'transparency': {
+        'image_overlay': 0.85,
+        'background': 1.0
+    },
+    'classification': {
+        'first_slide_title_top': 2.0,
+        'title_top': 1.5,
+        'heading_text_length': 50,
+        'heading_min_width': 5.0,
+        'title_font_size': 28,
+        'heading_font_size': 20
+    },
+    'logo': {
+        'enabled': False,
+        'path': None,
+        'width': 1.5,
+        'position': {
+            'left': 0.5,
+            'top': 0.5
+        }
+    }
+}
+
+ALIGNMENTS = {
+    'left': PP_ALIGN.LEFT,
+    'center': PP_ALIGN.CENTER,
+    'right': PP_ALIGN.RIGHT,
+    'justify': PP_ALIGN.JUSTIFY,
+    'distribute': PP_ALIGN.DISTRIBUTE
+}
+
+SHAPE_TYPES = ('title', 'heading', 'body', 'small')
+FONT_SIZES = ('title_size', 'heading_size', 'body_size', 'small_size')
+
+
+class ShapeThresholds(NamedTuple):
+    # Lengths and font sizes in EMU. A shape is a title when it sits above
+    # ``title_top`` (``first_slide_title_top`` on the first slide), a heading
+    # when its text is shorter than ``heading_text_length`` characters and it
+    # is wider than ``heading_min_width``, and otherwise a title or heading
+    # when its first run is larger than the matching font size.
+    first_slide_title_top: int
+    title_top: int
+    heading_text_length: int
+    heading_min_width: int
+    title_font_size: int
+    heading_font_size: int
+
+
+class ShapePlan(NamedTuple):
+    font: str
+    size: Length
+    bold: bool
+    color: RGBColor
+    alignment: Any
+    line_spacing: float
+
+
+def _merge(base: Dict[str, Any], overrides: Dict[str, Any]) -> Dict[str, Any]:
+    merged = copy.deepcopy(base)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            # Leaves may be RGBColor or PP_ALIGN values, which are immutable
+            # but do not survive deepcopy.
+            merged[key] = copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+    return merged
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _normalize_color(name: str, value) -> List[int]:
+    if isinstance(value, str):
+        text = value.lstrip('#')
+        if len(text) == 6:
+            try:
+                return list(RGBColor.from_string(text.upper()))
+            except ValueError:
+                pass
+    elif isinstance(value, (list, tuple)) and len(value) == 3 and \
+            all(isinstance(c, int) and not isinstance(c, bool) and 0 <= c <= 255 for c in value):
+        return list(value)
+    raise ValueError(f"colors.{name} must be [r, g, b] or a hex string, got {value!r}")
+
+
+def _normalize_alignment(name: str, value) -> str:
+    if isinstance(value, str) and value.lower() in ALIGNMENTS:
+        return value.lower()
+    for key, alignment in ALIGNMENTS.items():
+        if value is alignment:
+            return key
+    raise ValueError(f"alignment.{name} must be one of {', '.join(ALIGNMENTS)}, got {value!r}")
+
+
+def normalize_config(config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    # Returns the config merged over the defaults in plain-JSON form: colors
+    # as [r, g, b], alignments as names, margins in inches, so equal brands
+    # hash equally however they were written.
+    if config is not None and not isinstance(config, dict):
+        raise ValueError("Branding config must be an object")
+    
+    unknown = set(config or {}) - set(DEFAULT_BRAND_CONFIG)
+    if unknown:
+        raise ValueError(f"Unknown branding config sections: {', '.join(sorted(unknown))}")
+    for section, value in (config or {}).items():
+        if not isinstance(value, dict):
+            raise ValueError(f"{section} must be an object")
+    
+    merged = _merge(DEFAULT_BRAND_CONFIG, config or {})
+    
+    fonts = merged['fonts']
+    if not isinstance(fonts['primary'], str) or not fonts['primary'].strip():
+        raise ValueError("fonts.primary must be a non-empty string")
+    if not isinstance(fonts['fallback'], list) or not all(isinstance(f, str) for f in fonts['fallback']):
+        raise ValueError("fonts.fallback must be a list of font names")
+    for key in FONT_SIZES:
+        if not _is_number(fonts[key]) or not 1 <= fonts[key] <= 4000:
+            raise ValueError(f"fonts.{key} must be a point size between 1 and 4000")
+    
+    merged['colors'] = {
+        name: _normalize_color(name, value) for name, value in merged['colors'].items()
+    }
+    merged['alignment'] = {
+        name: _normalize_alignment(name, value) for name, value in merged['alignment'].items()
+    }
+    
+    spacing = merged['spacing']
+    for key, value in spacing.items():
+        if isinstance(value, Length) and key != 'line_spacing':
+            spacing[key] = value.inches
+        elif not _is_number(value):
+            raise ValueError(f"spacing.{key} must be a number")
+    if spacing['line_spacing'] <= 0:
+        raise ValueError("spacing.line_spacing must be positive")
+    
+    for key, value in merged['classification'].items():
+        if key not in DEFAULT_BRAND_CONFIG['classification']:
+            raise ValueError(f"Unknown classification setting: {key}")
+        if not _is_number(value) or value < 0:
+            raise ValueError(f"classification.{key} must be a non-negative number")
+    
+    for key, value in merged['transparency'].items():
+        if not _is_number(value) or not 0 <= value <= 1:
+            raise ValueError(f"transparency.{key} must be between 0 and 1")
+    
+    return merged
+
+
+def config_hash(normalized: Dict[str, Any]) -> str:
+    canonical = json.dumps(normalized, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class BrandProfile:
+    """A validated brand compiled into one formatting plan per shape type.
+    
+    ``config`` is the normalized JSON form the ``hash`` is computed from;
+    ``settings`` is the same brand with python-pptx values (``RGBColor``,
+    ``PP_ALIGN``, lengths) as ``BrandingEngine.config`` exposes it. Both and
+    the plans are shared by every engine using the profile and must be
+    treated as read-only.
+    """
+    
+    def __init__(self, normalized: Dict[str, Any], name: Optional[str] = None,
+                 digest: Optional[str] = None):
+        self.name = name
+        self.config = normalized
+        self.hash = digest or config_hash(normalized)
+        self.settings = self._build_settings(normalized)
+        self.background = self.settings['colors']['background']
+        self.font = normalized['fonts']['primary']
+        self.plans = MappingProxyType({
+            shape_type: self._build_plan(shape_type) for shape_type in SHAPE_TYPES
+        })
+        self.fallback_plan = self._build_plan(None)
+        
+        classification = normalized['classification']
+        self.thresholds = ShapeThresholds(
+            first_slide_title_top=Inches(classification['first_slide_title_top']),
+            title_top=Inches(classification['title_top']),
+            heading_text_length=classification['heading_text_length'],
+            heading_min_width=Inches(classification['heading_min_width']),
+            title_font_size=Pt(classification['title_font_size']),
+            heading_font_size=Pt(classification['heading_font_size'])
+        )
+    
+    @classmethod
+    def compile(cls, config: Optional[Dict[str, Any]] = None, name: Optional[str] = None) -> 'BrandProfile':
+        return cls(normalize_config(config), name=name)
+    
+    @staticmethod
+    def _build_settings(normalized: Dict[str, Any]) -> Dict[str, Any]:
+        settings = copy.deepcopy(normalized)
+        settings['colors'] = {name: RGBColor(*rgb) for name, rgb in normalized['colors'].items()}
+        settings['alignment'] = {name: ALIGNMENTS[value] for name, value in normalized['alignment'].items()}
+        settings['spacing'] = {
+            key: value if key == 'line_spacing' else Inches(value)
+            for key, value in normalized['spacing'].items()
+        }
+        return settings
+    
+    def _build_plan(self, shape_type: Optional[str]) -> ShapePlan:
+        fonts = self.settings['fonts']
+        colors = self.settings['colors']
+        size = fonts.get(f'{shape_type}_size', fonts['body_size'])
+        
+        return ShapePlan(
+            font=fonts['primary'],
+            size=Pt(size),
+            bold=shape_type in ('title', 'heading'),
+            color=colors['primary'] if shape_type == 'title' else colors['text_dark'],
+            alignment=self.settings['alignment'].get(shape_type, PP_ALIGN.LEFT),
+            line_spacing=self.settings['spacing']['line_spacing']
+        )
+    
+    def __reduce__(self):
+        # Recompiled from the JSON form, so profiles can be sent to worker processes.
+        return (BrandProfile, (self.config, self.name, self.hash))
+    
+    def plan(self, shape_type: str) -> ShapePlan:
+        return self.plans.get(shape_type, self.fallback_plan)
+    
+    def describe(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'hash': self.hash,
+            'font': self.font,
+            'sizes': {key: self.config['fonts'][key] for key in FONT_SIZES}
+        }
+
+
+DEFAULT_PROFILE = BrandProfile.compile(name='default')
+
+
+class BrandProfileRegistry:
+    """Named brand profiles from a JSON file, compiled once and cached by hash.
+    
+    The file holds either a single brand config (registered as ``default``)
+    or ``{"default": "<name>", "profiles": {"<name>": {...}}}``. It is read
+    at construction and re-read when its mtime or size changes; an invalid
+    file is logged and the previously loaded profiles stay in effect.
+    ``get`` accepts a name, a full hash or a unique hash prefix; ad-hoc
+    configs passed to ``resolve`` are compiled once per distinct hash.
+    """
+    
+    DEFAULT_NAME = 'default'
+    MAX_COMPILED = 64
+    MIN_HASH_PREFIX = 8
+    
+    def __init__(self, config_path: Optional[str] = None):
+        self.config_path = config_path
+        self.default_name = self.DEFAULT_NAME
+        self._profiles = {self.DEFAULT_NAME: DEFAULT_PROFILE}
+        self._compiled = OrderedDict()
+        self._stamp = None
+        self._lock = threading.Lock()
+        self.reload_if_changed()
+    
+    def _file_stamp(self):
+        try:
+            stat = os.stat(self.config_path)
+            return (stat.st_mtime_ns, stat.st_size)
+        except (OSError, TypeError):
+            return None
+    
+    def reload_if_changed(self) -> bool:
+        stamp = self._file_stamp()
+        if stamp == self._stamp:
+            return False
+        
+        with self._lock:
+            if stamp == self._stamp:
+                return False
+            self._stamp = stamp
+            
+            if stamp is None:
+                self._profiles = {self.DEFAULT_NAME: DEFAULT_PROFILE}
+                self.default_name = self.DEFAULT_NAME
+                return True
+            
+            try:
+                with open(self.config_path, 'r') as f:
+                    profiles, default_name = self._load(json.load(f))
+            except (OSError, ValueError) as e:
+                logger.error(f"Invalid brand profile file {self.config_path}, keeping previous profiles: {str(e)}")
+                return False
+            
+            self._profiles = profiles
+            self.default_name = default_name
+        
+        logger.info(f"Loaded brand profiles {', '.join(sorted(profiles))} from {self.config_path}")
+        return True
+    
+    def _load(self, data) -> Tuple[Dict[str, BrandProfile], str]:
+        if not isinstance(data, dict):
+            raise ValueError("Brand profile file must contain an object")
+        
+        if 'profiles' not in data:
+            return {self.DEFAULT_NAME: self._compile(data, self.DEFAULT_NAME)}, self.DEFAULT_NAME
+        
+        configs = data['profiles']
+        if not isinstance(configs, dict) or not configs:
+            raise ValueError("profiles must be a non-empty object")
+        
+        profiles = {}
+        for name, config in configs.items():
+            try:
+                profiles[name] = self._compile(config, name)
+            except ValueError as e:
+                raise ValueError(f"profile {name}: {str(e)}")
+        
+        default_name = data.get('default', self.DEFAULT_NAME if self.DEFAULT_NAME in profiles else next(iter(profiles)))
+        if default_name not in profiles:
+            raise ValueError(f"default profile {default_name} is not defined")
+        return profiles, default_name
+    
+    def _compile(self, config, name: Optional[str]) -> BrandProfile:
+        normalized = normalize_config(config)
+        key = (config_hash(normalized), name)
+        cached = self._compiled.get(key)
+        if cached is not None:
+            self._compiled.move_to_end(key)
+            return cached
+        
+        profile = BrandProfile(normalized, name=name, digest=key[0])
+        self._compiled[key] = profile
+        while len(self._compiled) > self.MAX_COMPILED:
+            self._compiled.popitem(last=False)
+        return profile
+    
+    def compile(self, config: Optional[Dict[str, Any]], name: Optional[str] = None) -> BrandProfile:
+        with self._lock:
+            return self._compile(config, name)
+    
+    def get(self, selector: Optional[str] = None) -> BrandProfile:
+        self.reload_if_changed()
+        
+        with self._lock:
+            if not selector:
+                return self._profiles[self.default_name]
+            if selector in self._profiles:
+                return self._profiles[selector]
+            
+            if len(selector) >= self.MIN_HASH_PREFIX:
+                candidates = list(self._profiles.values()) + list(self._compiled.values())
+                matches = {p.hash: p for p in candidates if p.hash.startswith(selector)}
+                if len(matches) == 1:
+                    return next(iter(matches.values()))
+        
+        raise KeyError(selector)
+    
+    def resolve(self, selector: Optional[str] = None,
+                overrides: Optional[Dict[str, Any]] = None) -> BrandProfile:
+        profile = self.get(selector)
+        if not overrides:
+            return profile
+        if not isinstance(overrides, dict):
+            raise ValueError("Branding config must be an object")
+        return self.compile(_merge(profile.config, overrides))
+    
+    def list_profiles(self) -> List[Dict[str, Any]]:
+        self.reload_if_changed()
+        with self._lock:
+            return [
+                dict(profile.describe(), default=name == self.default_name)
+                for name, profile in sorted(self._profiles.items())
+            ]
@@ -1,51 +1,21 @@
-from pptx.util import Pt, Inches
-from pptx.enum.text import PP_ALIGN
-from pptx.dml.color import RGBColor
-from typing import Dict, Any
+from pptx.util import Inches
+from typing import Dict, List, Any, Optional
 import logging
 
+from .brand_profiles import BrandProfile, DEFAULT_PROFILE
+from .shape_classifier import classify_slides
+
 logger = logging.getLogger(__name__)
 
 
 class BrandingEngine:
-    BRAND_CONFIG = {
-        'fonts': {
-            'primary': 'Frutiger LT',
-            'fallback': ['Calibri', 'Arial', 'Helvetica'],
-            'title_size': 44,
-            'heading_size': 32,
-            'body_size': 18,
-            'small_size': 14
-        },
-        'colors': {
-            'primary': RGBColor(0, 102, 204),
-            'secondary': RGBColor(102, 102, 102),
-            'accent': RGBColor(255, 107, 53),
-            'text_dark': RGBColor(51, 51, 51),
-            'text_light': RGBColor(255, 255, 255),
-            'background': RGBColor(255, 255, 255)
-        },
-        'spacing': {
-            'title_margin_top': Inches(0.5),
-            'heading_margin_top': Inches(0.3),
-            'body_margin_top': Inches(0.2),
-            'line_spacing': 1.2
-        },
-        'alignment': {
-            'title': PP_ALIGN.CENTER,
-            'heading': PP_ALIGN.LEFT,
-            'body': PP_ALIGN.LEFT
-        },
-        'transparency': {
-            'image_overlay': 0.85,
-            'background': 1.0
-        }
-    }
+    BRAND_CONFIG = DEFAULT_PROFILE.settings
     
-    def __init__(self, custom_config: Dict[str, Any] = None):
-        self.config = self.BRAND_CONFIG.copy()
-        if custom_config:
-            self.config.update(custom_config)
+    def __init__(self, custom_config: Dict[str, Any] = None, profile: Optional[BrandProfile] = None):
+        if profile is None:
+            profile = BrandProfile.compile(custom_config) if custom_config else DEFAULT_PROFILE
+        self.profile = profile
+        self.config = profile.settings
     
     def apply_branding_to_shape(self, shape, shape_type: str = 'body'):
         if not shape.has_text_frame:
@@ -66,55 +36,37 @@ class BrandingEngine:
     
     def apply_paragraph_formatting(self, paragraph, shape_type: str):
         try:
-            alignment = self.config['alignment'].get(shape_type, PP_ALIGN.LEFT)
-            paragraph.alignment = alignment
-            paragraph.line_spacing = self.config['spacing']['line_spacing']
+            plan = self.profile.plan(shape_type)
+            paragraph.alignment = plan.alignment
+            paragraph.line_spacing = plan.line_spacing
         except Exception as e:
             logger.warning(f"Could not apply paragraph formatting: {str(e)}")
     
     def apply_run_formatting(self, run, shape_type: str):
         try:
+            plan = self.profile.plan(shape_type)
             font = run.font
-            
-            font_name = self.get_brand_font()
-            font.name = font_name
-            
-            font_size = self.get_font_size(shape_type)
-            font.size = font_size
-            
-            if shape_type == 'title':
-                font.bold = True
-                font.color.rgb = self.config['colors']['primary']
-            elif shape_type == 'heading':
-                font.bold = True
-                font.color.rgb = self.config['colors']['text_dark']
-            else:
-                font.bold = False
-                font.color.rgb = self.config['colors']['text_dark']
+            font.name = plan.font
+            font.size = plan.size
+            font.bold = plan.bold
+            font.color.rgb = plan.color
         
         except Exception as e:
             logger.warning(f"Could not apply run formatting: {str(e)}")
     
     def get_brand_font(self) -> str:
-        primary = self.config['fonts']['primary']
-        return primary
+        return self.profile.font
     
     def get_font_size(self, shape_type: str):
-        size_map = {
-            'title': self.config['fonts']['title_size'],
-            'heading': self.config['fonts']['heading_size'],
-            'body': self.config['fonts']['body_size'],
-            'small': self.config['fonts']['small_size']
-        }
-        return Pt(size_map.get(shape_type, self.config['fonts']['body_size']))
+        return self.profile.plan(shape_type).size
     
-    def apply_color_scheme(self, presentation):
+    def apply_color_scheme(self, presentation, slides=None):
         try:
-            for slide in presentation.slides:
+            for slide in (presentation.slides if slides is None else slides):
                 background = slide.background
                 fill = background.fill
                 fill.solid()
-                fill.fore_color.rgb = self.config['colors']['background']
+                fill.fore_color.rgb = self.profile.background
         except Exception as e:
             logger.warning(f"Could not apply color scheme: {str(e)}")
     
@@ -148,14 +100,16 @@ class BrandingEngine:
         if not text:
             return 'none'
         
-        if slide_index == 0 and shape.top < Inches(2):
+        thresholds = self.profile.thresholds
+        
+        if slide_index == 0 and shape.top < thresholds.first_slide_title_top:
             return 'title'
         
-        if shape.top < Inches(1.5):
+        if shape.top < thresholds.title_top:
             return 'title'
         
         text_length = len(text)
-        if text_length < 50 and shape.width > Inches(5):
+        if text_length < thresholds.heading_text_length and shape.width > thresholds.heading_min_width:
             return 'heading'
         
         font_size = None
@@ -164,9 +118,12 @@ class BrandingEngine:
             if first_run:
                 font_size = first_run[0].font.size
         
-        if font_size and font_size > Pt(28):
+        if font_size and font_size > thresholds.title_font_size:
             return 'title'
-        elif font_size and font_size > Pt(20):
+        elif font_size and font_size > thresholds.heading_font_size:
             return 'heading'
         
         return 'body'
+    
+    def classify_slides(self, slides, indices: Optional[List[int]] = None) -> List[List[Optional[str]]]:
+        return classify_slides(slides, self.profile.thresholds, indices)
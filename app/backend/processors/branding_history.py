@@ -0,0 +1,139 @@
+from typing import Dict, List, Any, Optional
+import hashlib
+import json
+import logging
+import os
+import threading
+import zipfile
+
+from pptx.oxml import parse_xml
+
+logger = logging.getLogger(__name__)
+
+# Bump when shapes-mode branding output changes so older histories are ignored.
+BRANDING_VERSION = 1
+
+
+def fingerprint_slides(slides) -> List[str]:
+    # A slide's branded XML depends only on its own XML, the layout and
+    # master it inherits placeholder geometry from, and whether it is the
+    # first slide (a classification rule); the brand is part of the history key.
+    part_digests: Dict[str, str] = {}
+    
+    def part_digest(part) -> str:
+        digest = part_digests.get(part.partname)
+        if digest is None:
+            digest = part_digests[part.partname] = hashlib.sha256(part.blob).hexdigest()
+        return digest
+    
+    fingerprints = []
+    for idx, slide in enumerate(slides):
+        layout = slide.slide_layout
+        sha = hashlib.sha256()
+        sha.update(b'first' if idx == 0 else b'other')
+        sha.update(hashlib.sha256(slide.part.blob).digest())
+        sha.update(part_digest(layout.part).encode('ascii'))
+        sha.update(part_digest(layout.slide_master.part).encode('ascii'))
+        fingerprints.append(sha.hexdigest())
+    return fingerprints
+
+
+def replace_slide_xml(slide, blob: bytes):
+    # Swap the content in place so proxies already holding the slide
+    # element stay valid. Equal fingerprints mean equal source XML, so the
+    # root element and its namespace declarations are the same.
+    branded = parse_xml(blob)
+    element = slide._element
+    element[:] = branded[:]
+    element.attrib.clear()
+    element.attrib.update(branded.attrib)
+
+
+class BrandingHistory:
+    """Fingerprints of the slides behind the last branded output per deck lineage.
+    
+    One manifest per (lineage, profile hash, branding version) records the
+    output file and, for each source slide fingerprint, the zip member
+    holding its branded XML. A later run of the same lineage reuses those
+    members for unchanged slides. Manifests whose output file has been
+    cleaned up or replaced since are discarded on lookup.
+    """
+    
+    def __init__(self, history_dir: str):
+        self.history_dir = history_dir
+        self._lock = threading.Lock()
+        os.makedirs(history_dir, exist_ok=True)
+    
+    def _manifest_path(self, lineage: str, profile_hash: str, version: int) -> str:
+        key = hashlib.sha256(json.dumps([lineage, profile_hash, version]).encode('utf-8')).hexdigest()
+        return os.path.join(self.history_dir, f"{key}.json")
+    
+    def lookup(self, lineage: str, profile_hash: str, version: int) -> Optional[Dict[str, Any]]:
+        path = self._manifest_path(lineage, profile_hash, version)
+        try:
+            with open(path, 'r') as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable branding history {path}: {str(e)}")
+            self._remove(path)
+            return None
+        
+        if self._output_stamp(manifest.get('output_path', '')) != manifest.get('output_stamp'):
+            self._remove(path)
+            return None
+        return manifest
+    
+    def record(self, lineage: str, profile_hash: str, version: int,
+               output_path: str, fingerprints: List[str], members: List[str]):
+        path = self._manifest_path(lineage, profile_hash, version)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        manifest = {
+            'lineage': lineage,
+            'profile_hash': profile_hash,
+            'version': version,
+            'output_path': os.path.abspath(output_path),
+            'output_stamp': self._output_stamp(output_path),
+            'slides': dict(zip(fingerprints, members))
+        }
+        
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump(manifest, f, separators=(',', ':'))
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not record branding history for {lineage}: {str(e)}")
+            self._remove(temp_path)
+    
+    def load_branded_slides(self, manifest: Dict[str, Any], fingerprints: List[str]) -> Dict[int, bytes]:
+        # Branded XML from the previous output for every slide whose
+        # fingerprint it has, by slide position.
+        wanted = {
+            idx: manifest['slides'][fingerprint]
+            for idx, fingerprint in enumerate(fingerprints) if fingerprint in manifest['slides']
+        }
+        if not wanted:
+            return {}
+        
+        try:
+            with zipfile.ZipFile(manifest['output_path']) as archive:
+                return {idx: archive.read(member) for idx, member in wanted.items()}
+        except (OSError, KeyError, zipfile.BadZipFile) as e:
+            logger.warning(f"Could not reuse branded slides from {manifest['output_path']}: {str(e)}")
+            return {}
+    
+    def _output_stamp(self, output_path: str) -> Optional[List[int]]:
+        try:
+            stat = os.stat(output_path)
+        except OSError:
+            return None
+        # Not the mtime: the output cache refreshes it on every hit.
+        return [stat.st_ino, stat.st_size]
+    
+    def _remove(self, path: str):
+        with self._lock:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -0,0 +1,140 @@
+from typing import Dict, List, Any, Optional, Callable, Iterable, Iterator
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Collector:
+    """Subscriber for one extraction pass.
+    
+    Extraction engines build each slide once and ``ExtractionPass`` replays
+    it as slide/shape/paragraph/run events. Collectors override only the
+    events they need; events nobody subscribes to are never walked.
+    """
+    
+    name = None
+    
+    def on_slide(self, slide: Dict[str, Any]):
+        pass
+    
+    def on_shape(self, shape: Dict[str, Any], slide: Dict[str, Any]):
+        pass
+    
+    def on_paragraph(self, paragraph: Dict[str, Any], shape: Dict[str, Any]):
+        pass
+    
+    def on_run(self, run: Dict[str, Any], shape: Dict[str, Any]):
+        pass
+    
+    def result(self, extractor) -> Any:
+        return None
+
+
+class SlideCollector(Collector):
+    name = 'slides'
+    
+    def __init__(self, project: Optional[Callable] = None):
+        self.slides = []
+        self.project = project
+    
+    def on_slide(self, slide: Dict[str, Any]):
+        self.slides.append(self.project(slide) if self.project else slide)
+    
+    def result(self, extractor) -> List[Dict[str, Any]]:
+        return self.slides
+
+
+class BrandingCollector(Collector):
+    name = 'branding'
+    
+    def __init__(self):
+        self.fonts = set()
+        self.colors = set()
+    
+    def on_run(self, run: Dict[str, Any], shape: Dict[str, Any]):
+        if run['font_name']:
+            self.fonts.add(run['font_name'])
+        if run['color']:
+            self.colors.add(run['color'])
+    
+    def result(self, extractor) -> Dict[str, Any]:
+        return {
+            'fonts': list(self.fonts),
+            'colors': list(self.colors),
+            'theme': {}
+        }
+
+
+class MetadataCollector(Collector):
+    name = 'metadata'
+    
+    def result(self, extractor) -> Dict[str, Any]:
+        return extractor.extract_metadata()
+
+
+DEFAULT_COLLECTORS = (SlideCollector, BrandingCollector, MetadataCollector)
+
+
+def default_collectors() -> List[Collector]:
+    return [collector_class() for collector_class in DEFAULT_COLLECTORS]
+
+
+class ExtractionPass:
+    def __init__(self, collectors: Iterable[Collector]):
+        self.collectors = list(collectors)
+        self._slide_subscribers = self._subscribers('on_slide')
+        self._shape_subscribers = self._subscribers('on_shape')
+        self._paragraph_subscribers = self._subscribers('on_paragraph')
+        self._run_subscribers = self._subscribers('on_run')
+        self._walk_text = bool(self._paragraph_subscribers or self._run_subscribers)
+    
+    def _subscribers(self, event: str) -> List[Any]:
+        base = getattr(Collector, event)
+        return [
+            getattr(collector, event) for collector in self.collectors
+            if getattr(type(collector), event) is not base
+        ]
+    
+    def feed(self, slide: Dict[str, Any]):
+        for handler in self._slide_subscribers:
+            handler(slide)
+        
+        if not (self._shape_subscribers or self._walk_text):
+            return
+        
+        for shape in slide['shapes']:
+            for handler in self._shape_subscribers:
+                handler(shape, slide)
+            
+            text_content = shape.get('text_content')
+            if not self._walk_text or not text_content:
+                continue
+            
+            for paragraph in text_content['paragraphs']:
+                for handler in self._paragraph_subscribers:
+                    handler(paragraph, shape)
+                for run in paragraph.get('runs', ()):
+                    for handler in self._run_subscribers:
+                        handler(run, shape)
+    
+    def run(self, extractor) -> Dict[str, Any]:
+        for slide in extractor.iter_slides_data():
+            self.feed(slide)
+        return self.results(extractor)
+    
+    def iter_records(self, extractor, emit_slides: bool = True,
+                     project: Optional[Callable] = None) -> Iterator[Dict[str, Any]]:
+        for slide in extractor.iter_slides_data():
+            self.feed(slide)
+            if emit_slides:
+                yield {'type': 'slide', 'data': project(slide) if project else slide}
+        
+        for name, value in self.results(extractor).items():
+            yield {'type': name, 'data': value}
+    
+    def results(self, extractor) -> Dict[str, Any]:
+        return {
+            collector.name: collector.result(extractor)
+            for collector in self.collectors
+            if collector.name
+        }
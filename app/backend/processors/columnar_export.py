@@ -0,0 +1,296 @@
+from array import array
+from typing import Dict, List, Any, Optional
+import json
+import logging
+import os
+import zipfile
+
+import numpy as np
+
+from .collectors import Collector
+from .extraction_options import ExtractionOptions
+
+logger = logging.getLogger(__name__)
+
+MISSING = -1
+
+# (column, array typecode, numpy dtype) per table. Every table carries the
+# keys of its parents so rows can be joined without nested structures.
+TABLE_SCHEMAS = {
+    'slides': [
+        ('deck', 'i', np.int32),
+        ('slide', 'i', np.int32),
+        ('layout', 'i', np.int32),
+        ('shape_count', 'i', np.int32),
+        ('notes_length', 'i', np.int32),
+    ],
+    'shapes': [
+        ('deck', 'i', np.int32),
+        ('slide', 'i', np.int32),
+        ('shape', 'i', np.int32),
+        ('type', 'i', np.int32),
+        ('left', 'q', np.int64),
+        ('top', 'q', np.int64),
+        ('width', 'q', np.int64),
+        ('height', 'q', np.int64),
+        ('paragraph_count', 'i', np.int32),
+    ],
+    'paragraphs': [
+        ('deck', 'i', np.int32),
+        ('slide', 'i', np.int32),
+        ('shape', 'i', np.int32),
+        ('paragraph', 'i', np.int32),
+        ('level', 'b', np.int8),
+        ('text_length', 'i', np.int32),
+    ],
+    'runs': [
+        ('deck', 'i', np.int32),
+        ('slide', 'i', np.int32),
+        ('shape', 'i', np.int32),
+        ('paragraph', 'i', np.int32),
+        ('font', 'i', np.int32),
+        ('font_size', 'f', np.float32),
+        ('bold', 'b', np.int8),
+        ('italic', 'b', np.int8),
+        ('underline', 'i', np.int32),
+        ('color', 'i', np.int32),
+        ('text_length', 'i', np.int32),
+    ],
+    'chart_points': [
+        ('deck', 'i', np.int32),
+        ('slide', 'i', np.int32),
+        ('shape', 'i', np.int32),
+        ('series', 'i', np.int32),
+        ('point', 'i', np.int32),
+        ('category', 'i', np.int32),
+        ('value', 'd', np.float64),
+    ],
+    'table_values': [
+        ('deck', 'i', np.int32),
+        ('slide', 'i', np.int32),
+        ('shape', 'i', np.int32),
+        ('row', 'i', np.int32),
+        ('column', 'i', np.int32),
+        ('header', 'i', np.int32),
+        ('value', 'd', np.float64),
+    ],
+}
+
+DICTIONARIES = (
+    'decks', 'layouts', 'shape_types', 'fonts', 'colors', 'underlines', 'series', 'categories', 'headers'
+)
+
+
+class StringInterner:
+    def __init__(self, values: Optional[List[str]] = None):
+        self.values = list(values or [])
+        self._ids = {value: idx for idx, value in enumerate(self.values)}
+    
+    def intern(self, value) -> int:
+        if value is None:
+            return MISSING
+        value = str(value)
+        idx = self._ids.get(value)
+        if idx is None:
+            idx = self._ids[value] = len(self.values)
+            self.values.append(value)
+        return idx
+
+
+def _tristate(value) -> int:
+    return MISSING if value is None else int(bool(value))
+
+
+def _coordinate(value) -> int:
+    return MISSING if value is None else int(value)
+
+
+class ColumnarCollector(Collector):
+    """Appends one deck's slides, shapes, paragraphs and runs to flat columns."""
+    
+    def __init__(self, export: 'ColumnarExport', deck_id: int):
+        self.export = export
+        self.deck_id = deck_id
+        self.slide = MISSING
+        self.shape = MISSING
+        self.paragraph = MISSING
+    
+    def on_slide(self, slide: Dict[str, Any]):
+        self.slide = slide['index']
+        self.shape = MISSING
+        self.export.append('slides', (
+            self.deck_id,
+            self.slide,
+            self.export.dictionaries['layouts'].intern(slide['layout']),
+            len(slide.get('shapes', [])),
+            len(slide.get('notes', ''))
+        ))
+    
+    def on_shape(self, shape: Dict[str, Any], slide: Dict[str, Any]):
+        self.shape += 1
+        self.paragraph = MISSING
+        text_content = shape.get('text_content')
+        self.export.append('shapes', (
+            self.deck_id,
+            self.slide,
+            self.shape,
+            self.export.dictionaries['shape_types'].intern(shape['type']),
+            _coordinate(shape['left']),
+            _coordinate(shape['top']),
+            _coordinate(shape['width']),
+            _coordinate(shape['height']),
+            len(text_content['paragraphs']) if text_content else 0
+        ))
+        
+        if shape.get('chart_data'):
+            self._append_chart(shape['chart_data'])
+        if shape.get('table_data'):
+            self._append_table(shape['table_data'])
+    
+    def _append_chart(self, chart_data: Dict[str, Any]):
+        dictionaries = self.export.dictionaries
+        categories = chart_data.get('categories', [])
+        for series_idx, series in enumerate(chart_data.get('series', [])):
+            series_id = dictionaries['series'].intern(series['name'])
+            for point, value in enumerate(series['values']):
+                category = categories[point] if point < len(categories) else None
+                self.export.append('chart_points', (
+                    self.deck_id,
+                    self.slide,
+                    self.shape,
+                    series_id,
+                    point,
+                    dictionaries['categories'].intern(category),
+                    value if value is not None else float('nan')
+                ))
+    
+    def _append_table(self, table_data: Dict[str, Any]):
+        # Only numeric columns; row numbers count body rows below the header.
+        for column_idx, column in enumerate(table_data.get('typed_columns', [])):
+            if column['type'] != 'number':
+                continue
+            header_id = self.export.dictionaries['headers'].intern(column['header'])
+            for row, value in enumerate(column['values']):
+                self.export.append('table_values', (
+                    self.deck_id,
+                    self.slide,
+                    self.shape,
+                    row,
+                    column_idx,
+                    header_id,
+                    value if value is not None else float('nan')
+                ))
+    
+    def on_paragraph(self, paragraph: Dict[str, Any], shape: Dict[str, Any]):
+        self.paragraph += 1
+        self.export.append('paragraphs', (
+            self.deck_id,
+            self.slide,
+            self.shape,
+            self.paragraph,
+            paragraph['level'],
+            len(paragraph['text'])
+        ))
+    
+    def on_run(self, run: Dict[str, Any], shape: Dict[str, Any]):
+        dictionaries = self.export.dictionaries
+        self.export.append('runs', (
+            self.deck_id,
+            self.slide,
+            self.shape,
+            self.paragraph,
+            dictionaries['fonts'].intern(run['font_name']),
+            run['font_size'] if run['font_size'] is not None else float('nan'),
+            _tristate(run['bold']),
+            _tristate(run['italic']),
+            dictionaries['underlines'].intern(run['underline']),
+            dictionaries['colors'].intern(run['color']),
+            len(run['text'])
+        ))
+
+
+class ColumnarExport:
+    """Flat, typed column tables for many decks.
+    
+    ``save`` writes one ``<table>.<column>.npy`` per column plus
+    ``dictionaries.json`` mapping the interned string ids (fonts, colors,
+    layouts, ...) back to text; ``load`` memory-maps them again.
+    """
+    
+    EXPORT_OPTIONS = ExtractionOptions.parse('shapes,runs,notes,charts,tables')
+    
+    def __init__(self):
+        self.columns = {
+            table: [array(typecode) for _, typecode, _ in schema]
+            for table, schema in TABLE_SCHEMAS.items()
+        }
+        self.dictionaries = {name: StringInterner() for name in DICTIONARIES}
+    
+    def append(self, table: str, row):
+        for column, value in zip(self.columns[table], row):
+            column.append(value)
+    
+    def add_deck(self, extractor, deck_name: str) -> int:
+        deck_id = self.dictionaries['decks'].intern(deck_name)
+        extractor.run_collectors([ColumnarCollector(self, deck_id)])
+        return deck_id
+    
+    def row_counts(self) -> Dict[str, int]:
+        return {table: len(columns[0]) for table, columns in self.columns.items()}
+    
+    def to_arrays(self) -> Dict[str, Dict[str, np.ndarray]]:
+        return {
+            table: {
+                name: np.frombuffer(column, dtype=dtype).copy() if len(column) else np.empty(0, dtype=dtype)
+                for (name, _, dtype), column in zip(TABLE_SCHEMAS[table], self.columns[table])
+            }
+            for table in TABLE_SCHEMAS
+        }
+    
+    def save(self, directory: str) -> Dict[str, int]:
+        os.makedirs(directory, exist_ok=True)
+        
+        for table, columns in self.to_arrays().items():
+            for name, values in columns.items():
+                np.save(os.path.join(directory, f"{table}.{name}.npy"), values)
+        
+        with open(os.path.join(directory, 'dictionaries.json'), 'w') as f:
+            json.dump({name: interner.values for name, interner in self.dictionaries.items()}, f)
+        
+        counts = self.row_counts()
+        logger.info(f"Saved columnar export to {directory}: {counts}")
+        return counts
+    
+    def save_archive(self, zip_path: str) -> Dict[str, int]:
+        # Stored, not deflated: .npy columns barely compress and an
+        # extracted archive is directly loadable by ``load``.
+        temp_path = f"{zip_path}.tmp"
+        with zipfile.ZipFile(temp_path, 'w', compression=zipfile.ZIP_STORED) as archive:
+            for table, columns in self.to_arrays().items():
+                for name, values in columns.items():
+                    with archive.open(f"{table}.{name}.npy", 'w') as f:
+                        np.save(f, values)
+            archive.writestr('dictionaries.json', json.dumps(
+                {name: interner.values for name, interner in self.dictionaries.items()}
+            ))
+        os.replace(temp_path, zip_path)
+        
+        counts = self.row_counts()
+        logger.info(f"Saved columnar export to {zip_path}: {counts}")
+        return counts
+    
+    @staticmethod
+    def load(directory: str, mmap: bool = True) -> Dict[str, Any]:
+        mmap_mode = 'r' if mmap else None
+        tables = {
+            table: {
+                name: np.load(os.path.join(directory, f"{table}.{name}.npy"), mmap_mode=mmap_mode)
+                for name, _, _ in schema
+            }
+            for table, schema in TABLE_SCHEMAS.items()
+        }
+        
+        with open(os.path.join(directory, 'dictionaries.json'), 'r') as f:
+            tables['dictionaries'] = json.load(f)
+        
+        return tables
@@ -1,49 +1,91 @@
 from pptx import Presentation
+from pptx.enum.dml import MSO_COLOR_TYPE, MSO_FILL
 from pptx.enum.shapes import MSO_SHAPE_TYPE
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Iterator
 import logging
 
+from .collectors import Collector, ExtractionPass
+from .extraction_options import ExtractionOptions, DEFAULT_OPTIONS
+from .numeric_data import read_chart_series, type_table_columns
+from .presentation_cache import PresentationCache
+
 logger = logging.getLogger(__name__)
 
 
 class DataExtractor:
-    def __init__(self, ppt_path: str):
+    EXTRACTOR_VERSION = 4
+    
+    def __init__(self, ppt_path: str, cache: Optional[PresentationCache] = None,
+                 options: Optional[ExtractionOptions] = None,
+                 asset_ids: Optional[Dict[str, str]] = None):
         self.ppt_path = ppt_path
-        self.presentation = Presentation(ppt_path)
-        
+        self.cache = cache
+        self.options = options or DEFAULT_OPTIONS
+        self.asset_ids = asset_ids
+        self._presentation = None
+    
+    @property
+    def presentation(self) -> Presentation:
+        if self._presentation is None:
+            if self.cache is not None:
+                self._presentation = self.cache.get(self.ppt_path)
+            else:
+                self._presentation = Presentation(self.ppt_path)
+        return self._presentation
+    
     def extract_all_data(self) -> Dict[str, Any]:
         try:
-            data = {
-                'slides': self.extract_slides_data(),
-                'branding': self.extract_branding_info(),
-                'metadata': self.extract_metadata()
-            }
-            logger.info(f"Successfully extracted data from {len(data['slides'])} slides")
+            data = self.run_collectors(self.options.collectors())
+            logger.info(f"Successfully extracted data from {len(data.get('slides', []))} slides")
             return data
         except Exception as e:
             logger.error(f"Error extracting data: {str(e)}")
             raise
     
+    def run_collectors(self, collectors: List[Collector]) -> Dict[str, Any]:
+        return ExtractionPass(collectors).run(self)
+    
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        slide_count = 0
+        extraction = ExtractionPass(self.options.section_collectors())
+        records = extraction.iter_records(
+            self, emit_slides=self.options.emit_slides, project=self.options.project_slide
+        )
+        for record in records:
+            slide_count += record['type'] == 'slide'
+            yield record
+        logger.info(f"Streamed data from {slide_count} slides")
+    
     def extract_slides_data(self) -> List[Dict[str, Any]]:
-        slides_data = []
+        return list(self.iter_slides_data())
+    
+    def iter_slides_data(self) -> Iterator[Dict[str, Any]]:
+        options = self.options
+        if not options.walk_slides:
+            return
         
         for idx, slide in enumerate(self.presentation.slides):
+            if not options.includes_slide(idx):
+                continue
+            
             slide_data = {
                 'index': idx,
-                'layout': slide.slide_layout.name,
-                'shapes': self.extract_shapes_from_slide(slide),
-                'notes': self.extract_notes(slide)
+                'layout': slide.slide_layout.name
             }
-            slides_data.append(slide_data)
-        
-        return slides_data
+            if options.build_shapes:
+                slide_data['shapes'] = self.extract_shapes_from_slide(slide)
+            if options.wants('notes'):
+                slide_data['notes'] = self.extract_notes(slide)
+            yield slide_data
     
     def extract_shapes_from_slide(self, slide) -> List[Dict[str, Any]]:
+        options = self.options
         shapes_data = []
         
         for shape in slide.shapes:
+            shape_type = self.get_shape_type(shape)
             shape_info = {
-                'type': str(shape.shape_type),
+                'type': str(shape_type),
                 'name': shape.name,
                 'left': shape.left,
                 'top': shape.top,
@@ -51,22 +93,32 @@ class DataExtractor:
                 'height': shape.height
             }
             
-            if shape.has_text_frame:
+            if options.build_text and shape.has_text_frame:
                 shape_info['text_content'] = self.extract_text_from_shape(shape)
             
-            if shape.shape_type == MSO_SHAPE_TYPE.PICTURE:
+            if options.wants('images') and shape_type == MSO_SHAPE_TYPE.PICTURE:
                 shape_info['image'] = self.extract_image_info(shape)
             
-            if shape.shape_type == MSO_SHAPE_TYPE.TABLE:
+            if options.wants('tables') and shape_type == MSO_SHAPE_TYPE.TABLE:
                 shape_info['table_data'] = self.extract_table_data(shape)
             
-            if shape.shape_type == MSO_SHAPE_TYPE.CHART:
+            if options.wants('charts') and shape_type == MSO_SHAPE_TYPE.CHART:
                 shape_info['chart_data'] = self.extract_chart_info(shape)
             
             shapes_data.append(shape_info)
         
         return shapes_data
     
+    @staticmethod
+    def get_shape_type(shape) -> Optional[MSO_SHAPE_TYPE]:
+        # python-pptx cannot type an sp with no placeholder, geometry or
+        # txBox flag; report it untyped, as the xml engine does.
+        try:
+            return shape.shape_type
+        except NotImplementedError:
+            logger.debug(f"Shape '{shape.name}' has no recognized shape type")
+            return None
+    
     def extract_text_from_shape(self, shape) -> Dict[str, Any]:
         text_data = {
             'full_text': shape.text,
@@ -76,10 +128,14 @@ class DataExtractor:
         for paragraph in shape.text_frame.paragraphs:
             para_data = {
                 'text': paragraph.text,
-                'level': paragraph.level,
-                'runs': []
+                'level': paragraph.level
             }
+            text_data['paragraphs'].append(para_data)
             
+            if not self.options.build_runs:
+                continue
+            
+            para_data['runs'] = []
             for run in paragraph.runs:
                 run_data = {
                     'text': run.text,
@@ -88,23 +144,25 @@ class DataExtractor:
                     'bold': run.font.bold,
                     'italic': run.font.italic,
                     'underline': run.font.underline,
-                    'color': self.get_color_rgb(run.font.color) if run.font.color else None
+                    'color': self.get_font_color(run.font)
                 }
                 para_data['runs'].append(run_data)
-            
-            text_data['paragraphs'].append(para_data)
         
         return text_data
     
     def extract_image_info(self, shape) -> Dict[str, Any]:
         try:
             image = shape.image
-            return {
+            image_info = {
                 'content_type': image.content_type,
                 'filename': image.filename if hasattr(image, 'filename') else 'unknown',
                 'width': shape.width,
                 'height': shape.height
             }
+            if self.asset_ids is not None:
+                image_part = shape.part.related_part(shape._element.blip_rId)
+                image_info['asset_id'] = self.asset_ids.get(image_part.partname.lstrip('/'))
+            return image_info
         except Exception as e:
             logger.warning(f"Could not extract image info: {str(e)}")
             return {}
@@ -112,10 +170,12 @@ class DataExtractor:
     def extract_table_data(self, shape) -> Dict[str, Any]:
         try:
             table = shape.table
+            cells = [[cell.text for cell in row.cells] for row in table.rows]
             return {
                 'rows': len(table.rows),
                 'columns': len(table.columns),
-                'cells': [[cell.text for cell in row.cells] for row in table.rows]
+                'cells': cells,
+                'typed_columns': type_table_columns(cells)
             }
         except Exception as e:
             logger.warning(f"Could not extract table data: {str(e)}")
@@ -123,10 +183,12 @@ class DataExtractor:
     
     def extract_chart_info(self, shape) -> Dict[str, Any]:
         try:
-            return {
+            chart_info = {
                 'has_chart': True,
                 'chart_type': str(shape.chart.chart_type) if hasattr(shape, 'chart') else 'unknown'
             }
+            chart_info.update(read_chart_series(shape.chart._chartSpace))
+            return chart_info
         except Exception as e:
             logger.warning(f"Could not extract chart info: {str(e)}")
             return {}
@@ -141,31 +203,14 @@ class DataExtractor:
             logger.warning(f"Could not extract notes: {str(e)}")
             return ""
     
-    def extract_branding_info(self) -> Dict[str, Any]:
-        branding = {
-            'fonts': set(),
-            'colors': set(),
-            'theme': {}
-        }
-        
-        for slide in self.presentation.slides:
-            for shape in slide.shapes:
-                if shape.has_text_frame:
-                    for paragraph in shape.text_frame.paragraphs:
-                        for run in paragraph.runs:
-                            if run.font.name:
-                                branding['fonts'].add(run.font.name)
-                            if run.font.color:
-                                color = self.get_color_rgb(run.font.color)
-                                if color:
-                                    branding['colors'].add(color)
-        
-        branding['fonts'] = list(branding['fonts'])
-        branding['colors'] = list(branding['colors'])
-        
-        return branding
-    
     def extract_metadata(self) -> Dict[str, Any]:
+        if self._presentation is None:
+            # Metadata lives in a few small package parts; reading them
+            # directly avoids loading every slide of the deck.
+            from .xml_extractor import XMLDataExtractor
+            with XMLDataExtractor(self.ppt_path) as extractor:
+                return extractor.extract_metadata()
+        
         core_props = self.presentation.core_properties
         return {
             'title': core_props.title,
@@ -176,10 +221,20 @@ class DataExtractor:
             'slide_height': self.presentation.slide_height
         }
     
-    def get_color_rgb(self, color) -> str:
+    def get_font_color(self, font) -> Optional[str]:
+        # font.color would convert a non-solid run fill to solid on access,
+        # which mutates presentations shared through PresentationCache.
+        try:
+            if font.fill.type != MSO_FILL.SOLID:
+                return None
+            return self.get_color_rgb(font.fill.fore_color)
+        except Exception:
+            return None
+    
+    def get_color_rgb(self, color) -> Optional[str]:
         try:
-            if hasattr(color, 'rgb'):
-                return f"#{color.rgb:06x}"
+            if color.type == MSO_COLOR_TYPE.RGB:
+                return f"#{color.rgb}"
             return None
         except Exception:
             return None
@@ -0,0 +1,141 @@
+from typing import Dict, Any, Optional
+import fcntl
+import gzip
+import json
+import logging
+import os
+import shutil
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionCache:
+    """On-disk cache of extraction results keyed by content hash.
+    
+    Results are stored as gzipped compact JSON, one file per variant in a
+    directory per digest. Reads refresh the file's mtime and eviction
+    removes the least recently used files once the cache exceeds
+    ``max_bytes``.
+    
+    Eviction scans the whole cache, so ``put`` only triggers it on a
+    process's first put, every ``evict_every`` puts, or when the size seen
+    by the last scan plus what was put since exceeds ``max_bytes``;
+    ``/cleanup`` runs it too. A scan already running in another process is
+    not repeated.
+    """
+    
+    DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+    EVICT_EVERY = 100
+    SUFFIX = '.json.gz'
+    LOCK_NAME = '.evict.lock'
+    
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES, evict_every: int = EVICT_EVERY):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.evict_every = evict_every
+        self._lock = threading.Lock()
+        # Size total from the last scan (None before the first) and what
+        # this process has put since.
+        self._scanned_bytes = None
+        self._puts_since_scan = 0
+        self._bytes_since_scan = 0
+        os.makedirs(cache_dir, exist_ok=True)
+    
+    def _digest_dir(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, digest)
+    
+    def _entry_path(self, digest: str, variant: str) -> str:
+        return os.path.join(self._digest_dir(digest), f"{variant}{self.SUFFIX}")
+    
+    def get(self, digest: str, variant: str) -> Optional[Dict[str, Any]]:
+        path = self._entry_path(digest, variant)
+        
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                data = json.load(f)
+            os.utime(path)
+            logger.debug(f"Extraction cache hit for {digest[:12]} ({variant})")
+            return data
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable cache entry {path}: {str(e)}")
+            self._remove(path)
+            return None
+    
+    def put(self, digest: str, variant: str, data: Dict[str, Any]):
+        path = self._entry_path(digest, variant)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with gzip.open(temp_path, 'wt', encoding='utf-8', compresslevel=6) as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(temp_path, path)
+            size = os.path.getsize(path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not cache extraction for {digest[:12]}: {str(e)}")
+            self._remove(temp_path)
+            return
+        
+        with self._lock:
+            self._puts_since_scan += 1
+            self._bytes_since_scan += size
+            due = (self._scanned_bytes is None or self._puts_since_scan >= self.evict_every
+                   or self._scanned_bytes + self._bytes_since_scan > self.max_bytes)
+        if due:
+            self.evict()
+    
+    def invalidate(self, digest: str):
+        shutil.rmtree(self._digest_dir(digest), ignore_errors=True)
+    
+    def evict(self) -> int:
+        # Returns the number of entries removed.
+        with self._lock, open(os.path.join(self.cache_dir, self.LOCK_NAME), 'a') as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                logger.debug("Extraction cache eviction already running in another process")
+                return 0
+            
+            entries = []
+            removed = 0
+            total_size = 0
+            for digest_entry in os.scandir(self.cache_dir):
+                if not digest_entry.is_dir(follow_symlinks=False):
+                    continue
+                for entry in os.scandir(digest_entry.path):
+                    if not entry.name.endswith(self.SUFFIX):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total_size += stat.st_size
+            
+            entries.sort()
+            for _, size, path in entries:
+                if total_size <= self.max_bytes:
+                    break
+                self._remove(path)
+                removed += 1
+                total_size -= size
+                logger.debug(f"Evicted extraction cache entry {path}")
+                try:
+                    # Only succeeds once the digest's last entry is gone.
+                    os.rmdir(os.path.dirname(path))
+                except OSError:
+                    pass
+            
+            self._scanned_bytes = total_size
+            self._puts_since_scan = 0
+            self._bytes_since_scan = 0
+            return removed
+    
+    def _remove(self, path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
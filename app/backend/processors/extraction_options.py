@@ -0,0 +1,149 @@
+from typing import Dict, List, Any, Optional, Iterable, Union
+import logging
+
+from .collectors import Collector, SlideCollector, BrandingCollector, MetadataCollector
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionOptions:
+    """Which sections, shape details and slides an extraction should produce.
+    
+    ``fields`` selects output: ``metadata`` and ``branding`` are top-level
+    sections, the rest are per-slide details (``slides`` is shorthand for all
+    of them). ``slides`` is a 1-based selection such as ``"1-10,12"``.
+    Engines consult these options so unrequested parts are never read.
+    """
+    
+    SECTION_FIELDS = ('metadata', 'branding')
+    SLIDE_FIELDS = ('shapes', 'text', 'runs', 'images', 'tables', 'charts', 'notes')
+    SHAPE_DETAIL_FIELDS = ('text', 'runs', 'images', 'tables', 'charts')
+    ALL_FIELDS = SECTION_FIELDS + SLIDE_FIELDS
+    # Ranges are clamped here, so a selection such as 1-1000000000 cannot
+    # expand into a huge index list; no deck gets near this many slides.
+    MAX_SLIDES = 10000
+    
+    def __init__(self, fields: Optional[Iterable[str]] = None,
+                 slides: Optional[Iterable[int]] = None):
+        self.fields = frozenset(self.ALL_FIELDS if fields is None else fields)
+        unknown = self.fields - set(self.ALL_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        
+        self.slides = frozenset(slides) if slides is not None else None
+        self.slide_fields = self.fields & set(self.SLIDE_FIELDS)
+        self.emit_slides = bool(self.slide_fields)
+        self.walk_slides = self.emit_slides or 'branding' in self.fields
+        self.build_runs = 'runs' in self.fields or 'branding' in self.fields
+        self.build_text = 'text' in self.fields or self.build_runs
+        self.build_shapes = bool(self.fields & set(self.SHAPE_DETAIL_FIELDS + ('shapes',))) or self.build_runs
+        self.is_default = self.fields == set(self.ALL_FIELDS) and self.slides is None
+    
+    @classmethod
+    def parse(cls, fields: Union[str, List[str], None] = None,
+              slides: Union[str, List[int], None] = None) -> 'ExtractionOptions':
+        if isinstance(fields, str):
+            fields = [f.strip() for f in fields.split(',') if f.strip()]
+        if fields is not None and 'slides' in fields:
+            fields = [f for f in fields if f != 'slides'] + list(cls.SLIDE_FIELDS)
+        
+        return cls(fields=fields, slides=cls.parse_slides(slides))
+    
+    @classmethod
+    def parse_slides(cls, spec: Union[str, List[int], None]) -> Optional[List[int]]:
+        if spec is None or spec == '':
+            return None
+        
+        if isinstance(spec, (list, tuple)):
+            parts = [str(item) for item in spec]
+        else:
+            parts = [part.strip() for part in str(spec).split(',') if part.strip()]
+        
+        indices = []
+        try:
+            for part in parts:
+                start, dash, end = part.partition('-')
+                first, last = int(start), int(end if dash else start)
+                if first < 1 or last < first:
+                    raise ValueError(part)
+                indices.extend(range(first - 1, min(last, cls.MAX_SLIDES)))
+        except ValueError:
+            raise ValueError(f"Invalid slides selection: {spec}")
+        
+        return indices
+    
+    def includes_slide(self, index: int) -> bool:
+        return self.slides is None or index in self.slides
+    
+    def wants(self, field: str) -> bool:
+        return field in self.fields
+    
+    def collectors(self) -> List[Collector]:
+        collectors = [SlideCollector(project=self.project_slide)] if self.emit_slides else []
+        return collectors + self.section_collectors()
+    
+    def section_collectors(self) -> List[Collector]:
+        collectors = []
+        if 'branding' in self.fields:
+            collectors.append(BrandingCollector())
+        if 'metadata' in self.fields:
+            collectors.append(MetadataCollector())
+        return collectors
+    
+    def project_slide(self, slide: Dict[str, Any]) -> Dict[str, Any]:
+        if self.is_default:
+            return slide
+        
+        projected = {'index': slide['index'], 'layout': slide['layout']}
+        if 'shapes' in slide and self.slide_fields - {'notes'}:
+            projected['shapes'] = [self._project_shape(shape) for shape in slide['shapes']]
+        if 'notes' in self.fields and 'notes' in slide:
+            projected['notes'] = slide['notes']
+        return projected
+    
+    def _project_shape(self, shape: Dict[str, Any]) -> Dict[str, Any]:
+        projected = {
+            key: shape[key] for key in ('type', 'name', 'left', 'top', 'width', 'height')
+        }
+        
+        text_content = shape.get('text_content')
+        if text_content is not None and ('text' in self.fields or 'runs' in self.fields):
+            if 'runs' in self.fields:
+                projected['text_content'] = text_content
+            else:
+                projected['text_content'] = {
+                    'full_text': text_content['full_text'],
+                    'paragraphs': [
+                        {'text': p['text'], 'level': p['level']}
+                        for p in text_content['paragraphs']
+                    ]
+                }
+        
+        for field, key in (('images', 'image'), ('tables', 'table_data'), ('charts', 'chart_data')):
+            if field in self.fields and key in shape:
+                projected[key] = shape[key]
+        
+        return projected
+    
+    def can_project_full_result(self) -> bool:
+        # Branding over a slide subset differs from branding over the deck.
+        return self.slides is None or 'branding' not in self.fields
+    
+    def project(self, full_data: Dict[str, Any]) -> Dict[str, Any]:
+        if self.is_default:
+            return full_data
+        
+        data = {}
+        if self.emit_slides:
+            data['slides'] = [
+                self.project_slide(slide) for slide in full_data['slides']
+                if self.includes_slide(slide['index'])
+            ]
+        if 'branding' in self.fields:
+            data['branding'] = full_data['branding']
+        if 'metadata' in self.fields:
+            data['metadata'] = full_data['metadata']
+        return data
+
+
+DEFAULT_OPTIONS = ExtractionOptions()
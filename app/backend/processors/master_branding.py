@@ -0,0 +1,242 @@
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.oxml.ns import qn
+from lxml import etree
+from typing import Dict, Any
+import copy
+import logging
+
+from .brand_profiles import BrandProfile
+from .xml_branding import (
+    XMLBrandingWriter, A_P, A_R, A_PPR, A_RPR, A_LNSPC, A_LATIN, A_SOLID_FILL, A_SRGB_CLR,
+    FILL_CHOICES, FILL_SUCCESSORS, LATIN_SUCCESSORS, LNSPC_SUCCESSORS, _insert_before
+)
+
+logger = logging.getLogger(__name__)
+
+P_SP = qn('p:sp')
+P_PH = qn('p:ph')
+P_TXBODY = qn('p:txBody')
+P_CSLD = qn('p:cSld')
+P_BG = qn('p:bg')
+P_TXSTYLES = qn('p:txStyles')
+P_DEFAULT_TEXT_STYLE = qn('p:defaultTextStyle')
+A_LSTSTYLE = qn('a:lstStyle')
+A_DEFRPR = qn('a:defRPr')
+A_FLD = qn('a:fld')
+A_END_PARA_RPR = qn('a:endParaRPr')
+A_SPCPCT = qn('a:spcPct')
+
+LEVELS = tuple(qn(f'a:lvl{level}pPr') for level in range(1, 10))
+DEFRPR_SUCCESSORS = (qn('a:extLst'),)
+TITLE_PLACEHOLDERS = ('title', 'ctrTitle')
+THEME_FONT_REFS = ('+mj-lt', '+mn-lt')
+
+# Theme color slots and the brand colors written into them.
+THEME_COLORS = {
+    'dk1': 'text_dark',
+    'lt1': 'background',
+    'dk2': 'secondary',
+    'lt2': 'text_light',
+    'accent1': 'primary',
+    'accent2': 'accent'
+}
+
+
+class MasterBrandingWriter:
+    """Brands a deck through its theme, slide masters and layouts.
+    
+    The theme fonts and color scheme, the master title/body/other text
+    styles, the presentation's default text style and the master
+    background are rewritten once; layouts and
+    slides then only lose the local overrides (run and paragraph properties,
+    list styles, backgrounds) that contradict the brand, so their text
+    inherits it. Text in title placeholders follows the title plan, all
+    other text the body plan; there is no geometry-based heading class.
+    """
+    
+    def __init__(self, profile: BrandProfile):
+        self.profile = profile
+        writer = XMLBrandingWriter(profile)
+        self.title = writer.template('title')
+        self.body = writer.template('body')
+        self.background = str(profile.background)
+        self.removed = 0
+    
+    def apply(self, presentation) -> Dict[str, Any]:
+        self.removed = 0
+        themes = set()
+        
+        # Text boxes inherit from the presentation's default text style
+        # rather than from a master text style.
+        self._brand_text_style(presentation._element.find(P_DEFAULT_TEXT_STYLE), self.body, '+mn-lt')
+        
+        for master in presentation.slide_masters:
+            theme = master.part.part_related_by(RT.THEME)
+            if theme.partname not in themes:
+                themes.add(theme.partname)
+                self._brand_theme(theme)
+            self._brand_master(master._element)
+            
+            for layout in master.slide_layouts:
+                self._clean_shapes(layout._element)
+                self._clean_background(layout._element)
+        
+        for slide in presentation.slides:
+            self._clean_shapes(slide._element)
+            self._clean_background(slide._element)
+        
+        stats = {
+            'themes': len(themes),
+            'masters': len(presentation.slide_masters),
+            'overrides_removed': self.removed
+        }
+        logger.info(f"Applied master branding: {stats}")
+        return stats
+    
+    def _brand_theme(self, theme_part):
+        # Theme parts are loaded as plain blobs; rewrite and store the bytes.
+        theme = etree.fromstring(theme_part.blob)
+        elements = theme.find(qn('a:themeElements'))
+        
+        color_scheme = elements.find(qn('a:clrScheme'))
+        for slot, color in THEME_COLORS.items():
+            element = color_scheme.find(qn(f'a:{slot}'))
+            if element is None:
+                continue
+            for child in list(element):
+                element.remove(child)
+            etree.SubElement(element, A_SRGB_CLR, val=str(self.profile.settings['colors'][color]))
+        
+        font_scheme = elements.find(qn('a:fontScheme'))
+        for name in ('a:majorFont', 'a:minorFont'):
+            latin = font_scheme.find(qn(name)).find(A_LATIN)
+            latin.set('typeface', self.profile.font)
+        
+        theme_part._blob = etree.tostring(theme, xml_declaration=True, encoding='UTF-8', standalone=True)
+    
+    def _brand_master(self, master):
+        text_styles = master.find(P_TXSTYLES)
+        for name, template, font_ref in (
+            ('p:titleStyle', self.title, '+mj-lt'),
+            ('p:bodyStyle', self.body, '+mn-lt'),
+            ('p:otherStyle', self.body, '+mn-lt'),
+        ):
+            if text_styles is not None:
+                self._brand_text_style(text_styles.find(qn(name)), template, font_ref)
+        
+        self._clean_shapes(master)
+        self._set_background(master.find(P_CSLD))
+    
+    def _brand_text_style(self, style, template, font_ref: str):
+        if style is None:
+            return
+        levels = [style.find(tag) for tag in LEVELS]
+        if levels[0] is None:
+            levels[0] = _insert_before(style, style.makeelement(LEVELS[0], {}), LEVELS[1:] + (qn('a:extLst'),))
+        for level in levels:
+            if level is not None:
+                self._brand_level(level, template, font_ref)
+    
+    def _brand_level(self, level, template, font_ref: str):
+        level.set('algn', template.algn)
+        for lnSpc in level.findall(A_LNSPC):
+            level.remove(lnSpc)
+        _insert_before(level, copy.deepcopy(template.lnSpc), LNSPC_SUCCESSORS)
+        
+        defRPr = level.find(A_DEFRPR)
+        if defRPr is None:
+            defRPr = _insert_before(level, level.makeelement(A_DEFRPR, {}), DEFRPR_SUCCESSORS)
+        defRPr.set('sz', template.sz)
+        defRPr.set('b', template.b)
+        
+        for tag in FILL_CHOICES:
+            for fill in defRPr.findall(tag):
+                defRPr.remove(fill)
+        _insert_before(defRPr, copy.deepcopy(template.solidFill), FILL_SUCCESSORS)
+        
+        latin = defRPr.find(A_LATIN)
+        if latin is None:
+            latin = _insert_before(defRPr, defRPr.makeelement(A_LATIN, {}), LATIN_SUCCESSORS)
+        latin.set('typeface', font_ref)
+    
+    def _set_background(self, cSld):
+        background = cSld.find(P_BG)
+        if background is not None:
+            cSld.remove(background)
+        background = cSld.makeelement(P_BG, {})
+        cSld.insert(0, background)
+        properties = etree.SubElement(background, qn('p:bgPr'))
+        fill = etree.SubElement(properties, A_SOLID_FILL)
+        etree.SubElement(fill, A_SRGB_CLR, val=self.background)
+        etree.SubElement(properties, qn('a:effectLst'))
+    
+    def _clean_background(self, part_element):
+        cSld = part_element.find(P_CSLD)
+        background = cSld.find(P_BG)
+        if background is None:
+            return
+        color = background.find(f"{qn('p:bgPr')}/{A_SOLID_FILL}/{A_SRGB_CLR}")
+        if color is None or color.get('val') != self.background:
+            cSld.remove(background)
+            self.removed += 1
+    
+    def _clean_shapes(self, part_element):
+        for sp in part_element.iter(P_SP):
+            txBody = sp.find(P_TXBODY)
+            if txBody is None:
+                continue
+            ph = sp.find(f"{qn('p:nvSpPr')}/{qn('p:nvPr')}/{P_PH}")
+            template = self.title if ph is not None and ph.get('type') in TITLE_PLACEHOLDERS else self.body
+            self._clean_text_body(txBody, template)
+    
+    def _clean_text_body(self, txBody, template):
+        list_style = txBody.find(A_LSTSTYLE)
+        if list_style is not None:
+            for level in list_style:
+                if level.tag in LEVELS:
+                    self._clean_paragraph_properties(level, template)
+                    defRPr = level.find(A_DEFRPR)
+                    if defRPr is not None:
+                        self._clean_run_properties(defRPr, template)
+        
+        for p in txBody.iterchildren(A_P):
+            pPr = p.find(A_PPR)
+            if pPr is not None:
+                self._clean_paragraph_properties(pPr, template)
+            for child in p:
+                if child.tag in (A_R, A_FLD):
+                    rPr = child.find(A_RPR)
+                    if rPr is not None:
+                        self._clean_run_properties(rPr, template)
+                elif child.tag == A_END_PARA_RPR:
+                    self._clean_run_properties(child, template)
+    
+    def _clean_paragraph_properties(self, pPr, template):
+        if pPr.get('algn') not in (None, template.algn):
+            del pPr.attrib['algn']
+            self.removed += 1
+        
+        lnSpc = pPr.find(A_LNSPC)
+        if lnSpc is not None:
+            spcPct = lnSpc.find(A_SPCPCT)
+            if spcPct is None or spcPct.get('val') != template.lnSpc.find(A_SPCPCT).get('val'):
+                pPr.remove(lnSpc)
+                self.removed += 1
+    
+    def _clean_run_properties(self, rPr, template):
+        for name, value in (('sz', template.sz), ('b', template.b)):
+            if rPr.get(name) not in (None, value):
+                del rPr.attrib[name]
+                self.removed += 1
+        
+        latin = rPr.find(A_LATIN)
+        if latin is not None and latin.get('typeface') not in (self.profile.font,) + THEME_FONT_REFS:
+            rPr.remove(latin)
+            self.removed += 1
+        
+        for tag in FILL_CHOICES:
+            for fill in rPr.findall(tag):
+                color = fill.find(A_SRGB_CLR) if tag == A_SOLID_FILL else None
+                if color is None or color.get('val') != template.color or len(color):
+                    rPr.remove(fill)
+                    self.removed += 1
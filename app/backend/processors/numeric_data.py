@@ -0,0 +1,184 @@
+from typing import Dict, List, Any, Optional
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+NS_C = 'http://schemas.openxmlformats.org/drawingml/2006/chart'
+
+
+def _c(tag: str) -> str:
+    return f'{{{NS_C}}}{tag}'
+
+
+NUMBER_PATTERN = re.compile(r'^[+-]?(\d+(\.\d*)?|\.\d+)([eE][+-]?\d+)?$')
+CURRENCY_SYMBOLS = '$€£¥'
+MISSING_TOKENS = {'n/a', 'na', 'nan', '-', '\u2013', '\u2014'}
+# Slots a point cache may leave empty beyond the points it lists, so that
+# a crafted ptCount or idx cannot make the value list outgrow the XML.
+MAX_MISSING_POINTS = 1024
+
+
+def parse_number(text: Optional[str]) -> Optional[float]:
+    if text is None:
+        return None
+    
+    value = text.strip().replace('\u00a0', '').replace(' ', '')
+    if not value:
+        return None
+    
+    negative = value.startswith('(') and value.endswith(')')
+    if negative:
+        value = value[1:-1]
+    value = value.lstrip(CURRENCY_SYMBOLS).rstrip('%').replace(',', '')
+    
+    if not NUMBER_PATTERN.match(value):
+        return None
+    number = float(value)
+    return -number if negative else number
+
+
+def _point_cache(source) -> Dict[str, Any]:
+    # References carry the values cached by the authoring app; literals
+    # carry them inline. Both list points as <c:pt idx="n"><c:v>..</c:v>.
+    tag = source.tag
+    if tag == _c('numRef'):
+        return _read_points(source.find(_c('numCache')), numeric=True)
+    if tag == _c('strRef'):
+        return _read_points(source.find(_c('strCache')), numeric=False)
+    if tag == _c('numLit'):
+        return _read_points(source, numeric=True)
+    if tag == _c('strLit'):
+        return _read_points(source, numeric=False)
+    if tag == _c('multiLvlStrRef'):
+        cache = source.find(_c('multiLvlStrCache'))
+        if cache is not None:
+            # The first level holds the leaf labels, one per point.
+            return _read_points(cache.find(_c('lvl')), numeric=False, count=cache.find(_c('ptCount')))
+    return _read_points(None, numeric=False)
+
+
+def _read_points(cache, numeric: bool, count=None) -> Dict[str, Any]:
+    if cache is None:
+        return {'values': [], 'format_code': None}
+    
+    count = count if count is not None else cache.find(_c('ptCount'))
+    limit = len(cache.findall(_c('pt'))) + MAX_MISSING_POINTS
+    points = []
+    for pt in cache.findall(_c('pt')):
+        idx = int(pt.get('idx'))
+        if 0 <= idx < limit:
+            points.append((idx, pt))
+        else:
+            logger.debug(f"Skipping chart point with out-of-range idx {idx}")
+    
+    size = int(count.get('val')) if count is not None else len(points)
+    size = min(max([size] + [idx + 1 for idx, _ in points]), limit)
+    
+    values = [None] * size
+    for idx, pt in points:
+        v = pt.find(_c('v'))
+        text = v.text if v is not None else None
+        values[idx] = parse_number(text) if numeric else text
+    
+    format_code = cache.find(_c('formatCode'))
+    return {
+        'values': values,
+        'format_code': format_code.text if format_code is not None else None
+    }
+
+
+def _series_name(ser) -> Optional[str]:
+    tx = ser.find(_c('tx'))
+    if tx is None:
+        return None
+    
+    v = tx.find(_c('v'))
+    if v is not None:
+        return v.text
+    
+    ref = tx.find(_c('strRef'))
+    if ref is not None:
+        names = _point_cache(ref)['values']
+        return names[0] if names else None
+    return None
+
+
+def _data_source(ser, *tags: str):
+    for tag in tags:
+        source = ser.find(_c(tag))
+        if source is not None and len(source):
+            return source[0]
+    return None
+
+
+def _series_order(ser) -> int:
+    order = ser.find(_c('order'))
+    return int(order.get('val')) if order is not None else 0
+
+
+def read_chart_series(chart_space) -> Dict[str, Any]:
+    plot_area = chart_space.find(f"{_c('chart')}/{_c('plotArea')}")
+    if plot_area is None:
+        return {'categories': [], 'series': []}
+    
+    series_elements = [
+        ser for plot in plot_area if plot.tag.endswith('Chart')
+        for ser in plot.findall(_c('ser'))
+    ]
+    series_elements.sort(key=_series_order)
+    
+    categories = None
+    series = []
+    for ser in series_elements:
+        category_ref = _data_source(ser, 'cat', 'xVal')
+        if categories is None and category_ref is not None:
+            categories = _point_cache(category_ref)['values']
+        
+        value_ref = _data_source(ser, 'val', 'yVal')
+        values = _point_cache(value_ref) if value_ref is not None else _read_points(None, numeric=True)
+        
+        series_data = {
+            'name': _series_name(ser),
+            'values': values['values'],
+            'format_code': values['format_code']
+        }
+        
+        x_ref = _data_source(ser, 'xVal')
+        if x_ref is not None:
+            series_data['x_values'] = _point_cache(x_ref)['values']
+        
+        series.append(series_data)
+    
+    return {
+        'categories': categories or [],
+        'series': series
+    }
+
+
+def _is_missing(text: Optional[str]) -> bool:
+    return text is None or not text.strip() or text.strip().lower() in MISSING_TOKENS
+
+
+def type_table_columns(cells: List[List[str]]) -> List[Dict[str, Any]]:
+    # The first row is taken as the header (python-pptx tables default to
+    # a header row). A column is numeric when every body cell parses as a
+    # number or is a missing-value marker such as "", "n/a" or "-".
+    if not cells:
+        return []
+    
+    header, body = cells[0], cells[1:]
+    columns = []
+    for idx, title in enumerate(header):
+        texts = [row[idx] if idx < len(row) else '' for row in body]
+        numbers = [parse_number(text) for text in texts]
+        present = [number for text, number in zip(texts, numbers) if not _is_missing(text)]
+        numeric = bool(present) and all(number is not None for number in present)
+        
+        columns.append({
+            'header': title,
+            'type': 'number' if numeric else 'text',
+            'values': numbers if numeric else texts
+        })
+    
+    return columns
@@ -0,0 +1,160 @@
+from typing import Optional
+import fcntl
+import json
+import logging
+import os
+import threading
+import time
+
+from .branding_history import BRANDING_VERSION
+
+logger = logging.getLogger(__name__)
+
+
+class OutputCache:
+    """Index of branded outputs keyed by input content hash and variant.
+    
+    The variant names the brand profile hash, branding version and mode, so
+    an entry is only reused for byte-identical input branded identically.
+    Entries point at files in the output directory rather than copies of
+    them. A hit refreshes the output's mtime, which keeps
+    ``FileHandler.cleanup_old_files`` from expiring outputs still in use;
+    entries whose output has been removed are dropped on lookup and on
+    eviction. Eviction removes outputs unused for ``max_age`` seconds, then
+    the least recently used ones until they fit in ``max_bytes``.
+    
+    Eviction scans the whole index, so ``put`` only triggers it on a
+    process's first put, every ``evict_every`` puts, or when the size seen
+    by the last scan plus what was put since exceeds ``max_bytes``;
+    ``/cleanup`` runs it too. A scan already running in another process is
+    not repeated.
+    """
+    
+    DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+    DEFAULT_MAX_AGE = 24 * 3600
+    EVICT_EVERY = 100
+    SUFFIX = '.json'
+    
+    def __init__(self, index_dir: str, output_dir: str, max_bytes: int = DEFAULT_MAX_BYTES,
+                 max_age: int = DEFAULT_MAX_AGE, evict_every: int = EVICT_EVERY):
+        self.index_dir = index_dir
+        self.output_dir = output_dir
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.evict_every = evict_every
+        self._lock = threading.Lock()
+        # Size total from the last scan (None before the first) and what
+        # this process has put since.
+        self._scanned_bytes = None
+        self._puts_since_scan = 0
+        self._bytes_since_scan = 0
+        os.makedirs(index_dir, exist_ok=True)
+    
+    @staticmethod
+    def variant(profile_hash: str, mode: str) -> str:
+        # Both engines write byte-identical output, so the engine is not part of it.
+        return f"{profile_hash}-v{BRANDING_VERSION}-{mode}"
+    
+    def _entry_path(self, digest: str, variant: str) -> str:
+        return os.path.join(self.index_dir, f"{digest}-{variant}{self.SUFFIX}")
+    
+    def get(self, digest: str, variant: str) -> Optional[str]:
+        path = self._entry_path(digest, variant)
+        
+        try:
+            with open(path, 'r') as f:
+                output_file_id = json.load(f)['output_file_id']
+            os.utime(os.path.join(self.output_dir, output_file_id))
+            logger.debug(f"Output cache hit for {digest[:12]} ({variant})")
+            return output_file_id
+        except FileNotFoundError:
+            # Either no entry or its output was cleaned up.
+            self._remove(path)
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Discarding unreadable output cache entry {path}: {str(e)}")
+            self._remove(path)
+            return None
+    
+    def put(self, digest: str, variant: str, output_path: str):
+        path = self._entry_path(digest, variant)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump({'output_file_id': os.path.basename(output_path)}, f)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not cache output for {digest[:12]}: {str(e)}")
+            self._remove(temp_path)
+            return
+        
+        with self._lock:
+            self._puts_since_scan += 1
+            try:
+                self._bytes_since_scan += os.path.getsize(output_path)
+            except OSError:
+                pass
+            due = (self._scanned_bytes is None or self._puts_since_scan >= self.evict_every
+                   or self._scanned_bytes + self._bytes_since_scan > self.max_bytes)
+        if due:
+            self.evict()
+    
+    def evict(self) -> int:
+        # Returns the number of entries removed, including those whose
+        # output had already been cleaned up.
+        with self._lock, open(f"{self.index_dir.rstrip(os.sep)}.lock", 'a') as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                logger.debug("Output cache eviction already running in another process")
+                return 0
+            
+            entries = []
+            removed = 0
+            total_size = 0
+            cutoff = time.time() - self.max_age
+            
+            for filename in os.listdir(self.index_dir):
+                if not filename.endswith(self.SUFFIX):
+                    continue
+                path = os.path.join(self.index_dir, filename)
+                try:
+                    with open(path, 'r') as f:
+                        output_path = os.path.join(self.output_dir, json.load(f)['output_file_id'])
+                    stat = os.stat(output_path)
+                except (OSError, ValueError, KeyError, TypeError):
+                    self._remove(path)
+                    removed += 1
+                    continue
+                
+                if stat.st_mtime < cutoff:
+                    self._remove_entry(path, output_path)
+                    removed += 1
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path, output_path))
+                total_size += stat.st_size
+            
+            entries.sort()
+            for _, size, path, output_path in entries:
+                if total_size <= self.max_bytes:
+                    break
+                self._remove_entry(path, output_path)
+                removed += 1
+                total_size -= size
+            
+            self._scanned_bytes = total_size
+            self._puts_since_scan = 0
+            self._bytes_since_scan = 0
+            return removed
+    
+    def _remove_entry(self, path: str, output_path: str):
+        self._remove(path)
+        self._remove(output_path)
+        logger.debug(f"Evicted cached output {output_path}")
+    
+    def _remove(self, path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -1,40 +1,119 @@
 from pptx import Presentation
 from pptx.util import Inches, Pt
 from pptx.enum.shapes import MSO_SHAPE_TYPE
-from typing import Dict, Any, Optional
+from typing import Dict, List, Any, Optional, Callable
 import logging
 import os
 from datetime import datetime
 
 from .branding_engine import BrandingEngine
+from .brand_profiles import BrandProfile
+from .xml_branding import XMLBrandingWriter
+from .master_branding import MasterBrandingWriter
+from .branding_history import BrandingHistory, BRANDING_VERSION, fingerprint_slides, replace_slide_xml
+from .package_writer import PassthroughPackageWriter
+from .parallel_branding import ParallelSlideBrander, BrokenProcessPool, P_SP
+from .presentation_cache import PresentationCache
+from .pptx_inspector import PPTXInspector
 
 logger = logging.getLogger(__name__)
 
 
 class OutputGenerator:
-    def __init__(self, input_ppt_path: str, output_dir: str):
+    # 'pptx' formats every run through python-pptx proxies; 'xml' writes the
+    # same properties straight into the slide XML (see XMLBrandingWriter).
+    ENGINES = ('pptx', 'xml')
+    # 'shapes' formats every text shape on every slide; 'master' rewrites the
+    # theme and master text styles once (see MasterBrandingWriter).
+    MODES = ('shapes', 'master')
+    # With the xml engine and more than one worker, shapes mode brands decks
+    # of at least this many (changed) slides across a process pool.
+    PARALLEL_THRESHOLD = 200
+    
+    def __init__(self, input_ppt_path: str, output_dir: str,
+                 cache: Optional[PresentationCache] = None,
+                 profile: Optional[BrandProfile] = None, engine: str = 'pptx',
+                 mode: str = 'shapes', history: Optional[BrandingHistory] = None,
+                 lineage: Optional[str] = None, workers: int = 1,
+                 parallel_threshold: int = PARALLEL_THRESHOLD,
+                 progress: Optional[Callable[[int, int], None]] = None):
+        if engine not in self.ENGINES:
+            raise ValueError(f"engine must be one of {', '.join(self.ENGINES)}")
+        if mode not in self.MODES:
+            raise ValueError(f"mode must be one of {', '.join(self.MODES)}")
         self.input_ppt_path = input_ppt_path
         self.output_dir = output_dir
-        self.branding_engine = BrandingEngine()
+        self.cache = cache
+        self.engine = engine
+        self.mode = mode
+        self.branding_engine = BrandingEngine(profile=profile)
+        self.branding_writer = None
+        # With a history and a lineage, shapes mode re-brands only the slides
+        # that changed since the lineage's last output with the same profile.
+        self.history = history
+        self.lineage = lineage
+        self.reused_slides = 0
+        self.package_stats: Dict[str, int] = {}
+        self.workers = workers
+        self.parallel_threshold = parallel_threshold
+        self.parallel = False
+        # Called with (slides done, slide count) as branding advances.
+        self.progress = progress
         self.input_presentation = None
         self.output_presentation = None
-        
-    def generate_enhanced_presentation(self, branding_config: Dict[str, Any] = None) -> str:
+    
+    def generate_enhanced_presentation(self, branding_config: Dict[str, Any] = None,
+                                       profile: Optional[BrandProfile] = None) -> str:
         try:
-            if branding_config:
+            if profile is not None:
+                self.branding_engine = BrandingEngine(profile=profile)
+            elif branding_config:
                 self.branding_engine = BrandingEngine(branding_config)
             
-            self.input_presentation = Presentation(self.input_ppt_path)
-            self.output_presentation = Presentation(self.input_ppt_path)
+            if self.cache is not None:
+                self.input_presentation = self.cache.get(self.input_ppt_path)
+                self.output_presentation = self.cache.clone(self.input_ppt_path)
+            else:
+                self.input_presentation = Presentation(self.input_ppt_path)
+                self.output_presentation = Presentation(self.input_ppt_path)
             
             logger.info(f"Processing {len(self.output_presentation.slides)} slides")
             
-            for idx, slide in enumerate(self.output_presentation.slides):
-                self.process_slide(slide, idx)
-            
-            self.branding_engine.apply_color_scheme(self.output_presentation)
+            fingerprints = None
+            if self.mode == 'master':
+                MasterBrandingWriter(self.branding_engine.profile).apply(self.output_presentation)
+                self._report_progress(len(self.output_presentation.slides), len(self.output_presentation.slides))
+            else:
+                self.branding_writer = XMLBrandingWriter(self.branding_engine.profile, self.branding_engine) \
+                    if self.engine == 'xml' else None
+                
+                slides = list(self.output_presentation.slides)
+                fingerprints = fingerprint_slides(slides) if self._tracks_history() else None
+                reused = self._reuse_branded_slides(slides, fingerprints) if fingerprints else {}
+                
+                changed = [idx for idx in range(len(slides)) if idx not in reused]
+                self._report_progress(len(reused), len(slides))
+                shape_types = self.branding_engine.classify_slides([slides[idx] for idx in changed], changed)
+                self.parallel = self._runs_parallel(len(changed)) and self._brand_in_parallel(
+                    slides, changed, shape_types)
+                if not self.parallel:
+                    for done, (idx, types) in enumerate(zip(changed, shape_types), len(reused) + 1):
+                        self.process_slide(slides[idx], idx, types)
+                        self._report_progress(done, len(slides))
+                
+                # Workers already set the background of the slides they branded.
+                self.branding_engine.apply_color_scheme(
+                    self.output_presentation,
+                    [slides[idx] for idx in reused] if self.parallel else None
+                )
             
             output_path = self.save_presentation()
+            
+            if fingerprints:
+                members = [slide.part.partname.lstrip('/') for slide in slides]
+                self.history.record(self.lineage, self.branding_engine.profile.hash, BRANDING_VERSION,
+                                    output_path, fingerprints, members)
+            
             logger.info(f"Enhanced presentation saved to: {output_path}")
             
             return output_path
@@ -43,12 +122,66 @@ class OutputGenerator:
             logger.error(f"Error generating enhanced presentation: {str(e)}")
             raise
     
-    def process_slide(self, slide, slide_index: int):
+    def _tracks_history(self) -> bool:
+        return self.history is not None and bool(self.lineage)
+    
+    def _reuse_branded_slides(self, slides, fingerprints: List[str]) -> Dict[int, bytes]:
+        self.reused_slides = 0
+        manifest = self.history.lookup(self.lineage, self.branding_engine.profile.hash, BRANDING_VERSION)
+        if manifest is None:
+            return {}
+        
+        reused = self.history.load_branded_slides(manifest, fingerprints)
+        for idx, blob in reused.items():
+            replace_slide_xml(slides[idx], blob)
+        self.reused_slides = len(reused)
+        logger.info(f"Reusing {len(reused)} of {len(slides)} branded slides for {self.lineage}")
+        return reused
+    
+    def _report_progress(self, done: int, total: int):
+        if self.progress is not None:
+            self.progress(done, total)
+    
+    def _runs_parallel(self, slide_count: int) -> bool:
+        return (self.engine == 'xml' and self.workers > 1 and slide_count > 0
+                and slide_count >= self.parallel_threshold)
+    
+    def _brand_in_parallel(self, slides, indices: List[int], shape_types) -> bool:
+        # Workers only see slide XML, so shapes the batch classifier left
+        # open are classified here first; shapes without a text frame get None.
+        labels = []
+        for idx, types in zip(indices, shape_types):
+            elements = list(slides[idx].shapes._spTree.iter_shape_elms())
+            shapes = list(slides[idx].shapes) if None in types else None
+            labels.append([
+                (label if label is not None else self.branding_engine.determine_shape_type(shapes[position], idx))
+                if element.tag == P_SP else None
+                for position, (element, label) in enumerate(zip(elements, types))
+            ])
+        
+        reused = len(slides) - len(indices)
         try:
-            for shape in slide.shapes:
+            ParallelSlideBrander(self.branding_engine.profile, self.workers).brand(
+                [slides[idx] for idx in indices], labels,
+                lambda done: self._report_progress(reused + done, len(slides)))
+            return True
+        except BrokenProcessPool as e:
+            logger.warning(f"Parallel branding failed, branding serially: {str(e)}")
+            return False
+    
+    def process_slide(self, slide, slide_index: int, shape_types: Optional[List[Optional[str]]] = None):
+        # ``shape_types`` are batch-classified labels in ``slide.shapes`` order;
+        # shapes without one are classified here.
+        try:
+            for position, shape in enumerate(slide.shapes):
                 if shape.has_text_frame:
-                    shape_type = self.branding_engine.determine_shape_type(shape, slide_index)
-                    self.branding_engine.apply_branding_to_shape(shape, shape_type)
+                    shape_type = shape_types[position] if shape_types else None
+                    if shape_type is None:
+                        shape_type = self.branding_engine.determine_shape_type(shape, slide_index)
+                    if self.branding_writer is not None:
+                        self.branding_writer.brand_shape(shape, shape_type)
+                    else:
+                        self.branding_engine.apply_branding_to_shape(shape, shape_type)
                 
                 self.branding_engine.standardize_visual_elements(shape)
             
@@ -65,7 +198,21 @@ class OutputGenerator:
         filename = f"enhanced_presentation_{timestamp}.pptx"
         output_path = os.path.join(self.output_dir, filename)
         
-        self.output_presentation.save(output_path)
+        # Outputs are cached and handed out again, so reserve the name
+        # instead of overwriting an output saved earlier in the same second.
+        suffix = 0
+        while True:
+            try:
+                os.close(os.open(output_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                break
+            except FileExistsError:
+                suffix += 1
+                output_path = os.path.join(self.output_dir, f"enhanced_presentation_{timestamp}_{suffix}.pptx")
+        
+        # Members branding left unchanged are copied still compressed from
+        # the input instead of being deflated again.
+        self.package_stats = PassthroughPackageWriter.save(self.output_presentation, output_path,
+                                                           self.input_ppt_path)
         
         return output_path
     
@@ -105,9 +252,9 @@ class OutputGenerator:
                 logger.error("Output file does not exist")
                 return False
             
-            test_prs = Presentation(output_path)
+            output_summary = PPTXInspector(output_path).inspect()
             
-            if len(test_prs.slides) != len(self.input_presentation.slides):
+            if output_summary['slide_count'] != len(self.input_presentation.slides):
                 logger.error("Slide count mismatch")
                 return False
             
@@ -0,0 +1,134 @@
+from pptx.opc.serialized import PackageWriter
+from typing import Dict
+import logging
+import struct
+import zipfile
+import zlib
+
+logger = logging.getLogger(__name__)
+
+# Encrypted members cannot be copied; data-descriptor members are copied
+# with their sizes moved into the local header.
+_MASK_ENCRYPTED = 0x01
+_MASK_DATA_DESCRIPTOR = 0x08
+_COPYABLE_COMPRESSION = (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED)
+
+
+class _PassthroughZipWriter:
+    """Zip writer that reuses the source archive's compressed members.
+    
+    A member whose content matches the source member of the same name
+    (same size and CRC-32) is copied as stored in the source, without
+    inflating or deflating it. Everything else is deflated as python-pptx
+    would.
+    """
+    
+    def __init__(self, output_path: str, source_path: str):
+        self.output_path = output_path
+        self.source_path = source_path
+        self.copied = 0
+        self.written = 0
+        self._passthrough = True
+    
+    def __enter__(self):
+        self._source = zipfile.ZipFile(self.source_path)
+        self._sources = {info.filename: info for info in self._source.infolist()}
+        self._zipf = zipfile.ZipFile(self.output_path, 'w', compression=zipfile.ZIP_DEFLATED)
+        return self
+    
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        try:
+            self._zipf.close()
+        finally:
+            self._source.close()
+    
+    def write(self, pack_uri, blob: bytes):
+        name = pack_uri.membername
+        source = self._sources.get(name)
+        if (source is not None and source.file_size == len(blob)
+                and source.CRC == zlib.crc32(blob) and self._copy(source)):
+            self.copied += 1
+            return
+        self._zipf.writestr(name, blob)
+        self.written += 1
+    
+    def _copy(self, source: zipfile.ZipInfo) -> bool:
+        if not self._passthrough:
+            return False
+        if source.flag_bits & _MASK_ENCRYPTED or source.compress_type not in _COPYABLE_COMPRESSION:
+            return False
+        
+        # Copying relies on zipfile internals. If a Python version changes
+        # them, deflate every remaining member as Presentation.save would.
+        try:
+            raw = self._read_raw(source)
+            self._append_raw(source, raw)
+        except (AttributeError, struct.error) as e:
+            logger.warning(f"Cannot copy zip members from {self.source_path}, deflating them instead: {e}")
+            self._passthrough = False
+            return False
+        return True
+    
+    def _read_raw(self, source: zipfile.ZipInfo) -> bytes:
+        fp = self._source.fp
+        fp.seek(source.header_offset)
+        header = struct.unpack(zipfile.structFileHeader, fp.read(zipfile.sizeFileHeader))
+        fp.seek(header[zipfile._FH_FILENAME_LENGTH] + header[zipfile._FH_EXTRA_FIELD_LENGTH], 1)
+        return fp.read(source.compress_size)
+    
+    def _append_raw(self, source: zipfile.ZipInfo, raw: bytes):
+        info = zipfile.ZipInfo(source.filename, date_time=source.date_time)
+        info.compress_type = source.compress_type
+        info.flag_bits = source.flag_bits & ~_MASK_DATA_DESCRIPTOR
+        info.external_attr = source.external_attr
+        info.CRC = source.CRC
+        info.compress_size = source.compress_size
+        info.file_size = source.file_size
+        
+        # The same bookkeeping ZipFile.mkdir does for a member it writes
+        # without a compressor. Every internal is looked up before the
+        # archive is touched, so a missing one leaves it as it was.
+        zipf = self._zipf
+        with zipf._lock:
+            seekable, start_dir, writecheck = zipf._seekable, zipf.start_dir, zipf._writecheck
+            if seekable:
+                zipf.fp.seek(start_dir)
+            info.header_offset = zipf.fp.tell()
+            writecheck(info)
+            zipf._didModify = True
+            zipf.filelist.append(info)
+            zipf.NameToInfo[info.filename] = info
+            zipf.fp.write(info.FileHeader())
+            zipf.fp.write(raw)
+            zipf.start_dir = zipf.fp.tell()
+
+
+class PassthroughPackageWriter(PackageWriter):
+    """Saves a presentation loaded from ``source_path``, copying unchanged members.
+    
+    Produces the same members in the same order as ``Presentation.save``.
+    Parts that branding did not touch (media, embedded files, charts, notes
+    and any XML that serializes to the bytes it was loaded from) are copied
+    still compressed from the source archive; only modified parts are
+    deflated again.
+    """
+    
+    def __init__(self, pkg_file, pkg_rels, parts, source_path: str):
+        super().__init__(pkg_file, pkg_rels, parts)
+        self._source_path = source_path
+        self.stats: Dict[str, int] = {}
+    
+    @classmethod
+    def save(cls, presentation, output_path: str, source_path: str) -> Dict[str, int]:
+        package = presentation.part.package
+        writer = cls(output_path, package._rels, tuple(package.iter_parts()), source_path)
+        writer._write()
+        return writer.stats
+    
+    def _write(self):
+        with _PassthroughZipWriter(self._pkg_file, self._source_path) as phys_writer:
+            self._write_content_types_stream(phys_writer)
+            self._write_pkg_rels(phys_writer)
+            self._write_parts(phys_writer)
+        self.stats = {'copied': phys_writer.copied, 'written': phys_writer.written}
+        logger.debug(f"Saved {self._pkg_file}: {self.stats}")
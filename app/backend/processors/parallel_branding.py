@@ -0,0 +1,120 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from lxml import etree
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import qn
+from pptx.slide import _Background
+from typing import Dict, List, Optional, Tuple, Callable
+import logging
+import multiprocessing
+import threading
+
+from .brand_profiles import BrandProfile
+from .branding_history import replace_slide_xml
+from .xml_branding import XMLBrandingWriter
+
+logger = logging.getLogger(__name__)
+
+P_SP = qn('p:sp')
+CHUNKS_PER_WORKER = 4
+MAX_CACHED_WRITERS = 8
+
+# Per worker process: writers by profile hash, so templates are compiled
+# once per profile rather than once per task.
+_writers: Dict[str, XMLBrandingWriter] = {}
+
+
+def _brand_slides(profile: BrandProfile, slides: List[Tuple[bytes, List[Optional[str]]]]) -> List[bytes]:
+    writer = _writers.get(profile.hash)
+    if writer is None:
+        if len(_writers) >= MAX_CACHED_WRITERS:
+            _writers.clear()
+        writer = _writers[profile.hash] = XMLBrandingWriter(profile)
+    
+    branded = []
+    for blob, shape_types in slides:
+        slide = parse_xml(blob)
+        # Same traversal as ``slide.shapes``; ``shape_types`` has a label for
+        # every shape with a text frame and None for the rest.
+        for element, shape_type in zip(slide.cSld.spTree.iter_shape_elms(), shape_types):
+            if shape_type is None:
+                continue
+            try:
+                writer.brand_text_body(element.get_or_add_txBody(), shape_type)
+            except Exception as e:
+                logger.error(f"Error applying branding to shape: {str(e)}")
+        
+        # BrandingEngine.apply_color_scheme for this slide.
+        try:
+            fill = _Background(slide.cSld).fill
+            fill.solid()
+            fill.fore_color.rgb = profile.background
+        except Exception as e:
+            logger.warning(f"Could not apply color scheme: {str(e)}")
+        branded.append(etree.tostring(slide))
+    return branded
+
+
+class ParallelSlideBrander:
+    """Brands slide XML across a pool of worker processes.
+    
+    Shapes are classified in the calling process, where layouts and
+    masters are at hand. Workers receive each slide's serialized XML and
+    its shape labels, apply the profile with ``XMLBrandingWriter``, set the
+    brand background and return the branded XML, which replaces the
+    slide's content in deck order. Output is identical to branding the
+    slides serially with the xml engine. Pools are started once per worker
+    count with the spawn method, so request threads are never forked, and
+    reused by later decks.
+    """
+    
+    _pools: Dict[int, ProcessPoolExecutor] = {}
+    _pools_lock = threading.Lock()
+    
+    def __init__(self, profile: BrandProfile, workers: int):
+        self.profile = profile
+        self.workers = workers
+    
+    @classmethod
+    def _pool(cls, workers: int) -> ProcessPoolExecutor:
+        with cls._pools_lock:
+            pool = cls._pools.get(workers)
+            if pool is None:
+                pool = cls._pools[workers] = ProcessPoolExecutor(
+                    max_workers=workers, mp_context=multiprocessing.get_context('spawn')
+                )
+            return pool
+    
+    @classmethod
+    def _discard_pool(cls, workers: int):
+        with cls._pools_lock:
+            pool = cls._pools.pop(workers, None)
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+    
+    def brand(self, slides, shape_types: List[List[Optional[str]]],
+              progress: Optional[Callable[[int], None]] = None):
+        # ``shape_types`` holds one label per shape of each slide, None for
+        # shapes without a text frame; every text shape must be classified.
+        # ``progress`` receives the number of slides branded so far.
+        tasks = [(slide.part.blob, types) for slide, types in zip(slides, shape_types)]
+        chunk_size = max(1, -(-len(tasks) // (self.workers * CHUNKS_PER_WORKER)))
+        
+        try:
+            pool = self._pool(self.workers)
+            futures = [
+                pool.submit(_brand_slides, self.profile, tasks[start:start + chunk_size])
+                for start in range(0, len(tasks), chunk_size)
+            ]
+            branded = []
+            for future in futures:
+                branded.extend(future.result())
+                if progress is not None:
+                    progress(len(branded))
+        except BrokenProcessPool:
+            self._discard_pool(self.workers)
+            raise
+        
+        for slide, blob in zip(slides, branded):
+            replace_slide_xml(slide, blob)
+        logger.info(f"Branded {len(slides)} slides across {self.workers} worker processes")
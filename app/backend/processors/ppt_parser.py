@@ -3,6 +3,9 @@ from typing import Dict, Any, Optional
 import logging
 import os
 
+from .presentation_cache import PresentationCache
+from .pptx_inspector import PPTXInspector
+
 logger = logging.getLogger(__name__)
 
 
@@ -10,9 +13,11 @@ class PPTParser:
     ALLOWED_EXTENSIONS = {'.pptx'}
     MAX_FILE_SIZE = 50 * 1024 * 1024
     
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, cache: Optional[PresentationCache] = None):
         self.file_path = file_path
+        self.cache = cache
         self.presentation = None
+        self.summary = None
         self._validate_file()
     
     def _validate_file(self):
@@ -31,28 +36,49 @@ class PPTParser:
     
     def load_presentation(self) -> Presentation:
         try:
-            self.presentation = Presentation(self.file_path)
+            if self.cache is not None:
+                self.presentation = self.cache.get(self.file_path)
+            else:
+                self.presentation = Presentation(self.file_path)
             logger.info(f"Loaded presentation with {len(self.presentation.slides)} slides")
             return self.presentation
         except Exception as e:
             logger.error(f"Error loading presentation: {str(e)}")
             raise ValueError(f"Could not load PowerPoint file: {str(e)}")
     
-    def get_presentation_info(self) -> Dict[str, Any]:
-        if not self.presentation:
-            self.load_presentation()
+    def inspect(self) -> Dict[str, Any]:
+        if self.summary is None:
+            self.summary = PPTXInspector(self.file_path).inspect()
+        return self.summary
+    
+    def _get_structure(self) -> Dict[str, Any]:
+        # Use the already-loaded object graph if someone paid for it,
+        # otherwise answer from the zip-level inspector.
+        if self.presentation is None:
+            return self.inspect()
         
         return {
             'slide_count': len(self.presentation.slides),
             'slide_width': self.presentation.slide_width,
             'slide_height': self.presentation.slide_height,
             'layouts_count': len(self.presentation.slide_layouts),
-            'has_notes': any(slide.has_notes_slide for slide in self.presentation.slides)
+            'has_notes': any(slide.has_notes_slide for slide in self.presentation.slides),
+            'has_content': any(len(slide.shapes) for slide in self.presentation.slides)
+        }
+    
+    def get_presentation_info(self) -> Dict[str, Any]:
+        structure = self._get_structure()
+        
+        return {
+            'slide_count': structure['slide_count'],
+            'slide_width': structure['slide_width'],
+            'slide_height': structure['slide_height'],
+            'layouts_count': structure['layouts_count'],
+            'has_notes': structure['has_notes']
         }
     
     def validate_presentation_structure(self) -> Dict[str, Any]:
-        if not self.presentation:
-            self.load_presentation()
+        structure = self._get_structure()
         
         validation = {
             'is_valid': True,
@@ -60,20 +86,14 @@ class PPTParser:
             'warnings': []
         }
         
-        if len(self.presentation.slides) == 0:
+        if structure['slide_count'] == 0:
             validation['is_valid'] = False
             validation['errors'].append("Presentation has no slides")
         
-        if len(self.presentation.slides) > 200:
+        if structure['slide_count'] > 200:
             validation['warnings'].append("Presentation has more than 200 slides. Processing may take longer.")
         
-        has_content = False
-        for slide in self.presentation.slides:
-            if slide.shapes:
-                has_content = True
-                break
-        
-        if not has_content:
+        if not structure['has_content']:
             validation['warnings'].append("No content found in presentation")
         
         logger.info(f"Validation result: {validation}")
@@ -89,7 +109,7 @@ class PPTParser:
             if file_ext not in PPTParser.ALLOWED_EXTENSIONS:
                 return False
             
-            Presentation(file_path)
+            PPTXInspector(file_path).inspect()
             return True
         except Exception as e:
             logger.error(f"File validation failed: {str(e)}")
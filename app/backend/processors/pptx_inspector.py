@@ -0,0 +1,172 @@
+from typing import Dict, Any, Optional
+from xml.etree import ElementTree
+import logging
+import posixpath
+import zipfile
+
+logger = logging.getLogger(__name__)
+
+NS_P = 'http://schemas.openxmlformats.org/presentationml/2006/main'
+NS_R = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+NS_PKG_RELS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+RT_OFFICE_DOCUMENT = NS_R + '/officeDocument'
+RT_NOTES_SLIDE = NS_R + '/notesSlide'
+
+SHAPE_TAGS = {
+    f'{{{NS_P}}}{name}'
+    for name in ('sp', 'grpSp', 'graphicFrame', 'cxnSp', 'pic', 'contentPart')
+}
+
+
+def rels_path_for(partname: str) -> str:
+    directory, filename = posixpath.split(partname)
+    return posixpath.join(directory, '_rels', f'{filename}.rels')
+
+
+def resolve_target(source_partname: str, target: str) -> str:
+    if target.startswith('/'):
+        return target.lstrip('/')
+    base_dir = posixpath.dirname(source_partname)
+    return posixpath.normpath(posixpath.join(base_dir, target))
+
+
+def read_emu(value: Optional[str]) -> Optional[int]:
+    """Parse an EMU attribute value, None if it is missing or malformed."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def read_relationships(archive: zipfile.ZipFile, partname: str) -> Dict[str, Dict[str, str]]:
+    """Map rId -> {'type', 'target'} for a part, empty if it has no rels."""
+    rels_name = rels_path_for(partname)
+    relationships = {}
+    
+    try:
+        stream = archive.open(rels_name)
+    except KeyError:
+        return relationships
+    
+    with stream:
+        for _, elem in ElementTree.iterparse(stream):
+            if elem.tag != f'{{{NS_PKG_RELS}}}Relationship':
+                continue
+            target = elem.get('Target', '')
+            if elem.get('TargetMode') != 'External':
+                target = resolve_target(partname, target)
+            relationships[elem.get('Id')] = {
+                'type': elem.get('Type', ''),
+                'target': target
+            }
+            elem.clear()
+    
+    return relationships
+
+
+class PPTXInspector:
+    """Reads deck-level facts straight from the zip without python-pptx.
+    
+    Only ``presentation.xml``, the first slide master, the relationship
+    parts and the start of each slide part are read, so the cost is
+    independent of the amount of content in the deck.
+    """
+    
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+    
+    def inspect(self) -> Dict[str, Any]:
+        try:
+            with zipfile.ZipFile(self.file_path) as archive:
+                return self._inspect_archive(archive)
+        except (zipfile.BadZipFile, KeyError, ElementTree.ParseError) as e:
+            logger.error(f"Error inspecting presentation: {str(e)}")
+            raise ValueError(f"Could not read PowerPoint file: {str(e)}")
+    
+    def _inspect_archive(self, archive: zipfile.ZipFile) -> Dict[str, Any]:
+        presentation_part = self._find_presentation_part(archive)
+        presentation_rels = read_relationships(archive, presentation_part)
+        
+        slide_rids = []
+        master_rids = []
+        slide_width = None
+        slide_height = None
+        
+        with archive.open(presentation_part) as stream:
+            for _, elem in ElementTree.iterparse(stream):
+                if elem.tag == f'{{{NS_P}}}sldId':
+                    slide_rids.append(elem.get(f'{{{NS_R}}}id'))
+                elif elem.tag == f'{{{NS_P}}}sldMasterId':
+                    master_rids.append(elem.get(f'{{{NS_R}}}id'))
+                elif elem.tag == f'{{{NS_P}}}sldSz':
+                    slide_width = read_emu(elem.get('cx'))
+                    slide_height = read_emu(elem.get('cy'))
+        
+        slide_parts = [presentation_rels[rid]['target'] for rid in slide_rids]
+        
+        layouts_count = 0
+        if master_rids:
+            master_part = presentation_rels[master_rids[0]]['target']
+            layouts_count = self._count_layouts(archive, master_part)
+        
+        has_notes = False
+        has_content = False
+        for slide_part in slide_parts:
+            if not has_notes:
+                slide_rels = read_relationships(archive, slide_part)
+                has_notes = any(rel['type'] == RT_NOTES_SLIDE for rel in slide_rels.values())
+            if not has_content:
+                has_content = self._slide_has_shapes(archive, slide_part)
+            if has_notes and has_content:
+                break
+        
+        return {
+            'slide_count': len(slide_parts),
+            'slide_width': slide_width,
+            'slide_height': slide_height,
+            'layouts_count': layouts_count,
+            'has_notes': has_notes,
+            'has_content': has_content,
+            'slide_parts': slide_parts
+        }
+    
+    def _find_presentation_part(self, archive: zipfile.ZipFile) -> str:
+        package_rels = read_relationships(archive, '')
+        for rel in package_rels.values():
+            if rel['type'] == RT_OFFICE_DOCUMENT:
+                return rel['target']
+        raise KeyError('No officeDocument relationship in package')
+    
+    def _count_layouts(self, archive: zipfile.ZipFile, master_part: str) -> int:
+        count = 0
+        with archive.open(master_part) as stream:
+            for _, elem in ElementTree.iterparse(stream):
+                if elem.tag == f'{{{NS_P}}}sldLayoutId':
+                    count += 1
+                elif elem.tag == f'{{{NS_P}}}sldLayoutIdLst':
+                    break
+        return count
+    
+    def _slide_has_shapes(self, archive: zipfile.ZipFile, slide_part: str) -> bool:
+        # Stop parsing as soon as the first top-level shape in the shape tree
+        # is seen; the remainder of the slide part is never decompressed.
+        depth = 0
+        tree_depth = None
+        
+        with archive.open(slide_part) as stream:
+            for event, elem in ElementTree.iterparse(stream, events=('start', 'end')):
+                if event == 'end':
+                    if elem.tag == f'{{{NS_P}}}spTree':
+                        return False
+                    depth -= 1
+                    continue
+                
+                depth += 1
+                if tree_depth is None:
+                    if elem.tag == f'{{{NS_P}}}spTree':
+                        tree_depth = depth
+                elif depth == tree_depth + 1 and elem.tag in SHAPE_TAGS:
+                    return True
+        
+        return False
@@ -0,0 +1,111 @@
+from pptx import Presentation
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import copy
+import logging
+import os
+import threading
+import zipfile
+
+logger = logging.getLogger(__name__)
+
+
+class PresentationCache:
+    """Per-process LRU cache of parsed presentations.
+    
+    Entries are keyed by file id plus the file's mtime and size, so a file
+    replaced on disk is never served stale. The cached ``Presentation`` is
+    shared between callers and must be treated as read-only; callers that
+    need to modify the deck should use ``clone`` instead.
+    """
+    
+    DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+    
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._current_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def _make_key(self, file_path: str) -> Tuple[str, int, int]:
+        stat = os.stat(file_path)
+        return (os.path.basename(file_path), stat.st_mtime_ns, stat.st_size)
+    
+    def _estimate_size(self, file_path: str) -> int:
+        # The parsed object graph scales with the uncompressed part sizes,
+        # which the zip central directory gives us without decompressing.
+        try:
+            with zipfile.ZipFile(file_path) as archive:
+                return sum(info.file_size for info in archive.infolist())
+        except zipfile.BadZipFile:
+            return os.path.getsize(file_path)
+    
+    def get(self, file_path: str) -> Presentation:
+        key = self._make_key(file_path)
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        
+        presentation = Presentation(file_path)
+        size = self._estimate_size(file_path)
+        
+        with self._lock:
+            self._discard_stale(key)
+            if key not in self._entries:
+                self._entries[key] = (presentation, size)
+                self._current_bytes += size
+            self._evict()
+            logger.debug(f"Cached presentation {key[0]} ({size} bytes)")
+        
+        return presentation
+    
+    def clone(self, file_path: str) -> Presentation:
+        # Copies the object graph and the parsed XML trees; media and other
+        # binary parts keep their blobs as immutable bytes, which deepcopy
+        # shares rather than copies. That takes a fraction of a re-parse.
+        return copy.deepcopy(self.get(file_path))
+    
+    def invalidate(self, file_path: str):
+        file_id = os.path.basename(file_path)
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == file_id]:
+                self._drop(key)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._current_bytes = 0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+    
+    def _discard_stale(self, key: Tuple[str, int, int]):
+        for stale_key in [k for k in self._entries if k[0] == key[0] and k != key]:
+            self._drop(stale_key)
+    
+    def _drop(self, key: Tuple[str, int, int]) -> Optional[Presentation]:
+        presentation, size = self._entries.pop(key)
+        self._current_bytes -= size
+        return presentation
+    
+    def _evict(self):
+        # Always keep the most recent entry, even if it alone exceeds the
+        # budget, so the caller that just parsed it still benefits.
+        while self._current_bytes > self.max_bytes and len(self._entries) > 1:
+            key = next(iter(self._entries))
+            self._drop(key)
+            logger.debug(f"Evicted cached presentation {key[0]}")
@@ -0,0 +1,143 @@
+from pptx.oxml.ns import qn
+from pptx.shapes.shapetree import SlideShapeFactory
+from typing import Dict, List, Any, Optional
+import logging
+
+import numpy as np
+
+from .brand_profiles import ShapeThresholds
+
+logger = logging.getLogger(__name__)
+
+LABELS = ('none', 'title', 'heading', 'body')
+NONE, TITLE, HEADING, BODY = range(len(LABELS))
+UNCLASSIFIED = -1
+
+A_P = qn('a:p')
+A_R = qn('a:r')
+A_T = qn('a:t')
+A_BR = qn('a:br')
+A_FLD = qn('a:fld')
+A_RPR = qn('a:rPr')
+P_SP = qn('p:sp')
+
+# python-pptx's Centipoints: one point is 12700 EMU, so 127 EMU per centipoint.
+EMU_PER_CENTIPOINT = 127
+
+
+def _paragraph_text(p) -> str:
+    parts = []
+    for child in p:
+        if child.tag == A_R or child.tag == A_FLD:
+            t = child.find(A_T)
+            parts.append(t.text or '' if t is not None else '')
+        elif child.tag == A_BR:
+            parts.append('\v')
+    return ''.join(parts)
+
+
+def _text_features(txBody):
+    # The stripped length of ``shape.text`` and the size of the first run of
+    # the first paragraph, read from the XML without building proxies.
+    if txBody is None:
+        return 0, 0
+    
+    paragraphs = txBody.findall(A_P)
+    text = '\n'.join(_paragraph_text(p) for p in paragraphs).strip()
+    if not text:
+        return 0, 0
+    
+    size = 0
+    first_run = paragraphs[0].find(A_R)
+    if first_run is not None:
+        rPr = first_run.find(A_RPR)
+        sz = rPr.get('sz') if rPr is not None else None
+        if sz is not None:
+            size = int(sz) * EMU_PER_CENTIPOINT
+    return len(text), size
+
+
+class ShapeFeatures:
+    """Per-shape classification inputs of a whole deck as flat arrays.
+    
+    One row per shape of ``slide.shapes`` in deck order, read from the
+    shape elements without building shape proxies; ``counts`` holds the
+    number of rows per slide. Placeholders without their own position
+    inherit it from the layout, which is resolved once per layout
+    placeholder. Rows whose position or width is unknown are flagged
+    ``complete == False`` and left to the scalar rules. ``indices`` gives
+    each slide's position in the deck when only some slides are passed.
+    """
+    
+    def __init__(self, slides, indices: Optional[List[int]] = None):
+        slide_index, top, width, text_length, font_size, has_frame, complete = [], [], [], [], [], [], []
+        self.counts = []
+        self._inherited: Dict[Any, Any] = {}
+        
+        for position, slide in enumerate(slides):
+            idx = indices[position] if indices is not None else position
+            count = 0
+            for element in slide.shapes._spTree.iter_shape_elms():
+                count += 1
+                slide_index.append(idx)
+                framed = element.tag == P_SP
+                has_frame.append(framed)
+                length, size = _text_features(element.txBody) if framed else (0, 0)
+                text_length.append(length)
+                font_size.append(size)
+                
+                shape_top = self._geometry(slide, element, 'top', element.y) if length else 0
+                shape_width = self._geometry(slide, element, 'width', element.cx) if length else 0
+                complete.append(shape_top is not None and shape_width is not None)
+                top.append(shape_top or 0)
+                width.append(shape_width or 0)
+            self.counts.append(count)
+        
+        self.slide_index = np.array(slide_index, dtype=np.int32)
+        self.top = np.array(top, dtype=np.int64)
+        self.width = np.array(width, dtype=np.int64)
+        self.text_length = np.array(text_length, dtype=np.int64)
+        self.font_size = np.array(font_size, dtype=np.int64)
+        self.has_frame = np.array(has_frame, dtype=bool)
+        self.complete = np.array(complete, dtype=bool)
+    
+    def _geometry(self, slide, element, name: str, own_value):
+        if own_value is not None or not element.has_ph_elm:
+            return own_value
+        
+        key = (slide.slide_layout.part.partname, element.ph_idx, name)
+        if key not in self._inherited:
+            shape = SlideShapeFactory(element, slide.shapes)
+            self._inherited[key] = getattr(shape, name)
+        return self._inherited[key]
+
+
+def classify_features(features: ShapeFeatures, thresholds: ShapeThresholds) -> np.ndarray:
+    # The scalar rules of BrandingEngine.determine_shape_type as masks,
+    # applied from lowest to highest precedence so earlier rules win.
+    labels = np.full(len(features.top), BODY, dtype=np.int8)
+    
+    labels[features.font_size > thresholds.heading_font_size] = HEADING
+    labels[features.font_size > thresholds.title_font_size] = TITLE
+    labels[(features.text_length < thresholds.heading_text_length) &
+           (features.width > thresholds.heading_min_width)] = HEADING
+    labels[(features.top < thresholds.title_top) |
+           ((features.slide_index == 0) & (features.top < thresholds.first_slide_title_top))] = TITLE
+    labels[~features.has_frame | (features.text_length == 0)] = NONE
+    labels[~features.complete] = UNCLASSIFIED
+    
+    return labels
+
+
+def classify_slides(slides, thresholds: ShapeThresholds,
+                    indices: Optional[List[int]] = None) -> List[List[Optional[str]]]:
+    features = ShapeFeatures(slides, indices)
+    labels = classify_features(features, thresholds)
+    
+    names = [LABELS[label] if label != UNCLASSIFIED else None for label in labels.tolist()]
+    per_slide = []
+    start = 0
+    for count in features.counts:
+        per_slide.append(names[start:start + count])
+        start += count
+    return per_slide
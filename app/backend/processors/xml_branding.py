@@ -0,0 +1,169 @@
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import qn, nsdecls
+from pptx.text.text import _Paragraph
+from typing import Dict
+import copy
+import logging
+
+from .brand_profiles import BrandProfile
+from .branding_engine import BrandingEngine
+
+logger = logging.getLogger(__name__)
+
+A_P = qn('a:p')
+A_R = qn('a:r')
+A_T = qn('a:t')
+A_PPR = qn('a:pPr')
+A_RPR = qn('a:rPr')
+A_LNSPC = qn('a:lnSpc')
+A_LATIN = qn('a:latin')
+A_SOLID_FILL = qn('a:solidFill')
+A_SRGB_CLR = qn('a:srgbClr')
+
+# Child sequences from the DrawingML schema, as python-pptx uses them to
+# position a newly added child: before the first successor present.
+PPR_SUCCESSORS = tuple(qn(f'a:{tag}') for tag in ('r', 'br', 'fld', 'endParaRPr'))
+RPR_SUCCESSORS = (A_T,)
+LNSPC_SUCCESSORS = tuple(qn(f'a:{tag}') for tag in (
+    'spcBef', 'spcAft', 'buClrTx', 'buClr', 'buSzTx', 'buSzPct', 'buSzPts', 'buFontTx',
+    'buFont', 'buNone', 'buAutoNum', 'buChar', 'buBlip', 'tabLst', 'defRPr', 'extLst'
+))
+LATIN_SUCCESSORS = tuple(qn(f'a:{tag}') for tag in (
+    'ea', 'cs', 'sym', 'hlinkClick', 'hlinkMouseOver', 'rtl', 'extLst'
+))
+FILL_CHOICES = tuple(qn(f'a:{tag}') for tag in (
+    'noFill', 'solidFill', 'gradFill', 'blipFill', 'pattFill', 'grpFill'
+))
+FILL_SUCCESSORS = tuple(qn(f'a:{tag}') for tag in (
+    'effectLst', 'effectDag', 'highlight', 'uLnTx', 'uLn', 'uFillTx', 'uFill'
+)) + (A_LATIN,) + LATIN_SUCCESSORS
+COLOR_CHOICES = tuple(qn(f'a:{tag}') for tag in (
+    'scrgbClr', 'srgbClr', 'hslClr', 'sysClr', 'schemeClr', 'prstClr'
+))
+
+
+def _insert_before(parent, element, successors):
+    for tag in successors:
+        successor = parent.find(tag)
+        if successor is not None:
+            successor.addprevious(element)
+            return element
+    parent.append(element)
+    return element
+
+
+def _first_found(parent, tags):
+    for tag in tags:
+        child = parent.find(tag)
+        if child is not None:
+            return child
+    return None
+
+
+class _ShapeTemplate:
+    """The ``a:pPr`` and ``a:rPr`` one shape type's formatting produces.
+    
+    Built by running ``BrandingEngine`` on an empty paragraph, so the
+    templates and the attribute values read from them are exactly what the
+    proxy-based engine would write.
+    """
+    
+    def __init__(self, engine, shape_type: str):
+        p = parse_xml(f'<a:p {nsdecls("a")}><a:r><a:t/></a:r></a:p>')
+        paragraph = _Paragraph(p, None)
+        engine.apply_paragraph_formatting(paragraph, shape_type)
+        engine.apply_run_formatting(paragraph.runs[0], shape_type)
+        
+        self.pPr = p.find(A_PPR)
+        self.rPr = p.find(A_R).find(A_RPR)
+        self.lnSpc = self.pPr.find(A_LNSPC)
+        self.latin = self.rPr.find(A_LATIN)
+        self.solidFill = self.rPr.find(A_SOLID_FILL)
+        
+        self.algn = self.pPr.get('algn')
+        self.typeface = self.latin.get('typeface')
+        self.sz = self.rPr.get('sz')
+        self.b = self.rPr.get('b')
+        self.color = self.solidFill.find(A_SRGB_CLR).get('val')
+
+
+class XMLBrandingWriter:
+    """Applies a brand profile by editing slide XML directly.
+    
+    Produces the same XML as ``BrandingEngine.apply_branding_to_shape``
+    without building a paragraph, run, font and color proxy per run: runs
+    without ``a:rPr`` receive a copy of a precompiled template, existing
+    properties are updated in place following python-pptx's child ordering.
+    """
+    
+    def __init__(self, profile: BrandProfile, engine=None):
+        self.profile = profile
+        self.engine = engine or BrandingEngine(profile=profile)
+        self._templates: Dict[str, _ShapeTemplate] = {}
+    
+    def template(self, shape_type: str) -> _ShapeTemplate:
+        template = self._templates.get(shape_type)
+        if template is None:
+            template = self._templates[shape_type] = _ShapeTemplate(self.engine, shape_type)
+        return template
+    
+    def brand_shape(self, shape, shape_type: str):
+        try:
+            self.brand_text_body(shape._element.get_or_add_txBody(), shape_type)
+            logger.debug(f"Applied branding to shape: {shape.name}")
+        except Exception as e:
+            logger.error(f"Error applying branding to shape: {str(e)}")
+    
+    def brand_text_body(self, txBody, shape_type: str):
+        template = self.template(shape_type)
+        
+        for p in txBody.iterchildren(A_P):
+            self._brand_paragraph(p, template)
+            
+            for r in p.iterchildren(A_R):
+                self._brand_run(r, template)
+    
+    def _brand_paragraph(self, p, template: _ShapeTemplate):
+        pPr = p.find(A_PPR)
+        if pPr is None:
+            _insert_before(p, copy.deepcopy(template.pPr), PPR_SUCCESSORS)
+            return
+        
+        pPr.set('algn', template.algn)
+        for lnSpc in pPr.findall(A_LNSPC):
+            pPr.remove(lnSpc)
+        _insert_before(pPr, copy.deepcopy(template.lnSpc), LNSPC_SUCCESSORS)
+    
+    def _brand_run(self, r, template: _ShapeTemplate):
+        rPr = r.find(A_RPR)
+        if rPr is None:
+            _insert_before(r, copy.deepcopy(template.rPr), RPR_SUCCESSORS)
+            return
+        
+        latin = rPr.find(A_LATIN)
+        if latin is None:
+            _insert_before(rPr, copy.deepcopy(template.latin), LATIN_SUCCESSORS)
+        else:
+            latin.set('typeface', template.typeface)
+        
+        rPr.set('sz', template.sz)
+        rPr.set('b', template.b)
+        
+        solidFill = rPr.find(A_SOLID_FILL)
+        if solidFill is None:
+            for tag in FILL_CHOICES:
+                for fill in rPr.findall(tag):
+                    rPr.remove(fill)
+            _insert_before(rPr, copy.deepcopy(template.solidFill), FILL_SUCCESSORS)
+            return
+        
+        color = _first_found(solidFill, COLOR_CHOICES)
+        if color is None or color.tag != A_SRGB_CLR:
+            color = solidFill.find(A_SRGB_CLR)
+        if color is None:
+            for tag in COLOR_CHOICES:
+                for choice in solidFill.findall(tag):
+                    solidFill.remove(choice)
+            color = solidFill.makeelement(A_SRGB_CLR, {})
+            solidFill.append(color)
+        color.set('val', template.color)
@@ -0,0 +1,590 @@
+from lxml import etree
+from pptx.chart.plot import PlotFactory, PlotTypeInspector
+from pptx.enum.shapes import MSO_SHAPE_TYPE
+from pptx.enum.text import MSO_UNDERLINE
+from pptx.oxml import parse_xml
+from pptx.oxml.simpletypes import ST_Coordinate
+from pptx.parts.image import Image
+from pptx.util import Centipoints
+from typing import Dict, List, Any, Optional, Iterator
+import logging
+import posixpath
+import zipfile
+
+from .collectors import Collector, ExtractionPass
+from .data_extractor import DataExtractor
+from .extraction_options import ExtractionOptions, DEFAULT_OPTIONS
+from .numeric_data import read_chart_series, type_table_columns
+from .pptx_inspector import read_emu, read_relationships, NS_P, NS_R
+
+logger = logging.getLogger(__name__)
+
+NS_A = 'http://schemas.openxmlformats.org/drawingml/2006/main'
+NS_C = 'http://schemas.openxmlformats.org/drawingml/2006/chart'
+NS_CP = 'http://schemas.openxmlformats.org/package/2006/metadata/core-properties'
+NS_DC = 'http://purl.org/dc/elements/1.1/'
+NS_CT = 'http://schemas.openxmlformats.org/package/2006/content-types'
+
+RT_SLIDE_LAYOUT = NS_R + '/slideLayout'
+RT_SLIDE_MASTER = NS_R + '/slideMaster'
+RT_NOTES_SLIDE = NS_R + '/notesSlide'
+RT_CORE_PROPERTIES = 'http://schemas.openxmlformats.org/package/2006/relationships/metadata/core-properties'
+
+URI_CHART = 'http://schemas.openxmlformats.org/drawingml/2006/chart'
+URI_TABLE = 'http://schemas.openxmlformats.org/drawingml/2006/table'
+URI_OLE = 'http://schemas.openxmlformats.org/presentationml/2006/ole'
+
+
+def _p(tag: str) -> str:
+    return f'{{{NS_P}}}{tag}'
+
+
+def _a(tag: str) -> str:
+    return f'{{{NS_A}}}{tag}'
+
+
+P_SP, P_PIC, P_GRAPHIC_FRAME, P_GRP_SP, P_CXN_SP, P_CONTENT_PART = (
+    _p('sp'), _p('pic'), _p('graphicFrame'), _p('grpSp'), _p('cxnSp'), _p('contentPart')
+)
+SHAPE_TAGS = {P_SP, P_PIC, P_GRAPHIC_FRAME, P_GRP_SP, P_CXN_SP, P_CONTENT_PART}
+A_P, A_R, A_BR, A_FLD, A_T = _a('p'), _a('r'), _a('br'), _a('fld'), _a('t')
+TEXT_CHILD_TAGS = {A_R, A_BR, A_FLD}
+
+XSD_BOOLEAN = {'1': True, '0': False, 'true': True, 'false': False}
+
+# Same mapping python-pptx uses for layout -> master placeholder inheritance.
+LAYOUT_BASE_PLACEHOLDER_TYPE = {
+    'body': 'body', 'chart': 'body', 'clipArt': 'body', 'ctrTitle': 'title',
+    'dgm': 'body', 'dt': 'dt', 'ftr': 'ftr', 'media': 'body', 'obj': 'body',
+    'pic': 'body', 'sldNum': 'sldNum', 'subTitle': 'body', 'tbl': 'body',
+    'title': 'title',
+}
+
+XPATH_NS = {'p': NS_P, 'a': NS_A, 'r': NS_R, 'c': NS_C}
+_find_ph = etree.XPath('./*[1]/p:nvPr/p:ph', namespaces=XPATH_NS)
+_find_xfrm = etree.XPath(
+    './p:spPr/a:xfrm | ./p:xfrm | ./p:grpSpPr/a:xfrm', namespaces=XPATH_NS
+)
+_find_paragraphs = etree.XPath('./p:txBody/a:p', namespaces=XPATH_NS)
+_find_graphic_data = etree.XPath('./a:graphic/a:graphicData', namespaces=XPATH_NS)
+_find_name = etree.XPath('./*[1]/p:cNvPr/@name', namespaces=XPATH_NS)
+
+
+class XMLDataExtractor:
+    """Extraction engine that reads slide XML straight from the package.
+    
+    Emits the same schema as ``DataExtractor`` but parses each part once
+    with plain lxml and reads run properties as attributes, instead of
+    going through python-pptx proxy objects for every run.
+    """
+    
+    EXTRACTOR_VERSION = DataExtractor.EXTRACTOR_VERSION
+    
+    def __init__(self, ppt_path: str, options: Optional[ExtractionOptions] = None,
+                 asset_ids: Optional[Dict[str, str]] = None):
+        self.ppt_path = ppt_path
+        self.options = options or DEFAULT_OPTIONS
+        self.asset_ids = asset_ids
+        self._archive = None
+        self._parser = etree.XMLParser(remove_blank_text=False, resolve_entities=False)
+        self._layouts = {}
+        self._masters = {}
+        self._image_info = {}
+        self._content_types = None
+        self._presentation_part = None
+        self._slide_parts = None
+    
+    @property
+    def archive(self) -> zipfile.ZipFile:
+        if self._archive is None:
+            self._archive = zipfile.ZipFile(self.ppt_path)
+        return self._archive
+    
+    def close(self):
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def _parse(self, partname: str):
+        return etree.fromstring(self.archive.read(partname), self._parser)
+    
+    def _load_presentation(self):
+        if self._slide_parts is not None:
+            return
+        
+        package_rels = read_relationships(self.archive, '')
+        self._package_rels = package_rels
+        for rel in package_rels.values():
+            if rel['type'].endswith('/officeDocument'):
+                self._presentation_part = rel['target']
+                break
+        
+        presentation = self._parse(self._presentation_part)
+        rels = read_relationships(self.archive, self._presentation_part)
+        self._slide_parts = [
+            rels[sld_id.get(f'{{{NS_R}}}id')]['target']
+            for sld_id in presentation.iterfind(f'{_p("sldIdLst")}/{_p("sldId")}')
+        ]
+        slide_size = presentation.find(_p('sldSz'))
+        self._slide_size = (
+            (read_emu(slide_size.get('cx')), read_emu(slide_size.get('cy')))
+            if slide_size is not None else (None, None)
+        )
+    
+    def extract_all_data(self) -> Dict[str, Any]:
+        try:
+            data = self.run_collectors(self.options.collectors())
+            logger.info(f"Successfully extracted data from {len(data.get('slides', []))} slides (xml engine)")
+            return data
+        except Exception as e:
+            logger.error(f"Error extracting data: {str(e)}")
+            raise
+    
+    def run_collectors(self, collectors: List[Collector]) -> Dict[str, Any]:
+        try:
+            return ExtractionPass(collectors).run(self)
+        finally:
+            self.close()
+    
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        try:
+            extraction = ExtractionPass(self.options.section_collectors())
+            yield from extraction.iter_records(
+                self, emit_slides=self.options.emit_slides, project=self.options.project_slide
+            )
+        finally:
+            self.close()
+    
+    def extract_slides_data(self) -> List[Dict[str, Any]]:
+        return list(self.iter_slides_data())
+    
+    def iter_slides_data(self) -> Iterator[Dict[str, Any]]:
+        options = self.options
+        if not options.walk_slides:
+            return
+        
+        self._load_presentation()
+        
+        for idx, slide_part in enumerate(self._slide_parts):
+            if not options.includes_slide(idx):
+                continue
+            
+            rels = read_relationships(self.archive, slide_part)
+            layout = self._get_layout(self._related(rels, RT_SLIDE_LAYOUT))
+            
+            slide_data = {
+                'index': idx,
+                'layout': layout['name']
+            }
+            if options.build_shapes:
+                slide = self._parse(slide_part)
+                slide_data['shapes'] = [
+                    self._extract_shape(shape, slide_part, rels, layout)
+                    for shape in self._iter_shapes(slide)
+                ]
+            if options.wants('notes'):
+                slide_data['notes'] = self._extract_notes(rels)
+            yield slide_data
+    
+    def _iter_shapes(self, root) -> Iterator[Any]:
+        tree = root.find(f'{_p("cSld")}/{_p("spTree")}')
+        if tree is None:
+            return
+        for child in tree:
+            if child.tag in SHAPE_TAGS:
+                yield child
+    
+    @staticmethod
+    def _related(rels: Dict[str, Dict[str, str]], rel_type: str) -> Optional[str]:
+        for rel in rels.values():
+            if rel['type'] == rel_type:
+                return rel['target']
+        return None
+    
+    def _get_layout(self, layout_part: Optional[str]) -> Dict[str, Any]:
+        if layout_part in self._layouts:
+            return self._layouts[layout_part]
+        
+        layout = {'name': '', 'placeholders': [], 'master': None}
+        if layout_part:
+            root = self._parse(layout_part)
+            csld = root.find(_p('cSld'))
+            layout['name'] = csld.get('name', '') if csld is not None else ''
+            layout['placeholders'] = [
+                (shape, ph) for shape in self._iter_shapes(root)
+                for ph in _find_ph(shape)[:1]
+            ]
+            master_part = self._related(read_relationships(self.archive, layout_part), RT_SLIDE_MASTER)
+            layout['master'] = self._get_master(master_part)
+        
+        self._layouts[layout_part] = layout
+        return layout
+    
+    def _get_master(self, master_part: Optional[str]) -> List[Any]:
+        if master_part in self._masters:
+            return self._masters[master_part]
+        
+        placeholders = []
+        if master_part:
+            root = self._parse(master_part)
+            placeholders = [
+                (shape, ph) for shape in self._iter_shapes(root)
+                for ph in _find_ph(shape)[:1]
+            ]
+        
+        self._masters[master_part] = placeholders
+        return placeholders
+    
+    @staticmethod
+    def _direct_geometry(shape) -> List[Optional[int]]:
+        xfrm = _find_xfrm(shape)
+        if not xfrm:
+            return [None, None, None, None]
+        
+        off = xfrm[0].find(_a('off'))
+        ext = xfrm[0].find(_a('ext'))
+        return [
+            ST_Coordinate.convert_from_xml(off.get('x')) if off is not None else None,
+            ST_Coordinate.convert_from_xml(off.get('y')) if off is not None else None,
+            int(ext.get('cx')) if ext is not None else None,
+            int(ext.get('cy')) if ext is not None else None
+        ]
+    
+    def _geometry(self, shape, ph, layout) -> List[Optional[int]]:
+        geometry = self._direct_geometry(shape)
+        if ph is None or shape.tag == P_GRAPHIC_FRAME or None not in geometry:
+            return geometry
+        
+        base = self._layout_placeholder_geometry(ph, layout)
+        return [value if value is not None else base[i] for i, value in enumerate(geometry)]
+    
+    def _layout_placeholder_geometry(self, ph, layout) -> List[Optional[int]]:
+        idx = int(ph.get('idx', '0'))
+        for shape, layout_ph in layout['placeholders']:
+            if int(layout_ph.get('idx', '0')) != idx:
+                continue
+            
+            geometry = self._direct_geometry(shape)
+            if shape.tag != P_SP or None not in geometry:
+                return geometry
+            
+            base_type = LAYOUT_BASE_PLACEHOLDER_TYPE.get(layout_ph.get('type', 'obj'))
+            base = [None, None, None, None]
+            for master_shape, master_ph in layout['master'] or []:
+                if master_ph.get('type', 'obj') == base_type:
+                    base = self._direct_geometry(master_shape)
+                    break
+            return [value if value is not None else base[i] for i, value in enumerate(geometry)]
+        
+        return [None, None, None, None]
+    
+    def _shape_type(self, shape, ph, graphic_data):
+        tag = shape.tag
+        
+        if tag == P_SP:
+            if ph is not None:
+                return MSO_SHAPE_TYPE.PLACEHOLDER
+            sp_pr = shape.find(_p('spPr'))
+            if sp_pr is not None and sp_pr.find(_a('custGeom')) is not None:
+                return MSO_SHAPE_TYPE.FREEFORM
+            c_nv_sp_pr = shape.find(f'{_p("nvSpPr")}/{_p("cNvSpPr")}')
+            is_textbox = c_nv_sp_pr is not None and XSD_BOOLEAN.get(c_nv_sp_pr.get('txBox')) is True
+            if sp_pr is not None and sp_pr.find(_a('prstGeom')) is not None and not is_textbox:
+                return MSO_SHAPE_TYPE.AUTO_SHAPE
+            if is_textbox:
+                return MSO_SHAPE_TYPE.TEXT_BOX
+            # python-pptx raises for these; report the shape untyped, as
+            # DataExtractor.get_shape_type does, rather than failing the deck.
+            name = _find_name(shape)
+            logger.debug(f"Shape '{name[0] if name else ''}' has no recognized shape type")
+            return None
+        
+        if tag == P_PIC:
+            if ph is not None:
+                return MSO_SHAPE_TYPE.PLACEHOLDER
+            if shape.find(f'{_p("nvPicPr")}/{_p("nvPr")}/{_a("videoFile")}') is not None:
+                return MSO_SHAPE_TYPE.MEDIA
+            return MSO_SHAPE_TYPE.PICTURE
+        
+        if tag == P_GRAPHIC_FRAME:
+            uri = graphic_data.get('uri') if graphic_data is not None else None
+            if uri == URI_CHART:
+                return MSO_SHAPE_TYPE.CHART
+            if uri == URI_TABLE:
+                return MSO_SHAPE_TYPE.TABLE
+            if uri == URI_OLE:
+                embedded = graphic_data.find(f'.//{_p("oleObj")}/{_p("embed")}') is not None
+                return MSO_SHAPE_TYPE.EMBEDDED_OLE_OBJECT if embedded else MSO_SHAPE_TYPE.LINKED_OLE_OBJECT
+            return None
+        
+        if tag == P_GRP_SP:
+            return MSO_SHAPE_TYPE.GROUP
+        if tag == P_CXN_SP:
+            return MSO_SHAPE_TYPE.LINE
+        return None
+    
+    def _extract_shape(self, shape, slide_part: str, rels, layout) -> Dict[str, Any]:
+        ph_list = _find_ph(shape)
+        ph = ph_list[0] if ph_list else None
+        graphic_data = None
+        if shape.tag == P_GRAPHIC_FRAME:
+            found = _find_graphic_data(shape)
+            graphic_data = found[0] if found else None
+        
+        shape_type = self._shape_type(shape, ph, graphic_data)
+        left, top, width, height = self._geometry(shape, ph, layout)
+        name = _find_name(shape)
+        
+        shape_info = {
+            'type': str(shape_type),
+            'name': name[0] if name else '',
+            'left': left,
+            'top': top,
+            'width': width,
+            'height': height
+        }
+        
+        options = self.options
+        if options.build_text and shape.tag == P_SP:
+            shape_info['text_content'] = self.extract_text(shape)
+        
+        if options.wants('images') and shape_type == MSO_SHAPE_TYPE.PICTURE:
+            shape_info['image'] = self._extract_image(shape, rels, width, height)
+        
+        if options.wants('tables') and shape_type == MSO_SHAPE_TYPE.TABLE:
+            shape_info['table_data'] = self._extract_table(graphic_data)
+        
+        if options.wants('charts') and shape_type == MSO_SHAPE_TYPE.CHART:
+            shape_info['chart_data'] = self._extract_chart(graphic_data, rels)
+        
+        return shape_info
+    
+    def extract_text(self, shape) -> Dict[str, Any]:
+        paragraphs = _find_paragraphs(shape)
+        if shape.find(_p('txBody')) is None:
+            # python-pptx adds an empty txBody with one paragraph on access.
+            paragraph = {'text': '', 'level': 0}
+            if self.options.build_runs:
+                paragraph['runs'] = []
+            return {
+                'full_text': '',
+                'paragraphs': [paragraph]
+            }
+        
+        paragraph_data = [self._extract_paragraph(p) for p in paragraphs]
+        return {
+            'full_text': '\n'.join(p['text'] for p in paragraph_data),
+            'paragraphs': paragraph_data
+        }
+    
+    def _extract_paragraph(self, paragraph) -> Dict[str, Any]:
+        texts = []
+        runs = []
+        build_runs = self.options.build_runs
+        
+        for child in paragraph:
+            tag = child.tag
+            if tag == A_BR:
+                texts.append('\v')
+                continue
+            if tag != A_R and tag != A_FLD:
+                continue
+            
+            t = child.find(A_T)
+            text = t.text if t is not None and t.text is not None else ''
+            texts.append(text)
+            
+            if build_runs and tag == A_R:
+                runs.append(self._extract_run(child, text))
+        
+        p_pr = paragraph.find(_a('pPr'))
+        level = int(p_pr.get('lvl', '0')) if p_pr is not None else 0
+        
+        paragraph_data = {
+            'text': ''.join(texts),
+            'level': level
+        }
+        if build_runs:
+            paragraph_data['runs'] = runs
+        return paragraph_data
+    
+    def _extract_run(self, run, text: str) -> Dict[str, Any]:
+        r_pr = run.find(_a('rPr'))
+        if r_pr is None:
+            return {
+                'text': text,
+                'font_name': None,
+                'font_size': None,
+                'bold': None,
+                'italic': None,
+                'underline': None,
+                'color': None
+            }
+        
+        latin = r_pr.find(_a('latin'))
+        size = r_pr.get('sz')
+        bold = r_pr.get('b')
+        italic = r_pr.get('i')
+        
+        return {
+            'text': text,
+            'font_name': latin.get('typeface') if latin is not None else None,
+            'font_size': Centipoints(int(size)).pt if size is not None else None,
+            'bold': XSD_BOOLEAN[bold] if bold is not None else None,
+            'italic': XSD_BOOLEAN[italic] if italic is not None else None,
+            'underline': self._underline(r_pr.get('u')),
+            'color': self._solid_rgb(r_pr)
+        }
+    
+    @staticmethod
+    def _underline(value: Optional[str]):
+        if value is None:
+            return None
+        underline = MSO_UNDERLINE.from_xml(value)
+        if underline is MSO_UNDERLINE.NONE:
+            return False
+        if underline is MSO_UNDERLINE.SINGLE_LINE:
+            return True
+        return underline
+    
+    @staticmethod
+    def _solid_rgb(r_pr) -> Optional[str]:
+        solid_fill = r_pr.find(_a('solidFill'))
+        if solid_fill is None:
+            return None
+        srgb = solid_fill.find(_a('srgbClr'))
+        if srgb is None:
+            return None
+        return f"#{srgb.get('val').upper()}"
+    
+    def _extract_image(self, shape, rels, width, height) -> Dict[str, Any]:
+        try:
+            blip = shape.find(f'{_p("blipFill")}/{_a("blip")}')
+            rid = blip.get(f'{{{NS_R}}}embed') if blip is not None else None
+            if rid is None:
+                raise ValueError("no embedded image")
+            
+            partname = rels[rid]['target']
+            if partname not in self._image_info:
+                image = Image(self.archive.read(partname), None)
+                ext = posixpath.splitext(partname)[1].lstrip('.')
+                self._image_info[partname] = (image.content_type, f"image.{ext}")
+            
+            content_type, filename = self._image_info[partname]
+            image_info = {
+                'content_type': content_type,
+                'filename': filename,
+                'width': width,
+                'height': height
+            }
+            if self.asset_ids is not None:
+                image_info['asset_id'] = self.asset_ids.get(partname)
+            return image_info
+        except Exception as e:
+            logger.warning(f"Could not extract image info: {str(e)}")
+            return {}
+    
+    def _extract_table(self, graphic_data) -> Dict[str, Any]:
+        try:
+            tbl = graphic_data.find(_a('tbl'))
+            rows = tbl.findall(_a('tr'))
+            grid = tbl.find(_a('tblGrid'))
+            cells = [[self._cell_text(tc) for tc in tr.findall(_a('tc'))] for tr in rows]
+            return {
+                'rows': len(rows),
+                'columns': len(grid.findall(_a('gridCol'))) if grid is not None else 0,
+                'cells': cells,
+                'typed_columns': type_table_columns(cells)
+            }
+        except Exception as e:
+            logger.warning(f"Could not extract table data: {str(e)}")
+            return {}
+    
+    def _cell_text(self, tc) -> str:
+        tx_body = tc.find(_a('txBody'))
+        if tx_body is None:
+            return ''
+        return '\n'.join(self._paragraph_text(p) for p in tx_body.findall(A_P))
+    
+    @staticmethod
+    def _paragraph_text(paragraph) -> str:
+        texts = []
+        for child in paragraph:
+            if child.tag == A_BR:
+                texts.append('\v')
+            elif child.tag in TEXT_CHILD_TAGS:
+                t = child.find(A_T)
+                texts.append(t.text if t is not None and t.text is not None else '')
+        return ''.join(texts)
+    
+    def _extract_chart(self, graphic_data, rels) -> Dict[str, Any]:
+        try:
+            chart_ref = graphic_data.find(f'{{{NS_C}}}chart')
+            chart_part = rels[chart_ref.get(f'{{{NS_R}}}id')]['target']
+            # Chart parts are small; reuse python-pptx's plot-type rules on
+            # the chart element rather than re-deriving them.
+            chart_space = parse_xml(self.archive.read(chart_part))
+            plot = PlotFactory(chart_space.chart.plotArea.xCharts[0], None)
+            chart_info = {
+                'has_chart': True,
+                'chart_type': str(PlotTypeInspector.chart_type(plot))
+            }
+            chart_info.update(read_chart_series(chart_space))
+            return chart_info
+        except Exception as e:
+            logger.warning(f"Could not extract chart info: {str(e)}")
+            return {}
+    
+    def _extract_notes(self, rels) -> str:
+        notes_part = self._related(rels, RT_NOTES_SLIDE)
+        if not notes_part:
+            return ""
+        
+        try:
+            notes = self._parse(notes_part)
+            for shape in self._iter_shapes(notes):
+                ph_list = _find_ph(shape)
+                if not ph_list or ph_list[0].get('type', 'obj') != 'body':
+                    continue
+                if shape.tag != P_SP:
+                    return ""
+                tx_body = shape.find(_p('txBody'))
+                if tx_body is None:
+                    return ""
+                return '\n'.join(self._paragraph_text(p) for p in tx_body.findall(A_P))
+            return ""
+        except Exception as e:
+            logger.warning(f"Could not extract notes: {str(e)}")
+            return ""
+    
+    def extract_metadata(self) -> Dict[str, Any]:
+        self._load_presentation()
+        
+        core = {'title': '', 'author': '', 'subject': ''}
+        core_part = self._related(self._package_rels, RT_CORE_PROPERTIES)
+        if core_part is None:
+            # Matches the default core properties python-pptx creates.
+            core['title'] = 'PowerPoint Presentation'
+        else:
+            root = self._parse(core_part)
+            for key, tag in (('title', f'{{{NS_DC}}}title'),
+                             ('author', f'{{{NS_DC}}}creator'),
+                             ('subject', f'{{{NS_DC}}}subject')):
+                element = root.find(tag)
+                if element is not None and element.text is not None:
+                    core[key] = element.text
+        
+        return {
+            'title': core['title'],
+            'author': core['author'],
+            'subject': core['subject'],
+            'slide_count': len(self._slide_parts),
+            'slide_width': self._slide_size[0],
+            'slide_height': self._slide_size[1]
+        }
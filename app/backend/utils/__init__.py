@@ -1,3 +1,12 @@
 from .file_handler import FileHandler
+from .upload_store import UploadStore
+from .upload_sessions import UploadSessionManager
+from .search_index import SearchIndex
+from .job_queue import JobQueue, JobWorker, JobWorkerPool
+from .batch_runner import BatchRunner
+from .checkpoint_manifest import CheckpointManifest
 
-__all__ = ['FileHandler']
+__all__ = [
+    'FileHandler', 'UploadStore', 'UploadSessionManager', 'SearchIndex', 'JobQueue', 'JobWorker',
+    'JobWorkerPool', 'BatchRunner', 'CheckpointManifest'
+]
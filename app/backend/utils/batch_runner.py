@@ -0,0 +1,97 @@
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Any, Callable, Iterator, Sequence, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class BatchRunner:
+    """Runs one function over many inputs in a bounded process pool.
+    
+    At most ``workers`` calls run at once. Each input carries a weight,
+    normally its file size, and new calls are only submitted while the
+    weights in flight stay within ``max_bytes``, so a batch of large decks
+    cannot hold them all in memory at once; an input heavier than the
+    limit still runs, on its own. The pool is started on first use with
+    the spawn method and kept for later batches; ``fn`` and
+    ``initializer``, which each worker calls with ``initargs`` on start,
+    must be module-level functions.
+    
+    Only the offline CLI uses it. The API's /process/batch runs in a
+    daemonic job worker, which cannot start a pool, so it fans decks out as
+    job-queue jobs instead.
+    """
+    
+    def __init__(self, workers: int, max_bytes: Optional[int] = None,
+                 initializer: Optional[Callable[..., None]] = None, initargs: Tuple = ()):
+        self.workers = max(1, workers)
+        self.max_bytes = max_bytes
+        self.initializer = initializer
+        self.initargs = initargs
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+    
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'),
+                    initializer=self.initializer, initargs=self.initargs
+                )
+            return self._pool
+    
+    def close(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+    
+    def run(self, fn: Callable[..., Any], args: Sequence[Tuple], weights: Optional[Sequence[int]] = None
+            ) -> Iterator[Tuple[int, Any, Optional[BaseException]]]:
+        # Yields (index, result, error) as calls finish, in completion
+        # order; error is the exception a call raised, result None then.
+        weights = list(weights) if weights is not None else [0] * len(args)
+        pool = self._get_pool()
+        next_index = 0
+        in_flight = {}
+        in_flight_bytes = 0
+        
+        try:
+            while next_index < len(args) or in_flight:
+                while next_index < len(args) and len(in_flight) < self.workers and (
+                        not in_flight or self.max_bytes is None
+                        or in_flight_bytes + weights[next_index] <= self.max_bytes):
+                    future = pool.submit(fn, *args[next_index])
+                    in_flight[future] = next_index
+                    in_flight_bytes += weights[next_index]
+                    next_index += 1
+                
+                finished, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    index = in_flight.pop(future)
+                    in_flight_bytes -= weights[index]
+                    error = future.exception()
+                    yield index, None if error is not None else future.result(), error
+                    if isinstance(error, BrokenProcessPool):
+                        raise error
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); the pool is unusable,
+            # so start a fresh one next time and fail what was left.
+            logger.error('Batch worker process died; failing the remaining inputs')
+            with self._lock:
+                if self._pool is pool:
+                    self._pool = None
+            pool.shutdown(wait=False, cancel_futures=True)
+            for future, index in in_flight.items():
+                if future.done() and not future.cancelled() and future.exception() is None:
+                    yield index, future.result(), None
+                else:
+                    yield index, None, BrokenProcessPool('Worker process died')
+            for index in range(next_index, len(args)):
+                yield index, None, BrokenProcessPool('Worker process died')
+        finally:
+            for future in in_flight:
+                future.cancel()
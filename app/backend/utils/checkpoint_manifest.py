@@ -0,0 +1,111 @@
+import os
+import json
+import hashlib
+from typing import Optional, Dict, Any
+import logging
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def file_digest(path: str) -> str:
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+class CheckpointManifest:
+    """Append-only JSON-lines record of the files a bulk run has finished.
+    
+    Each line holds an input's path, size, mtime, content hash and output
+    path, plus the run's ``signature`` (the settings that determine the
+    output). Only entries with the current signature and an existing output
+    count as done, so changing the profile or options redoes everything. A
+    file is done when its path, size and mtime match an entry, or failing
+    that when its content hash does; lines cut short by an interrupted run
+    are ignored.
+    """
+    
+    def __init__(self, path: str, signature: Dict[str, Any]):
+        self.path = path
+        self.signature = json.dumps(signature, sort_keys=True)
+        self._by_path: Dict[str, Dict[str, Any]] = {}
+        self._by_digest: Dict[str, Dict[str, Any]] = {}
+        torn = self._load()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, 'a')
+        if torn:
+            # Keep the next entry off the end of a line cut short.
+            self._file.write('\n')
+    
+    def _load(self) -> bool:
+        # Returns whether the file ends in an unterminated line.
+        if not os.path.exists(self.path):
+            return False
+        
+        line = '\n'
+        with open(self.path, 'r') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if not isinstance(entry, dict) or entry.get('signature') != self.signature:
+                    continue
+                self._by_path[entry['path']] = entry
+                self._by_digest[entry['sha256']] = entry
+        logger.info(f"Loaded {len(self._by_path)} finished files from {self.path}")
+        return not line.endswith('\n')
+    
+    def __len__(self) -> int:
+        return len(self._by_path)
+    
+    @property
+    def has_entries(self) -> bool:
+        return bool(self._by_digest)
+    
+    @staticmethod
+    def _stamp(path: str):
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns
+    
+    def find(self, path: str) -> Optional[Dict[str, Any]]:
+        # Cheap check by stat, without reading the file.
+        entry = self._by_path.get(os.path.abspath(path))
+        if entry is None or [entry['size'], entry['mtime_ns']] != list(self._stamp(path)):
+            return None
+        return entry if os.path.exists(entry['output']) else None
+    
+    def find_digest(self, digest: str) -> Optional[Dict[str, Any]]:
+        entry = self._by_digest.get(digest)
+        if entry is None or not os.path.exists(entry['output']):
+            return None
+        return entry
+    
+    def record(self, path: str, digest: str, output: str):
+        # ``path`` must not have changed since ``digest`` was taken.
+        size, mtime_ns = self._stamp(path)
+        entry = {
+            'path': os.path.abspath(path),
+            'size': size,
+            'mtime_ns': mtime_ns,
+            'sha256': digest,
+            'output': os.path.abspath(output),
+            'signature': self.signature
+        }
+        self._file.write(json.dumps(entry) + '\n')
+        self._file.flush()
+        self._by_path[entry['path']] = entry
+        self._by_digest[digest] = entry
+    
+    def close(self):
+        self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
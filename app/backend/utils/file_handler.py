@@ -1,20 +1,30 @@
 import os
 import shutil
+import hashlib
+import zipfile
 from werkzeug.utils import secure_filename
-from typing import Optional
+from typing import Optional, Dict, Any, List, Tuple, BinaryIO
 import logging
 
+from .upload_store import UploadStore
+
 logger = logging.getLogger(__name__)
 
 
 class FileHandler:
     ALLOWED_EXTENSIONS = {'pptx'}
     MAX_FILE_SIZE = 50 * 1024 * 1024
+    CHUNK_SIZE = 64 * 1024
+    MAX_UNCOMPRESSED_SIZE = 512 * 1024 * 1024
+    MAX_COMPRESSION_RATIO = 100
+    RATIO_CHECK_MIN_SIZE = 1024 * 1024
+    MAX_ZIP_ENTRIES = 10000
     
-    def __init__(self, upload_dir: str, output_dir: str):
+    def __init__(self, upload_dir: str, output_dir: str, content_addressed: bool = False):
         self.upload_dir = upload_dir
         self.output_dir = output_dir
         self._ensure_directories()
+        self.store = UploadStore(upload_dir) if content_addressed else None
     
     def _ensure_directories(self):
         os.makedirs(self.upload_dir, exist_ok=True)
@@ -26,6 +36,10 @@ class FileHandler:
                filename.rsplit('.', 1)[1].lower() in self.ALLOWED_EXTENSIONS
     
     def save_uploaded_file(self, file) -> Optional[str]:
+        result = self.stream_uploaded_file(file)
+        return result['path'] if result else None
+    
+    def stream_uploaded_file(self, file) -> Optional[Dict[str, Any]]:
         try:
             if not file or file.filename == '':
                 logger.error("No file provided")
@@ -35,27 +49,123 @@ class FileHandler:
                 logger.error(f"Invalid file extension: {file.filename}")
                 return None
             
-            filename = secure_filename(file.filename)
-            
-            import uuid
-            unique_filename = f"{uuid.uuid4().hex}_{filename}"
+            file_path = self.new_upload_path(file.filename)
+            temp_path = f"{file_path}.part"
             
-            file_path = os.path.join(self.upload_dir, unique_filename)
-            file.save(file_path)
-            
-            file_size = os.path.getsize(file_path)
-            if file_size > self.MAX_FILE_SIZE:
-                os.remove(file_path)
-                logger.error(f"File too large: {file_size} bytes")
+            streamed = self._stream_to_path(getattr(file, 'stream', file), temp_path)
+            if not streamed:
                 return None
             
-            logger.info(f"File saved: {file_path}")
-            return file_path
+            digest, file_size = streamed
+            return self.commit_upload(temp_path, file_path, digest, file_size)
         
         except Exception as e:
             logger.error(f"Error saving file: {str(e)}")
             return None
     
+    def new_upload_path(self, filename: str) -> str:
+        import uuid
+        unique_filename = f"{uuid.uuid4().hex}_{secure_filename(filename)}"
+        return os.path.join(self.upload_dir, unique_filename)
+    
+    def commit_upload(self, temp_path: str, file_path: str, digest: str,
+                      file_size: int) -> Optional[Dict[str, Any]]:
+        if not self.check_zip_safety(temp_path):
+            os.remove(temp_path)
+            return None
+        
+        deduplicated = False
+        
+        if self.store:
+            stored = self.store.add(temp_path, digest, os.path.basename(file_path))
+            deduplicated = stored['deduplicated']
+        else:
+            os.replace(temp_path, file_path)
+        
+        logger.info(f"File saved: {file_path}")
+        return {
+            'path': file_path,
+            'sha256': digest,
+            'size': file_size,
+            'deduplicated': deduplicated
+        }
+    
+    def _stream_to_path(self, stream: BinaryIO, path: str) -> Optional[Tuple[str, int]]:
+        hasher = hashlib.sha256()
+        file_size = 0
+        
+        try:
+            with open(path, 'wb') as out:
+                while True:
+                    chunk = stream.read(self.CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    
+                    file_size += len(chunk)
+                    if file_size > self.MAX_FILE_SIZE:
+                        raise ValueError(f"File too large: more than {self.MAX_FILE_SIZE} bytes")
+                    
+                    hasher.update(chunk)
+                    out.write(chunk)
+        except Exception as e:
+            if os.path.exists(path):
+                os.remove(path)
+            logger.error(f"Upload aborted: {str(e)}")
+            return None
+        
+        return hasher.hexdigest(), file_size
+    
+    def check_zip_safety(self, file_path: str) -> bool:
+        # Only the central directory is read here. zipfile never inflates an
+        # entry past its declared size, so bounding the declared sizes bounds
+        # what any downstream reader can be made to decompress.
+        try:
+            with zipfile.ZipFile(file_path) as archive:
+                entries = archive.infolist()
+        except zipfile.BadZipFile as e:
+            logger.error(f"Not a valid zip archive: {str(e)}")
+            return False
+        
+        if len(entries) > self.MAX_ZIP_ENTRIES:
+            logger.error(f"Too many zip entries: {len(entries)}")
+            return False
+        
+        total_size = 0
+        for entry in entries:
+            total_size += entry.file_size
+            if total_size > self.MAX_UNCOMPRESSED_SIZE:
+                logger.error(f"Declared uncompressed size exceeds {self.MAX_UNCOMPRESSED_SIZE} bytes")
+                return False
+            
+            if entry.file_size >= self.RATIO_CHECK_MIN_SIZE:
+                ratio = entry.file_size / max(entry.compress_size, 1)
+                if ratio > self.MAX_COMPRESSION_RATIO:
+                    logger.error(f"Suspicious compression ratio {ratio:.0f} for {entry.filename}")
+                    return False
+        
+        return True
+    
+    def get_file_digest(self, file_path: str) -> str:
+        if self.store:
+            digest = self.store.resolve(os.path.basename(file_path))
+            if digest:
+                return digest
+        
+        hasher = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(self.CHUNK_SIZE), b''):
+                hasher.update(chunk)
+        return hasher.hexdigest()
+    
+    def get_cached_inspection(self, digest: str) -> Optional[Dict[str, Any]]:
+        if not self.store:
+            return None
+        return self.store.get_cached_result(digest)
+    
+    def cache_inspection(self, digest: str, result: Dict[str, Any]):
+        if self.store:
+            self.store.set_cached_result(digest, result)
+    
     def get_file_info(self, file_path: str) -> dict:
         if not os.path.exists(file_path):
             return {}
@@ -67,12 +177,16 @@ class FileHandler:
             'extension': os.path.splitext(file_path)[1]
         }
     
-    def cleanup_old_files(self, directory: str, max_age_hours: int = 24):
+    def cleanup_old_files(self, directory: str, max_age_hours: int = 24) -> List[str]:
+        removed = []
         try:
             import time
             current_time = time.time()
             
             for filename in os.listdir(directory):
+                if filename.startswith('.'):
+                    continue
+                
                 file_path = os.path.join(directory, filename)
                 
                 if os.path.isfile(file_path):
@@ -80,15 +194,23 @@ class FileHandler:
                     
                     if file_age > (max_age_hours * 3600):
                         os.remove(file_path)
+                        removed.append(file_path)
                         logger.info(f"Removed old file: {file_path}")
+            
+            if self.store and os.path.abspath(directory) == os.path.abspath(self.upload_dir):
+                self.store.collect_garbage()
         
         except Exception as e:
             logger.error(f"Error cleaning up files: {str(e)}")
+        
+        return removed
     
     def delete_file(self, file_path: str) -> bool:
         try:
             if os.path.exists(file_path):
                 os.remove(file_path)
+                if self.store and os.path.dirname(os.path.abspath(file_path)) == os.path.abspath(self.upload_dir):
+                    self.store.release(os.path.basename(file_path))
                 logger.info(f"Deleted file: {file_path}")
                 return True
             return False
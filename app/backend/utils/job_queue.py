@@ -0,0 +1,307 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+import multiprocessing
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, List, Callable, Sequence
+import logging
+
+logger = logging.getLogger(__name__)
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+FINISHED_STATES = (DONE, FAILED)
+
+
+class JobQueue:
+    """Durable job queue in a SQLite database.
+    
+    Jobs survive restarts: a job is claimed by flipping it to ``running``
+    inside an immediate transaction, so concurrent workers in any process
+    never take the same one. Running jobs refresh ``updated_at`` with each
+    progress report or heartbeat; one that has not been heard from for
+    ``lease`` seconds (its worker died) is claimed again, up to
+    ``max_attempts`` times. Each claim gets a new ``claim_token``, and
+    progress, heartbeats and the outcome are only recorded with the token of
+    the current claim, so a worker whose job was claimed again cannot
+    overwrite the new attempt's state.
+    """
+    
+    DEFAULT_LEASE = 600
+    MAX_ATTEMPTS = 3
+    
+    def __init__(self, db_path: str, lease: int = DEFAULT_LEASE, max_attempts: int = MAX_ATTEMPTS):
+        self.db_path = db_path
+        self.lease = lease
+        self.max_attempts = max_attempts
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS jobs ('
+                'id TEXT PRIMARY KEY, kind TEXT NOT NULL, state TEXT NOT NULL, params TEXT, '
+                'result TEXT, error TEXT, done INTEGER DEFAULT 0, total INTEGER DEFAULT 0, '
+                'attempts INTEGER DEFAULT 0, claim_token TEXT, created_at REAL, started_at REAL, '
+                'finished_at REAL, updated_at REAL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, created_at)')
+    
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+    
+    def enqueue(self, kind: str, params: Dict[str, Any]) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT INTO jobs (id, kind, state, params, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)',
+                (job_id, kind, QUEUED, json.dumps(params), now, now)
+            )
+        logger.info(f"Enqueued {kind} job {job_id}")
+        return job_id
+    
+    def claim(self, kinds: Optional[Sequence[str]] = None) -> Optional[Dict[str, Any]]:
+        # ``kinds`` restricts the claim to jobs of those kinds.
+        now = time.time()
+        kind_filter = f" AND kind IN ({', '.join('?' * len(kinds))})" if kinds else ''
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                # Jobs whose worker stopped reporting are failed once they
+                # have used up their attempts and offered again otherwise.
+                conn.execute(
+                    "UPDATE jobs SET state = ?, error = 'Worker stopped responding', finished_at = ? "
+                    'WHERE state = ? AND updated_at < ? AND attempts >= ?',
+                    (FAILED, now, RUNNING, now - self.lease, self.max_attempts)
+                )
+                row = conn.execute(
+                    'SELECT id, kind, params FROM jobs '
+                    f'WHERE (state = ? OR (state = ? AND updated_at < ?)){kind_filter} '
+                    'ORDER BY created_at LIMIT 1',
+                    (QUEUED, RUNNING, now - self.lease) + tuple(kinds or ())
+                ).fetchone()
+                claim_token = None
+                if row is not None:
+                    claim_token = uuid.uuid4().hex
+                    conn.execute(
+                        'UPDATE jobs SET state = ?, attempts = attempts + 1, done = 0, claim_token = ?, '
+                        'started_at = ?, updated_at = ? WHERE id = ?',
+                        (RUNNING, claim_token, now, now, row[0])
+                    )
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+        
+        if row is None:
+            return None
+        return {'id': row[0], 'kind': row[1], 'params': json.loads(row[2]), 'claim_token': claim_token}
+    
+    # The methods below return False when ``claim_token`` is no longer the
+    # job's current claim (its lease expired and another worker took it).
+    
+    def report_progress(self, job_id: str, claim_token: str, done: int, total: int) -> bool:
+        with self._connect() as conn:
+            cursor = conn.execute(
+                'UPDATE jobs SET done = ?, total = ?, updated_at = ? WHERE id = ? AND state = ? AND claim_token = ?',
+                (done, total, time.time(), job_id, RUNNING, claim_token)
+            )
+        return cursor.rowcount > 0
+    
+    def heartbeat(self, job_id: str, claim_token: str) -> bool:
+        with self._connect() as conn:
+            cursor = conn.execute(
+                'UPDATE jobs SET updated_at = ? WHERE id = ? AND state = ? AND claim_token = ?',
+                (time.time(), job_id, RUNNING, claim_token)
+            )
+        return cursor.rowcount > 0
+    
+    def complete(self, job_id: str, claim_token: str, result: Dict[str, Any]) -> bool:
+        return self._finish(job_id, claim_token, DONE, result=json.dumps(result))
+    
+    def fail(self, job_id: str, claim_token: str, error: str) -> bool:
+        return self._finish(job_id, claim_token, FAILED, error=error)
+    
+    def _finish(self, job_id: str, claim_token: str, state: str,
+                result: Optional[str] = None, error: Optional[str] = None) -> bool:
+        now = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                'UPDATE jobs SET state = ?, result = ?, error = ?, finished_at = ?, updated_at = ? '
+                'WHERE id = ? AND state = ? AND claim_token = ?',
+                (state, result, error, now, now, job_id, RUNNING, claim_token)
+            )
+        if cursor.rowcount == 0:
+            logger.warning(f"Job {job_id} was claimed again; dropping this attempt's outcome ({state})")
+            return False
+        logger.info(f"Job {job_id} {state}")
+        return True
+    
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT id, kind, state, result, error, done, total, attempts, created_at, '
+                'started_at, finished_at, updated_at FROM jobs WHERE id = ?',
+                (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        
+        (job_id, kind, state, result, error, done, total, attempts,
+         created_at, started_at, finished_at, updated_at) = row
+        return {
+            'id': job_id,
+            'kind': kind,
+            'state': state,
+            'progress': {'done': done, 'total': total},
+            'result': json.loads(result) if result else None,
+            'error': error,
+            'attempts': attempts,
+            'created_at': created_at,
+            'started_at': started_at,
+            'finished_at': finished_at,
+            'updated_at': updated_at
+        }
+    
+    def counts(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            rows = conn.execute('SELECT state, COUNT(*) FROM jobs GROUP BY state').fetchall()
+        return dict(rows)
+    
+    def remove_finished(self, max_age_hours: int = 24) -> int:
+        with self._connect() as conn:
+            cursor = conn.execute(
+                f"DELETE FROM jobs WHERE state IN ({', '.join('?' * len(FINISHED_STATES))}) AND finished_at < ?",
+                FINISHED_STATES + (time.time() - max_age_hours * 3600,)
+            )
+        return cursor.rowcount
+
+
+class JobWorker:
+    """Claims jobs from a ``JobQueue`` and runs them with ``handler``.
+    
+    ``handler(kind, params, progress)`` returns the job's JSON result;
+    ``progress(done, total)`` is forwarded to the queue at most every
+    ``progress_interval`` seconds, plus the final count. An exception fails
+    the job with its message. While the handler runs, a heartbeat thread
+    renews the job's lease several times per lease period, so a job that
+    is slow between progress reports is not claimed again.
+    """
+    
+    POLL_INTERVAL = 0.5
+    PROGRESS_INTERVAL = 0.25
+    HEARTBEATS_PER_LEASE = 4
+    
+    def __init__(self, queue: JobQueue, handler: Callable[..., Dict[str, Any]],
+                 progress_interval: float = PROGRESS_INTERVAL):
+        self.queue = queue
+        self.handler = handler
+        self.progress_interval = progress_interval
+        self.heartbeat_interval = queue.lease / self.HEARTBEATS_PER_LEASE
+    
+    def run_once(self, kinds: Optional[Sequence[str]] = None) -> bool:
+        job = self.queue.claim(kinds)
+        if job is None:
+            return False
+        
+        job_id, claim_token = job['id'], job['claim_token']
+        last_report = [0.0]
+        
+        def progress(done: int, total: int):
+            now = time.monotonic()
+            if done >= total or now - last_report[0] >= self.progress_interval:
+                last_report[0] = now
+                self.queue.report_progress(job_id, claim_token, done, total)
+        
+        stopped = threading.Event()
+        
+        def heartbeat():
+            while not stopped.wait(self.heartbeat_interval):
+                try:
+                    if not self.queue.heartbeat(job_id, claim_token):
+                        return
+                except sqlite3.Error as e:
+                    logger.error(f"Job {job_id} heartbeat failed: {str(e)}")
+        
+        heartbeat_thread = threading.Thread(target=heartbeat, name=f'job-heartbeat-{job_id}', daemon=True)
+        heartbeat_thread.start()
+        try:
+            result = self.handler(job['kind'], job['params'], progress)
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {str(e)}")
+            self.queue.fail(job_id, claim_token, str(e))
+        else:
+            self.queue.complete(job_id, claim_token, result)
+        finally:
+            stopped.set()
+            heartbeat_thread.join()
+        return True
+    
+    def run_forever(self):
+        while True:
+            try:
+                if not self.run_once():
+                    time.sleep(self.POLL_INTERVAL)
+            except sqlite3.Error as e:
+                logger.error(f"Job queue error: {str(e)}")
+                time.sleep(self.POLL_INTERVAL)
+
+
+def _worker_main(db_path: str, handler: Callable[..., Dict[str, Any]]):
+    JobWorker(JobQueue(db_path), handler).run_forever()
+
+
+class JobWorkerPool:
+    """Worker processes consuming one ``JobQueue``.
+    
+    Started on first use with the spawn method, so the web server's threads
+    are never forked. ``handler`` must be importable by the workers, i.e. a
+    module-level function. Workers are daemonic: jobs they were running when
+    the server stopped are picked up again once their lease expires.
+    """
+    
+    def __init__(self, db_path: str, handler: Callable[..., Dict[str, Any]], workers: int):
+        self.db_path = db_path
+        self.handler = handler
+        self.workers = workers
+        self._processes: List[multiprocessing.Process] = []
+        self._lock = threading.Lock()
+    
+    def ensure_started(self):
+        with self._lock:
+            self._processes = [process for process in self._processes if process.is_alive()]
+            context = multiprocessing.get_context('spawn')
+            while len(self._processes) < self.workers:
+                process = context.Process(target=_worker_main, args=(self.db_path, self.handler), daemon=True)
+                process.start()
+                self._processes.append(process)
+                logger.info(f"Started job worker {process.pid}")
+    
+    def start_if_pending(self) -> bool:
+        # After a restart nothing enqueues the jobs left queued or running
+        # in the database, so the server calls this on startup.
+        counts = JobQueue(self.db_path).counts()
+        if not (counts.get(QUEUED) or counts.get(RUNNING)):
+            return False
+        logger.info(f"Resuming {counts.get(QUEUED, 0)} queued and {counts.get(RUNNING, 0)} running jobs")
+        self.ensure_started()
+        return True
+    
+    def stop(self):
+        with self._lock:
+            for process in self._processes:
+                process.terminate()
+            for process in self._processes:
+                process.join()
+            self._processes = []
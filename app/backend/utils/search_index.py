@@ -0,0 +1,183 @@
+import os
+import time
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, List, Iterable
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SearchIndex:
+    """SQLite FTS5 index of slide text, table cells and notes per upload.
+    
+    One row is kept per (file, slide, source). Uploads whose content was
+    indexed before under another file id copy the existing rows instead of
+    being extracted again.
+    """
+    
+    DEFAULT_LIMIT = 20
+    MAX_LIMIT = 200
+    
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS decks ('
+                'file_id TEXT PRIMARY KEY, digest TEXT, filename TEXT, indexed_at REAL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS decks_digest ON decks (digest)')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS entries ('
+                'id INTEGER PRIMARY KEY, file_id TEXT NOT NULL, slide_index INTEGER, '
+                'source TEXT, content TEXT)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS entries_file ON entries (file_id)')
+            # External-content FTS table: rows live in ``entries`` (indexed by
+            # file id, so removal is cheap) and triggers keep the index in sync.
+            conn.execute(
+                'CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5('
+                "content, content='entries', content_rowid='id', "
+                "tokenize='unicode61 remove_diacritics 2')"
+            )
+            conn.execute(
+                'CREATE TRIGGER IF NOT EXISTS entries_ai AFTER INSERT ON entries BEGIN '
+                'INSERT INTO entries_fts (rowid, content) VALUES (new.id, new.content); END'
+            )
+            conn.execute(
+                'CREATE TRIGGER IF NOT EXISTS entries_ad AFTER DELETE ON entries BEGIN '
+                "INSERT INTO entries_fts (entries_fts, rowid, content) VALUES ('delete', old.id, old.content); END"
+            )
+    
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    def index_known_digest(self, file_id: str, digest: str, filename: str) -> bool:
+        with self._lock, self._connect() as conn:
+            source = conn.execute(
+                'SELECT file_id FROM decks WHERE digest = ? AND file_id != ? LIMIT 1',
+                (digest, file_id)
+            ).fetchone()
+            if source is None:
+                return False
+            
+            self._delete(conn, file_id)
+            conn.execute(
+                'INSERT INTO entries (file_id, slide_index, source, content) '
+                'SELECT ?, slide_index, source, content FROM entries WHERE file_id = ?',
+                (file_id, source[0])
+            )
+            self._insert_deck(conn, file_id, digest, filename)
+        return True
+    
+    def index_deck(self, file_id: str, digest: str, filename: str, slides: Iterable[Dict[str, Any]]):
+        rows = []
+        for slide in slides:
+            for source, content in self._slide_entries(slide):
+                if content.strip():
+                    rows.append((file_id, slide['index'], source, content))
+        
+        with self._lock, self._connect() as conn:
+            self._delete(conn, file_id)
+            conn.executemany(
+                'INSERT INTO entries (file_id, slide_index, source, content) VALUES (?, ?, ?, ?)',
+                rows
+            )
+            self._insert_deck(conn, file_id, digest, filename)
+        
+        logger.info(f"Indexed {len(rows)} text entries for {file_id}")
+    
+    @staticmethod
+    def _slide_entries(slide: Dict[str, Any]):
+        texts = []
+        tables = []
+        
+        for shape in slide.get('shapes', []):
+            text_content = shape.get('text_content')
+            if text_content and text_content['full_text']:
+                texts.append(text_content['full_text'])
+            
+            table_data = shape.get('table_data')
+            if table_data:
+                tables.extend(cell for row in table_data.get('cells', []) for cell in row if cell)
+        
+        yield 'text', '\n'.join(texts)
+        yield 'table', '\n'.join(tables)
+        yield 'notes', slide.get('notes', '')
+    
+    def _insert_deck(self, conn, file_id: str, digest: str, filename: str):
+        conn.execute(
+            'INSERT OR REPLACE INTO decks (file_id, digest, filename, indexed_at) VALUES (?, ?, ?, ?)',
+            (file_id, digest, filename, time.time())
+        )
+    
+    def _delete(self, conn, file_id: str):
+        conn.execute('DELETE FROM entries WHERE file_id = ?', (file_id,))
+        conn.execute('DELETE FROM decks WHERE file_id = ?', (file_id,))
+    
+    def remove(self, file_ids: Iterable[str]):
+        file_ids = list(file_ids)
+        if not file_ids:
+            return
+        
+        with self._lock, self._connect() as conn:
+            for file_id in file_ids:
+                self._delete(conn, file_id)
+        logger.info(f"Removed {len(file_ids)} decks from the search index")
+    
+    def search(self, query: str, limit: int = DEFAULT_LIMIT) -> List[Dict[str, Any]]:
+        match = self.build_match(query)
+        if not match:
+            raise ValueError("Search query is empty")
+        
+        limit = max(1, min(int(limit), self.MAX_LIMIT))
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT e.file_id, d.filename, e.slide_index, e.source, '
+                "snippet(entries_fts, 0, '[', ']', '...', 12), bm25(entries_fts) "
+                'FROM entries_fts JOIN entries e ON e.id = entries_fts.rowid '
+                'JOIN decks d ON d.file_id = e.file_id '
+                'WHERE entries_fts MATCH ? ORDER BY bm25(entries_fts) LIMIT ?',
+                (match, limit)
+            ).fetchall()
+        
+        return [
+            {
+                'file_id': file_id,
+                'filename': filename,
+                'slide_index': slide_index,
+                'source': source,
+                'snippet': snippet,
+                'score': round(-score, 4)
+            }
+            for file_id, filename, slide_index, source, snippet, score in rows
+        ]
+    
+    @staticmethod
+    def build_match(query: str) -> Optional[str]:
+        # Every term is quoted so user input can never be read as FTS5
+        # syntax; a trailing * is kept as a prefix match.
+        terms = []
+        for token in (query or '').split():
+            prefix = token.endswith('*')
+            token = token.rstrip('*').replace('"', '""')
+            if token:
+                terms.append(f'"{token}"' + ('*' if prefix else ''))
+        return ' '.join(terms) or None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._connect() as conn:
+            decks = conn.execute('SELECT COUNT(*) FROM decks').fetchone()[0]
+            entries = conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+        return {'decks': decks, 'entries': entries}
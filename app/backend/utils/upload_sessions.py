@@ -0,0 +1,284 @@
+import os
+import re
+import json
+import time
+import fcntl
+import shutil
+import hashlib
+import threading
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, List, BinaryIO
+import logging
+
+from .file_handler import FileHandler
+
+logger = logging.getLogger(__name__)
+
+
+class UploadSessionManager:
+    """Resumable chunked uploads on top of ``FileHandler``.
+    
+    A session owns a preallocated ``data.part`` file and a ``meta.json``
+    listing the chunk indices received so far. Chunks may arrive in any
+    order and be retried; each one is written at its own offset. The SHA-256
+    is advanced in-process over the contiguous prefix as chunks land, so a
+    finalize normally only has to hash what is left over.
+    """
+    
+    SESSION_DIR = '.sessions'
+    DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024
+    MIN_CHUNK_SIZE = 256 * 1024
+    MAX_CHUNK_SIZE = 16 * 1024 * 1024
+    SESSION_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+    
+    def __init__(self, file_handler: FileHandler):
+        self.file_handler = file_handler
+        self.session_root = os.path.join(file_handler.upload_dir, self.SESSION_DIR)
+        os.makedirs(self.session_root, exist_ok=True)
+        self._hashers = {}
+        self._hashing = set()
+        self._lock = threading.Lock()
+    
+    def _session_dir(self, session_id: str) -> str:
+        if not self.SESSION_ID_PATTERN.match(session_id or ''):
+            raise KeyError(f"Unknown upload session: {session_id}")
+        session_dir = os.path.join(self.session_root, session_id)
+        if not os.path.isdir(session_dir):
+            raise KeyError(f"Unknown upload session: {session_id}")
+        return session_dir
+    
+    @contextmanager
+    def _locked_meta(self, session_id: str):
+        session_dir = self._session_dir(session_id)
+        meta_path = os.path.join(session_dir, 'meta.json')
+        
+        with open(os.path.join(session_dir, 'meta.lock'), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                with open(meta_path, 'r') as f:
+                    meta = json.load(f)
+                yield meta
+                temp_path = f"{meta_path}.tmp"
+                with open(temp_path, 'w') as f:
+                    json.dump(meta, f)
+                os.replace(temp_path, meta_path)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def create_session(self, filename: str, total_size: int,
+                       chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, Any]:
+        if not filename or not self.file_handler.allowed_file(filename):
+            raise ValueError(f"Invalid file extension: {filename}")
+        
+        if total_size <= 0 or total_size > self.file_handler.MAX_FILE_SIZE:
+            raise ValueError(f"total_size must be between 1 and {self.file_handler.MAX_FILE_SIZE} bytes")
+        
+        if not self.MIN_CHUNK_SIZE <= chunk_size <= self.MAX_CHUNK_SIZE:
+            raise ValueError(
+                f"chunk_size must be between {self.MIN_CHUNK_SIZE} and {self.MAX_CHUNK_SIZE} bytes"
+            )
+        
+        import uuid
+        session_id = uuid.uuid4().hex
+        session_dir = os.path.join(self.session_root, session_id)
+        os.makedirs(session_dir)
+        
+        with open(os.path.join(session_dir, 'data.part'), 'wb') as f:
+            f.truncate(total_size)
+        
+        meta = {
+            'session_id': session_id,
+            'filename': filename,
+            'total_size': total_size,
+            'chunk_size': chunk_size,
+            'received': [],
+            'created_at': time.time()
+        }
+        with open(os.path.join(session_dir, 'meta.json'), 'w') as f:
+            json.dump(meta, f)
+        
+        logger.info(f"Created upload session {session_id} for {filename} ({total_size} bytes)")
+        return self._describe(meta)
+    
+    def get_status(self, session_id: str) -> Dict[str, Any]:
+        session_dir = self._session_dir(session_id)
+        with open(os.path.join(session_dir, 'meta.json'), 'r') as f:
+            return self._describe(json.load(f))
+    
+    def write_chunk(self, session_id: str, index: int, stream: BinaryIO) -> Dict[str, Any]:
+        session_dir = self._session_dir(session_id)
+        status = self.get_status(session_id)
+        
+        if not 0 <= index < status['chunk_count']:
+            raise ValueError(f"Chunk index {index} out of range 0..{status['chunk_count'] - 1}")
+        
+        if index in status['received_chunks']:
+            return status
+        
+        offset = index * status['chunk_size']
+        expected = min(status['chunk_size'], status['total_size'] - offset)
+        data_path = os.path.join(session_dir, 'data.part')
+        
+        state = self._hasher_for(session_id, offset)
+        
+        try:
+            written = self._write_at(data_path, offset, expected, stream, state[0] if state else None)
+            if written != expected:
+                raise ValueError(f"Chunk {index} has {written} bytes, expected {expected}")
+            
+            with self._locked_meta(session_id) as meta:
+                if index not in meta['received']:
+                    meta['received'].append(index)
+                    meta['received'].sort()
+                status = self._describe(meta)
+        except BaseException:
+            # Whatever interrupted the chunk (a bad length, a client
+            # disconnect, a disk error), a partially fed hasher is useless;
+            # finalize will rehash.
+            self._return_hasher(session_id, None)
+            raise
+        
+        if state:
+            self._advance_hasher(session_id, state, offset + expected, status, data_path)
+        
+        return status
+    
+    def _write_at(self, data_path: str, offset: int, limit: int,
+                  stream: BinaryIO, hasher) -> int:
+        written = 0
+        with open(data_path, 'r+b') as out:
+            out.seek(offset)
+            while True:
+                piece = stream.read(self.file_handler.CHUNK_SIZE)
+                if not piece:
+                    break
+                written += len(piece)
+                if written > limit:
+                    raise ValueError(f"Chunk at offset {offset} is larger than {limit} bytes")
+                out.write(piece)
+                if hasher:
+                    hasher.update(piece)
+        return written
+    
+    def _hasher_for(self, session_id: str, offset: int):
+        # Only hash inline when this chunk continues the prefix already
+        # hashed by this process; otherwise the bytes are picked up later.
+        # The [hasher, offset] state is handed out exclusively, so concurrent
+        # retries of one chunk never feed the same hasher.
+        with self._lock:
+            if session_id in self._hashing:
+                return None
+            state = self._hashers.get(session_id)
+            if state is None and offset == 0:
+                state = [hashlib.sha256(), 0]
+            if state is None or state[1] != offset:
+                return None
+            self._hashers.pop(session_id, None)
+            self._hashing.add(session_id)
+            return state
+    
+    def _return_hasher(self, session_id: str, state):
+        # Puts a checked-out state back, or drops it when ``state`` is None.
+        with self._lock:
+            if session_id in self._hashing:
+                self._hashing.discard(session_id)
+                if state is not None:
+                    self._hashers[session_id] = state
+    
+    def _advance_hasher(self, session_id: str, state, hashed_offset: int,
+                        status: Dict[str, Any], data_path: str):
+        chunk_size = status['chunk_size']
+        received = set(status['received_chunks'])
+        state[1] = hashed_offset
+        
+        try:
+            with open(data_path, 'rb') as f:
+                while state[1] < status['total_size'] and state[1] // chunk_size in received:
+                    f.seek(state[1])
+                    length = min(chunk_size, status['total_size'] - state[1])
+                    state[0].update(f.read(length))
+                    state[1] += length
+        except BaseException:
+            self._return_hasher(session_id, None)
+            raise
+        self._return_hasher(session_id, state)
+    
+    def finalize(self, session_id: str) -> Optional[Dict[str, Any]]:
+        session_dir = self._session_dir(session_id)
+        status = self.get_status(session_id)
+        
+        if not status['complete']:
+            raise ValueError(f"Upload incomplete: missing chunks {status['missing_chunks'][:20]}")
+        
+        data_path = os.path.join(session_dir, 'data.part')
+        
+        with self._lock:
+            state = self._hashers.pop(session_id, None)
+        if state is None or state[1] != status['total_size']:
+            hasher, hashed = state if state else (hashlib.sha256(), 0)
+            with open(data_path, 'rb') as f:
+                f.seek(hashed)
+                for piece in iter(lambda: f.read(self.file_handler.CHUNK_SIZE), b''):
+                    hasher.update(piece)
+            digest = hasher.hexdigest()
+        else:
+            digest = state[0].hexdigest()
+        
+        file_path = self.file_handler.new_upload_path(status['filename'])
+        temp_path = f"{file_path}.part"
+        os.replace(data_path, temp_path)
+        
+        result = self.file_handler.commit_upload(temp_path, file_path, digest, status['total_size'])
+        shutil.rmtree(session_dir, ignore_errors=True)
+        return result
+    
+    def abort(self, session_id: str):
+        session_dir = self._session_dir(session_id)
+        with self._lock:
+            self._hashers.pop(session_id, None)
+            self._hashing.discard(session_id)
+        shutil.rmtree(session_dir, ignore_errors=True)
+        logger.info(f"Aborted upload session {session_id}")
+    
+    def cleanup_stale_sessions(self, max_age_hours: int = 24):
+        current_time = time.time()
+        
+        for session_id in os.listdir(self.session_root):
+            session_dir = os.path.join(self.session_root, session_id)
+            meta_path = os.path.join(session_dir, 'meta.json')
+            try:
+                if current_time - os.path.getmtime(meta_path) > max_age_hours * 3600:
+                    self.abort(session_id)
+            except (OSError, KeyError) as e:
+                logger.warning(f"Could not clean up session {session_id}: {str(e)}")
+    
+    def _describe(self, meta: Dict[str, Any]) -> Dict[str, Any]:
+        total_size = meta['total_size']
+        chunk_size = meta['chunk_size']
+        chunk_count = (total_size + chunk_size - 1) // chunk_size
+        received = meta['received']
+        received_set = set(received)
+        
+        return {
+            'session_id': meta['session_id'],
+            'filename': meta['filename'],
+            'total_size': total_size,
+            'chunk_size': chunk_size,
+            'chunk_count': chunk_count,
+            'received_chunks': received,
+            'missing_chunks': [i for i in range(chunk_count) if i not in received_set],
+            'received_ranges': self._byte_ranges(received, chunk_size, total_size),
+            'complete': len(received_set) == chunk_count
+        }
+    
+    @staticmethod
+    def _byte_ranges(received: List[int], chunk_size: int, total_size: int) -> List[List[int]]:
+        ranges = []
+        for index in received:
+            start = index * chunk_size
+            end = min(start + chunk_size, total_size)
+            if ranges and ranges[-1][1] == start:
+                ranges[-1][1] = end
+            else:
+                ranges.append([start, end])
+        return ranges
@@ -0,0 +1,139 @@
+import os
+import json
+import shutil
+import sqlite3
+from contextlib import contextmanager
+from typing import Optional, Dict, Any
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class UploadStore:
+    """Content-addressed blob store behind the upload directory.
+    
+    Each distinct upload is stored once under ``.blobs/`` keyed by its
+    SHA-256. Every ``file_id`` in the upload directory is a hard link to its
+    blob (or a copy where links are unsupported), so existing code that opens
+    ``upload_dir/file_id`` keeps working. ``.store.db`` (SQLite) maps file ids
+    to digests and remembers the inspection result for each digest, one row
+    each, so an upload only touches its own rows.
+    """
+    
+    BLOB_DIR = '.blobs'
+    DB_NAME = '.store.db'
+    
+    def __init__(self, upload_dir: str):
+        self.upload_dir = upload_dir
+        self.blob_dir = os.path.join(upload_dir, self.BLOB_DIR)
+        self.db_path = os.path.join(upload_dir, self.DB_NAME)
+        os.makedirs(self.blob_dir, exist_ok=True)
+        
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('CREATE TABLE IF NOT EXISTS files (file_id TEXT PRIMARY KEY, digest TEXT NOT NULL)')
+            conn.execute('CREATE INDEX IF NOT EXISTS files_digest ON files (digest)')
+            conn.execute('CREATE TABLE IF NOT EXISTS blobs (digest TEXT PRIMARY KEY, size INTEGER, result TEXT)')
+    
+    def blob_path(self, digest: str) -> str:
+        return os.path.join(self.blob_dir, digest[:2], f"{digest}.pptx")
+    
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+    
+    @contextmanager
+    def _transaction(self):
+        # BEGIN IMMEDIATE serializes writers across threads and gunicorn
+        # workers sharing one upload directory, and so also covers the blob
+        # file operations done inside the transaction.
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+    
+    def add(self, temp_path: str, digest: str, file_id: str) -> Dict[str, Any]:
+        blob_path = self.blob_path(digest)
+        file_path = os.path.join(self.upload_dir, file_id)
+        
+        with self._transaction() as conn:
+            deduplicated = os.path.exists(blob_path)
+            if deduplicated:
+                os.remove(temp_path)
+                # Links share the blob's inode, so refresh its mtime to keep
+                # cleanup_old_files from expiring a file that was just uploaded.
+                os.utime(blob_path)
+            else:
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                os.replace(temp_path, blob_path)
+            
+            try:
+                os.link(blob_path, file_path)
+            except OSError:
+                shutil.copy2(blob_path, file_path)
+            
+            conn.execute('INSERT OR REPLACE INTO files (file_id, digest) VALUES (?, ?)', (file_id, digest))
+            conn.execute(
+                'INSERT INTO blobs (digest, size) VALUES (?, ?) '
+                'ON CONFLICT (digest) DO UPDATE SET size = excluded.size',
+                (digest, os.path.getsize(blob_path))
+            )
+        
+        logger.info(f"Stored upload {file_id} as blob {digest[:12]} (deduplicated: {deduplicated})")
+        return {
+            'path': file_path,
+            'deduplicated': deduplicated
+        }
+    
+    def resolve(self, file_id: str) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute('SELECT digest FROM files WHERE file_id = ?', (file_id,)).fetchone()
+        return row[0] if row else None
+    
+    def get_cached_result(self, digest: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute('SELECT result FROM blobs WHERE digest = ?', (digest,)).fetchone()
+        if row and row[0] is not None:
+            return json.loads(row[0])
+        return None
+    
+    def set_cached_result(self, digest: str, result: Dict[str, Any]):
+        with self._connect() as conn:
+            conn.execute('UPDATE blobs SET result = ? WHERE digest = ?', (json.dumps(result), digest))
+    
+    def release(self, file_id: str):
+        with self._transaction() as conn:
+            row = conn.execute('SELECT digest FROM files WHERE file_id = ?', (file_id,)).fetchone()
+            if row is None:
+                return
+            conn.execute('DELETE FROM files WHERE file_id = ?', (file_id,))
+            if conn.execute('SELECT 1 FROM files WHERE digest = ? LIMIT 1', (row[0],)).fetchone() is None:
+                self._drop_blob(conn, row[0])
+    
+    def collect_garbage(self):
+        """Forget file ids whose link was removed and drop orphaned blobs."""
+        with self._transaction() as conn:
+            for (file_id,) in conn.execute('SELECT file_id FROM files').fetchall():
+                if not os.path.exists(os.path.join(self.upload_dir, file_id)):
+                    conn.execute('DELETE FROM files WHERE file_id = ?', (file_id,))
+            
+            orphaned = conn.execute(
+                'SELECT digest FROM blobs WHERE digest NOT IN (SELECT digest FROM files)'
+            ).fetchall()
+            for (digest,) in orphaned:
+                self._drop_blob(conn, digest)
+    
+    def _drop_blob(self, conn, digest: str):
+        conn.execute('DELETE FROM blobs WHERE digest = ?', (digest,))
+        blob_path = self.blob_path(digest)
+        if os.path.exists(blob_path):
+            os.remove(blob_path)
+            logger.info(f"Removed unreferenced blob {digest[:12]}")
@@ -0,0 +1,210 @@
+from pptx import Presentation
+from pptx.util import Inches, Pt
+
+
+def build_sample_deck(path: str, slide_count: int = 3, with_notes: bool = True) -> str:
+    prs = Presentation()
+    prs.slide_width = Inches(10)
+    prs.slide_height = Inches(7.5)
+    
+    for idx in range(slide_count):
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        slide.shapes.title.text = f"Slide {idx + 1}"
+        
+        body = slide.placeholders[1].text_frame
+        body.text = "First point"
+        run = body.paragraphs[0].runs[0]
+        run.font.size = Pt(20)
+        run.font.bold = True
+        
+        paragraph = body.add_paragraph()
+        paragraph.text = f"Detail for slide {idx + 1}"
+        paragraph.level = 1
+        
+        textbox = slide.shapes.add_textbox(Inches(1), Inches(5), Inches(6), Inches(1))
+        textbox.text_frame.text = "Footnote text"
+        
+        if with_notes:
+            slide.notes_slide.notes_text_frame.text = f"Speaker notes {idx + 1}"
+    
+    prs.save(path)
+    return path
+
+
+def _make_png_bytes(color=(0, 102, 204)) -> bytes:
+    import io
+    from PIL import Image
+    
+    buffer = io.BytesIO()
+    Image.new('RGB', (16, 16), color).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def build_feature_deck(path: str) -> str:
+    import io
+    from pptx.chart.data import CategoryChartData
+    from pptx.dml.color import RGBColor
+    from pptx.enum.chart import XL_CHART_TYPE
+    from pptx.enum.dml import MSO_THEME_COLOR
+    from pptx.enum.shapes import MSO_SHAPE, MSO_CONNECTOR
+    from pptx.enum.text import MSO_UNDERLINE
+    
+    prs = Presentation()
+    prs.core_properties.title = 'Feature deck'
+    prs.core_properties.author = 'Tests'
+    logo = _make_png_bytes()
+    
+    slide = prs.slides.add_slide(prs.slide_layouts[0])
+    slide.shapes.title.text = 'Quarterly Review'
+    slide.placeholders[1].text = 'Line one\vline two'
+    
+    slide = prs.slides.add_slide(prs.slide_layouts[1])
+    slide.shapes.title.text = 'Formatting'
+    body = slide.placeholders[1].text_frame
+    body.text = 'Plain'
+    paragraph = body.paragraphs[0]
+    run = paragraph.add_run()
+    run.text = ' colored'
+    run.font.name = 'Georgia'
+    run.font.size = Pt(13.5)
+    run.font.bold = False
+    run.font.italic = True
+    run.font.underline = True
+    run.font.color.rgb = RGBColor(0x12, 0x34, 0x56)
+    run = paragraph.add_run()
+    run.text = ' themed'
+    run.font.color.theme_color = MSO_THEME_COLOR.ACCENT_1
+    run.font.underline = MSO_UNDERLINE.DOUBLE_LINE
+    second = body.add_paragraph()
+    second.text = 'Nested'
+    second.level = 2
+    slide.notes_slide.notes_text_frame.text = 'Remember the numbers'
+    
+    slide = prs.slides.add_slide(prs.slide_layouts[5])
+    slide.shapes.title.text = 'Objects'
+    slide.shapes.add_picture(io.BytesIO(logo), Inches(0.2), Inches(0.2))
+    shape = slide.shapes.add_shape(MSO_SHAPE.ROUNDED_RECTANGLE, Inches(1), Inches(2), Inches(3), Inches(1))
+    shape.text_frame.text = 'Callout'
+    slide.shapes.add_shape(MSO_SHAPE.OVAL, Inches(5), Inches(2), Inches(1), Inches(1))
+    slide.shapes.add_connector(MSO_CONNECTOR.STRAIGHT, Inches(1), Inches(4), Inches(3), Inches(5))
+    group = slide.shapes.add_group_shape()
+    group.shapes.add_textbox(Inches(6), Inches(5), Inches(2), Inches(1)).text_frame.text = 'Grouped'
+    builder = slide.shapes.build_freeform(Inches(1), Inches(6))
+    builder.add_line_segments([(Inches(2), Inches(6)), (Inches(2), Inches(7))])
+    builder.convert_to_shape()
+    
+    slide = prs.slides.add_slide(prs.slide_layouts[5])
+    slide.shapes.title.text = 'Data'
+    table = slide.shapes.add_table(3, 3, Inches(0.5), Inches(1.5), Inches(6), Inches(1.5)).table
+    for row_idx, row in enumerate([('Region', 'Q1', 'Q2'), ('North', '1,200', '1300.5'), ('South', '950', 'n/a')]):
+        for col_idx, value in enumerate(row):
+            table.cell(row_idx, col_idx).text = value
+    
+    chart_data = CategoryChartData()
+    chart_data.categories = ['Q1', 'Q2', 'Q3']
+    chart_data.add_series('Revenue', (10.5, 12.0, 14.25))
+    chart_data.add_series('Cost', (7.0, None, 9.5))
+    slide.shapes.add_chart(XL_CHART_TYPE.COLUMN_CLUSTERED, Inches(0.5), Inches(3.5),
+                           Inches(4), Inches(3), chart_data)
+    
+    pie_data = CategoryChartData()
+    pie_data.categories = ['A', 'B']
+    pie_data.add_series('Share', (0.6, 0.4))
+    slide.shapes.add_chart(XL_CHART_TYPE.PIE, Inches(5), Inches(3.5), Inches(3), Inches(3), pie_data)
+    
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    textbox = slide.shapes.add_textbox(Inches(1), Inches(1), Inches(4), Inches(1))
+    textbox.text_frame.text = 'Blank layout'
+    bare = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, Inches(1), Inches(3), Inches(1), Inches(1))
+    txBody = bare._element.txBody
+    if txBody is not None:
+        bare._element.remove(txBody)
+    
+    prs.save(path)
+    return path
+
+
+BRANDING_CORPUS_PARAGRAPHS = [
+    '<a:p><a:r><a:rPr lang="en-US" b="0" dirty="0"/><a:t>Existing attributes</a:t></a:r></a:p>',
+    '<a:p><a:r><a:rPr lang="en-US"><a:solidFill><a:schemeClr val="accent1"><a:lumMod val="75000"/>'
+    '</a:schemeClr></a:solidFill></a:rPr><a:t>Theme color</a:t></a:r></a:p>',
+    '<a:p><a:r><a:rPr><a:gradFill><a:gsLst><a:gs pos="0"><a:srgbClr val="FF0000"/></a:gs></a:gsLst>'
+    '</a:gradFill><a:latin typeface="Arial" panose="020B0604020202020204"/><a:ea typeface="+mn-ea"/>'
+    '<a:cs typeface="+mn-cs"/></a:rPr><a:t>Gradient with fonts</a:t></a:r></a:p>',
+    '<a:p><a:r><a:rPr sz="1000"><a:noFill/><a:ea typeface="+mn-ea"/></a:rPr><a:t>No fill</a:t></a:r></a:p>',
+    '<a:p><a:r><a:rPr><a:effectLst/><a:highlight><a:srgbClr val="FFFF00"/></a:highlight>'
+    '<a:uLn w="1"/></a:rPr><a:t>Effects</a:t></a:r></a:p>',
+    '<a:p><a:r><a:rPr><a:solidFill><a:srgbClr val="123456"><a:alpha val="50000"/></a:srgbClr>'
+    '</a:solidFill></a:rPr><a:t>Alpha</a:t></a:r></a:p>',
+    '<a:p><a:r><a:rPr><a:solidFill/></a:rPr><a:t>Empty fill</a:t></a:r>'
+    '<a:r><a:rPr><a:solidFill><a:prstClr val="red"/></a:solidFill><a:rtl val="0"/></a:rPr>'
+    '<a:t>Preset</a:t></a:r></a:p>',
+    '<a:p><a:pPr marL="342900" lvl="1" algn="r"><a:lnSpc><a:spcPts val="1200"/></a:lnSpc>'
+    '<a:spcBef><a:spcPts val="600"/></a:spcBef><a:buNone/><a:defRPr sz="1200"/></a:pPr>'
+    '<a:r><a:t>Existing paragraph properties</a:t></a:r></a:p>',
+    '<a:p><a:pPr><a:spcAft><a:spcPts val="300"/></a:spcAft></a:pPr><a:r><a:t>Space after</a:t></a:r></a:p>',
+    '<a:p><a:r><a:t>Before break</a:t></a:r><a:br><a:rPr sz="900"/></a:br><a:fld id="{B6F15528-21DE-4FAA-801E-634DDDAF4B2B}" '
+    'type="slidenum"><a:rPr lang="en-US"/><a:t>1</a:t></a:fld><a:endParaRPr lang="en-US"/></a:p>',
+    '<a:p><a:endParaRPr lang="en-US" dirty="0"/></a:p>',
+]
+
+
+def build_branding_corpus_deck(path: str) -> str:
+    # Existing run and paragraph properties of every kind, fields, breaks,
+    # empty paragraphs, a shape without a text body, and a shape for each
+    # title/heading/body classification rule.
+    from pptx.enum.shapes import MSO_SHAPE
+    from pptx.oxml import parse_xml
+    from pptx.oxml.ns import nsdecls
+    
+    prs = Presentation()
+    
+    slide = prs.slides.add_slide(prs.slide_layouts[0])
+    slide.shapes.title.text = 'Corpus'
+    slide.placeholders[1].text = 'Subtitle low on the first slide'
+    
+    for start in range(0, len(BRANDING_CORPUS_PARAGRAPHS), 4):
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        for offset, paragraph in enumerate(BRANDING_CORPUS_PARAGRAPHS[start:start + 4]):
+            textbox = slide.shapes.add_textbox(Inches(0.5), Inches(1.6 + offset * 1.4), Inches(9), Inches(1))
+            body = textbox._element.txBody
+            body.getparent().replace(body, parse_xml(
+                f'<p:txBody {nsdecls("a", "p")}><a:bodyPr/><a:lstStyle/>{paragraph}</p:txBody>'
+            ))
+    
+    slide = prs.slides.add_slide(prs.slide_layouts[1])
+    slide.shapes.title.text = 'Rules'
+    slide.placeholders[1].text = 'A long body paragraph that is certainly more than fifty characters long.'
+    for top, width, text, size in (
+        (2.0, 6.0, 'Short and wide', None),
+        (3.0, 3.0, 'Narrow but big first run', 32),
+        (4.0, 3.0, 'Narrow with a mid-size first run', 24),
+        (5.0, 3.0, 'Narrow and small', 12),
+        (1.0, 3.0, 'Near the top', None),
+    ):
+        textbox = slide.shapes.add_textbox(Inches(0.5), Inches(top), Inches(width), Inches(0.8))
+        textbox.text_frame.text = text
+        if size:
+            textbox.text_frame.paragraphs[0].runs[0].font.size = Pt(size)
+    empty = slide.shapes.add_textbox(Inches(6), Inches(6), Inches(2), Inches(0.5))
+    empty.text_frame.paragraphs[0].add_run()
+    bare = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, Inches(8), Inches(6), Inches(1), Inches(1))
+    bare._element.remove(bare._element.txBody)
+    
+    prs.save(path)
+    return path
+
+
+def build_untyped_shape_deck(path: str) -> str:
+    # An sp with no placeholder, geometry or txBox flag, which python-pptx
+    # cannot assign a shape type.
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[1])
+    slide.shapes.title.text = 'Untyped shape'
+    shape = slide.shapes.add_shape(1, Inches(1), Inches(3), Inches(4), Inches(1))
+    shape.text = 'No geometry'
+    prst_geom = shape._element.spPr.prstGeom
+    prst_geom.getparent().remove(prst_geom)
+    
+    prs.save(path)
+    return path
@@ -0,0 +1,150 @@
+import unittest
+import os
+import sys
+import hashlib
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'backend'))
+
+from pptx import Presentation
+from pptx.util import Inches
+from PIL import Image
+
+from processors.asset_store import AssetStore
+from processors.data_extractor import DataExtractor
+from processors.xml_extractor import XMLDataExtractor
+from deck_factory import _make_png_bytes
+
+
+def build_logo_deck(path, logo, slide_count=3, extra_images=()):
+    import io
+    
+    prs = Presentation()
+    for idx in range(slide_count):
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        slide.shapes.add_picture(io.BytesIO(logo), Inches(0.5), Inches(0.5))
+        if idx < len(extra_images):
+            slide.shapes.add_picture(io.BytesIO(extra_images[idx]), Inches(3), Inches(3))
+    prs.save(path)
+    return path
+
+
+class TestAssetStore(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store = AssetStore(os.path.join(self.temp_dir.name, 'assets'), max_workers=2)
+        self.logo = _make_png_bytes()
+    
+    def tearDown(self):
+        self.store.close()
+        self.temp_dir.cleanup()
+    
+    def _deck(self, name, **kwargs):
+        return build_logo_deck(os.path.join(self.temp_dir.name, name), self.logo, **kwargs)
+    
+    def _stored_files(self):
+        return sorted(
+            name for _, _, names in os.walk(self.store.asset_dir) for name in names
+            if not name.endswith('.json')
+        )
+    
+    def test_export_stores_each_image_once_with_thumbnail(self):
+        deck = self._deck('a.pptx', slide_count=5)
+        asset_ids = self.store.export_deck(deck, 'a' * 64)
+        logo_id = hashlib.sha256(self.logo).hexdigest()
+        
+        self.assertEqual(set(asset_ids.values()), {logo_id})
+        with open(self.store.find(logo_id), 'rb') as f:
+            self.assertEqual(f.read(), self.logo)
+        with Image.open(self.store.find_thumbnail(logo_id)) as thumbnail:
+            self.assertLessEqual(max(thumbnail.size), max(AssetStore.THUMBNAIL_SIZE))
+    
+    def test_cross_deck_dedup_and_pool_thumbnails(self):
+        extras = [_make_png_bytes((i * 40, 10, 10)) for i in range(5)]
+        first = self._deck('first.pptx', slide_count=5, extra_images=extras)
+        second = self._deck('second.pptx', slide_count=2)
+        
+        first_ids = self.store.export_deck(first, 'b' * 64)
+        files_after_first = self._stored_files()
+        second_ids = self.store.export_deck(second, 'c' * 64)
+        
+        self.assertEqual(len(set(first_ids.values())), 6)
+        self.assertEqual(len(files_after_first), 12)
+        self.assertEqual(self._stored_files(), files_after_first)
+        self.assertTrue(set(second_ids.values()) <= set(first_ids.values()))
+    
+    def test_known_deck_is_not_reread(self):
+        deck = self._deck('known.pptx')
+        first = self.store.export_deck(deck, 'd' * 64)
+        os.remove(deck)
+        
+        self.assertEqual(self.store.export_deck(deck, 'd' * 64), first)
+    
+    def test_thumbnail_pool_is_reused(self):
+        extras = [_make_png_bytes((i * 40, 10, 10)) for i in range(5)]
+        self.store.export_deck(self._deck('first.pptx', slide_count=5, extra_images=extras), 'e' * 64)
+        pool = self.store._pool
+        
+        more = [_make_png_bytes((10, i * 40, 10)) for i in range(5)]
+        self.store.export_deck(self._deck('second.pptx', slide_count=5, extra_images=more), 'f' * 64)
+        
+        self.assertIsNotNone(pool)
+        self.assertIs(self.store._pool, pool)
+    
+    def test_missing_thumbnail_is_retried(self):
+        logo_id = hashlib.sha256(self.logo).hexdigest()
+        self.store.export_deck(self._deck('first.pptx'), '1' * 64)
+        # As if the first attempt had failed.
+        os.remove(self.store.thumbnail_path(logo_id))
+        
+        self.store.export_deck(self._deck('second.pptx', slide_count=2), '2' * 64)
+        
+        self.assertIsNotNone(self.store.find_thumbnail(logo_id))
+    
+    def test_collect_garbage(self):
+        other = _make_png_bytes((200, 0, 0))
+        kept_deck = self._deck('kept.pptx', slide_count=1)
+        dropped_deck = build_logo_deck(os.path.join(self.temp_dir.name, 'dropped.pptx'), other, slide_count=1)
+        self.store.export_deck(kept_deck, '3' * 64)
+        self.store.export_deck(dropped_deck, '4' * 64)
+        logo_id = hashlib.sha256(self.logo).hexdigest()
+        other_id = hashlib.sha256(other).hexdigest()
+        
+        old = time.time() - 48 * 3600
+        for path in (self.store.find(logo_id), self.store.thumbnail_path(logo_id), self.store.find(other_id),
+                     self.store.thumbnail_path(other_id), self.store._deck_index_path('4' * 64)):
+            os.utime(path, (old, old))
+        
+        self.assertEqual(self.store.collect_garbage(max_age_hours=24), 1)
+        self.assertIsNotNone(self.store.find(logo_id))
+        self.assertIsNotNone(self.store.find_thumbnail(logo_id))
+        self.assertIsNone(self.store.find(other_id))
+        self.assertIsNone(self.store.find_thumbnail(other_id))
+        self.assertFalse(os.path.exists(self.store._deck_index_path('4' * 64)))
+        self.assertIsNotNone(self.store.export_deck(kept_deck, '3' * 64))
+    
+    def test_find_rejects_non_ids(self):
+        self.assertIsNone(self.store.find('../etc/passwd'))
+        self.assertIsNone(self.store.find_thumbnail('abc'))
+    
+    def test_only_raster_images_serve_inline(self):
+        self.assertTrue(AssetStore.serves_inline('ab/abc.PNG'))
+        self.assertTrue(AssetStore.serves_inline('ab/abc.jpeg'))
+        self.assertFalse(AssetStore.serves_inline('ab/abc.svg'))
+        self.assertFalse(AssetStore.serves_inline('ab/abc.emf'))
+    
+    def test_extractors_report_asset_ids(self):
+        deck = self._deck('extract.pptx', slide_count=2)
+        asset_ids = self.store.export_deck(deck)
+        logo_id = hashlib.sha256(self.logo).hexdigest()
+        
+        for engine in (DataExtractor, XMLDataExtractor):
+            data = engine(deck, asset_ids=asset_ids).extract_all_data()
+            images = [shape['image'] for slide in data['slides'] for shape in slide['shapes']]
+            self.assertEqual([image['asset_id'] for image in images], [logo_id, logo_id])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'backend'))
+
+from utils.batch_runner import BatchRunner
+
+
+def timed_task(value, delay):
+    # Module level so spawned pool workers can import it.
+    if value < 0:
+        raise ValueError(f'bad value {value}')
+    start = time.time()
+    time.sleep(delay)
+    return {'value': value * 2, 'start': start, 'end': time.time(), 'pid': os.getpid()}
+
+
+class TestBatchRunner(unittest.TestCase):
+    def setUp(self):
+        self.runner = BatchRunner(2)
+    
+    def tearDown(self):
+        self.runner.close()
+    
+    def test_results_and_errors_by_index(self):
+        args = [(1, 0), (-1, 0), (3, 0)]
+        outcomes = {index: (result, error) for index, result, error in self.runner.run(timed_task, args)}
+        
+        self.assertEqual(sorted(outcomes), [0, 1, 2])
+        self.assertEqual(outcomes[0][0]['value'], 2)
+        self.assertEqual(outcomes[2][0]['value'], 6)
+        self.assertIsNone(outcomes[1][0])
+        self.assertIsInstance(outcomes[1][1], ValueError)
+        self.assertNotEqual(outcomes[0][0]['pid'], os.getpid())
+    
+    def test_pool_is_reused_across_batches(self):
+        list(self.runner.run(timed_task, [(1, 0)]))
+        pool = self.runner._pool
+        list(self.runner.run(timed_task, [(2, 0)]))
+        
+        self.assertIs(self.runner._pool, pool)
+    
+    def test_byte_limit_serializes_heavy_inputs(self):
+        runner = BatchRunner(2, max_bytes=100)
+        try:
+            # Warm the pool so worker start-up does not blur the timings.
+            list(runner.run(timed_task, [(0, 0.2), (0, 0.2)]))
+            outcomes = runner.run(timed_task, [(1, 0.3), (2, 0.3), (3, 0.3)], weights=[80, 80, 10])
+            results = {result['value']: result for _, result, _ in outcomes}
+        finally:
+            runner.close()
+        
+        # The second heavy input waits for the first; the light one runs
+        # alongside it.
+        self.assertEqual(sorted(results), [2, 4, 6])
+        self.assertLessEqual(results[2]['end'], results[4]['start'])
+        self.assertLess(results[6]['start'], results[4]['end'])
+
+
+if __name__ == '__main__':
+    unittest.main()
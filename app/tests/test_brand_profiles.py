@@ -0,0 +1,154 @@
+import unittest
+import json
+import os
+import pickle
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'backend'))
+
+from pptx.dml.color import RGBColor
+from pptx.enum.text import PP_ALIGN
+from pptx.util import Pt
+
+from processors.brand_profiles import BrandProfile, BrandProfileRegistry, DEFAULT_PROFILE, normalize_config
+from processors.branding_engine import BrandingEngine
+
+
+class TestBrandProfile(unittest.TestCase):
+    def test_plans(self):
+        title = DEFAULT_PROFILE.plan('title')
+        self.assertEqual(title.font, 'Frutiger LT')
+        self.assertEqual(title.size, Pt(44))
+        self.assertTrue(title.bold)
+        self.assertEqual(title.color, RGBColor(0, 102, 204))
+        self.assertEqual(title.alignment, PP_ALIGN.CENTER)
+        
+        body = DEFAULT_PROFILE.plan('body')
+        self.assertFalse(body.bold)
+        self.assertEqual(body.color, RGBColor(51, 51, 51))
+        self.assertEqual(DEFAULT_PROFILE.plan('small').alignment, PP_ALIGN.LEFT)
+        self.assertEqual(DEFAULT_PROFILE.plan('unknown').size, Pt(18))
+    
+    def test_equivalent_configs_hash_equally(self):
+        a = BrandProfile.compile({'colors': {'primary': '#0066cc'}})
+        b = BrandProfile.compile({'colors': {'primary': RGBColor(0, 102, 204)}, 'alignment': {'title': PP_ALIGN.CENTER}})
+        
+        self.assertEqual(a.hash, DEFAULT_PROFILE.hash)
+        self.assertEqual(b.hash, DEFAULT_PROFILE.hash)
+        self.assertNotEqual(BrandProfile.compile({'fonts': {'body_size': 20}}).hash, DEFAULT_PROFILE.hash)
+    
+    def test_partial_config_keeps_defaults(self):
+        profile = BrandProfile.compile({'fonts': {'primary': 'Georgia'}})
+        self.assertEqual(profile.plan('title').font, 'Georgia')
+        self.assertEqual(profile.plan('title').size, Pt(44))
+    
+    def test_invalid_configs(self):
+        for config in (
+            {'fonts': {'body_size': 'large'}},
+            {'fonts': {'primary': ''}},
+            {'colors': {'primary': [0, 300, 0]}},
+            {'colors': {'primary': 'blue'}},
+            {'alignment': {'title': 'middle'}},
+            {'spacing': {'line_spacing': 0}},
+            {'layout': {}},
+            {'fonts': 'Arial'},
+        ):
+            with self.assertRaises(ValueError, msg=config):
+                normalize_config(config)
+    
+    def test_pickle_round_trip(self):
+        profile = BrandProfile.compile({'fonts': {'primary': 'Georgia'}}, name='academic')
+        restored = pickle.loads(pickle.dumps(profile))
+        
+        self.assertEqual(restored.hash, profile.hash)
+        self.assertEqual(restored.name, 'academic')
+        self.assertEqual(restored.plan('body'), profile.plan('body'))
+    
+    def test_engine_uses_profile(self):
+        profile = BrandProfile.compile({'fonts': {'primary': 'Georgia', 'heading_size': 30}})
+        engine = BrandingEngine(profile=profile)
+        
+        self.assertEqual(engine.get_brand_font(), 'Georgia')
+        self.assertEqual(engine.get_font_size('heading'), Pt(30))
+        self.assertEqual(engine.config['colors']['secondary'], RGBColor(102, 102, 102))
+
+
+class TestBrandProfileRegistry(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.config_path = os.path.join(self.temp_dir.name, 'branding_config.json')
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def write_config(self, data):
+        with open(self.config_path, 'w') as f:
+            json.dump(data, f)
+        # Force a distinct mtime even on coarse-grained filesystems.
+        stat = os.stat(self.config_path)
+        os.utime(self.config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    
+    def test_missing_file_uses_builtin_default(self):
+        registry = BrandProfileRegistry(self.config_path)
+        self.assertIs(registry.get(), DEFAULT_PROFILE)
+    
+    def test_single_config_file(self):
+        self.write_config({'fonts': {'primary': 'Georgia'}})
+        registry = BrandProfileRegistry(self.config_path)
+        
+        self.assertEqual(registry.get().name, 'default')
+        self.assertEqual(registry.get('default').font, 'Georgia')
+    
+    def test_named_profiles_and_hash_lookup(self):
+        self.write_config({
+            'default': 'corporate',
+            'profiles': {
+                'corporate': {},
+                'academic': {'fonts': {'primary': 'Georgia'}}
+            }
+        })
+        registry = BrandProfileRegistry(self.config_path)
+        academic = registry.get('academic')
+        
+        self.assertEqual(registry.get().name, 'corporate')
+        self.assertIs(registry.get(academic.hash), academic)
+        self.assertIs(registry.get(academic.hash[:10]), academic)
+        self.assertEqual([p['name'] for p in registry.list_profiles()], ['academic', 'corporate'])
+        
+        with self.assertRaises(KeyError):
+            registry.get('missing')
+        with self.assertRaises(KeyError):
+            registry.get(academic.hash[:4])
+    
+    def test_reload_on_change(self):
+        self.write_config({'fonts': {'primary': 'Georgia'}})
+        registry = BrandProfileRegistry(self.config_path)
+        first = registry.get()
+        
+        self.assertIs(registry.get(), first)
+        
+        self.write_config({'fonts': {'primary': 'Verdana'}})
+        self.assertEqual(registry.get().font, 'Verdana')
+    
+    def test_invalid_file_keeps_previous_profiles(self):
+        self.write_config({'fonts': {'primary': 'Georgia'}})
+        registry = BrandProfileRegistry(self.config_path)
+        
+        self.write_config({'fonts': {'title_size': -4}})
+        self.assertEqual(registry.get().font, 'Georgia')
+    
+    def test_overrides_compiled_once_per_hash(self):
+        registry = BrandProfileRegistry(self.config_path)
+        
+        first = registry.resolve(None, {'colors': {'primary': [255, 0, 0]}})
+        second = registry.resolve(None, {'colors': {'primary': '#FF0000'}})
+        
+        self.assertIs(first, second)
+        self.assertEqual(first.plan('title').color, RGBColor(255, 0, 0))
+        self.assertIs(registry.get(first.hash), first)
+
+
+if __name__ == '__main__':
+    unittest.main()
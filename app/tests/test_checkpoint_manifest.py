@@ -0,0 +1,81 @@
+import unittest
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'backend'))
+
+from utils.checkpoint_manifest import CheckpointManifest, file_digest
+
+
+class TestCheckpointManifest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.manifest_path = os.path.join(self.temp_dir.name, 'out', '.checkpoint.jsonl')
+        self.signature = {'command': 'brand', 'profile': 'abc'}
+        self.deck = self.write('deck.pptx', b'deck contents')
+        self.output = self.write('out/deck.pptx', b'branded')
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def write(self, name, data):
+        path = os.path.join(self.temp_dir.name, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+    
+    def record_deck(self):
+        with CheckpointManifest(self.manifest_path, self.signature) as manifest:
+            manifest.record(self.deck, file_digest(self.deck), self.output)
+    
+    def test_finished_files_survive_reopening(self):
+        self.record_deck()
+        
+        with CheckpointManifest(self.manifest_path, self.signature) as manifest:
+            self.assertEqual(len(manifest), 1)
+            self.assertEqual(manifest.find(self.deck)['output'], os.path.abspath(self.output))
+            self.assertIsNotNone(manifest.find_digest(file_digest(self.deck)))
+    
+    def test_changed_or_moved_files(self):
+        self.record_deck()
+        copy = self.write('renamed.pptx', b'deck contents')
+        
+        with CheckpointManifest(self.manifest_path, self.signature) as manifest:
+            self.assertIsNone(manifest.find(copy))
+            self.assertIsNotNone(manifest.find_digest(file_digest(copy)))
+            
+            self.write('deck.pptx', b'revised contents')
+            self.assertIsNone(manifest.find(self.deck))
+            self.assertIsNone(manifest.find_digest(file_digest(self.deck)))
+    
+    def test_other_signatures_and_missing_outputs_are_not_done(self):
+        self.record_deck()
+        
+        with CheckpointManifest(self.manifest_path, dict(self.signature, profile='def')) as manifest:
+            self.assertFalse(manifest.has_entries)
+            self.assertIsNone(manifest.find(self.deck))
+        
+        os.remove(self.output)
+        with CheckpointManifest(self.manifest_path, self.signature) as manifest:
+            self.assertIsNone(manifest.find(self.deck))
+    
+    def test_torn_last_line_is_ignored(self):
+        self.record_deck()
+        with open(self.manifest_path, 'a') as f:
+            f.write('{"path": "/half')
+        
+        other = self.write('other.pptx', b'other')
+        with CheckpointManifest(self.manifest_path, self.signature) as manifest:
+            self.assertEqual(len(manifest), 1)
+            manifest.record(other, file_digest(other), self.output)
+        
+        with CheckpointManifest(self.manifest_path, self.signature) as manifest:
+            self.assertIsNotNone(manifest.find(self.deck))
+            self.assertIsNotNone(manifest.find(other))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'backend'))
+
+from processors.columnar_export import ColumnarExport
+from processors.data_extractor import DataExtractor
+from processors.xml_extractor import XMLDataExtractor
+from deck_factory import build_sample_deck, build_feature_deck
+
+
+class TestColumnarExport(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.sample_path = build_sample_deck(os.path.join(cls.temp_dir.name, 'sample.pptx'), slide_count=3)
+        cls.feature_path = build_feature_deck(os.path.join(cls.temp_dir.name, 'feature.pptx'))
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+    
+    def _export(self, engine=XMLDataExtractor):
+        export = ColumnarExport()
+        for path in (self.sample_path, self.feature_path):
+            export.add_deck(engine(path, options=ColumnarExport.EXPORT_OPTIONS), os.path.basename(path))
+        return export
+    
+    def test_row_counts_match_nested_output(self):
+        export = self._export()
+        slides = [
+            slide for path in (self.sample_path, self.feature_path)
+            for slide in DataExtractor(path).extract_slides_data()
+        ]
+        shapes = [shape for slide in slides for shape in slide['shapes']]
+        paragraphs = [p for shape in shapes if 'text_content' in shape for p in shape['text_content']['paragraphs']]
+        runs = [run for p in paragraphs for run in p['runs']]
+        
+        counts = export.row_counts()
+        
+        self.assertEqual(counts['slides'], len(slides))
+        self.assertEqual(counts['shapes'], len(shapes))
+        self.assertEqual(counts['paragraphs'], len(paragraphs))
+        self.assertEqual(counts['runs'], len(runs))
+        self.assertEqual(counts['chart_points'], 8)
+        self.assertEqual(counts['table_values'], 4)
+    
+    def test_engines_produce_identical_columns(self):
+        xml_arrays = self._export(XMLDataExtractor).to_arrays()
+        pptx_arrays = self._export(DataExtractor).to_arrays()
+        
+        for table, columns in xml_arrays.items():
+            for name, values in columns.items():
+                np.testing.assert_array_equal(values, pptx_arrays[table][name], err_msg=f"{table}.{name}")
+    
+    def test_save_and_mmap_load(self):
+        export = self._export()
+        output_dir = os.path.join(self.temp_dir.name, 'columns')
+        export.save(output_dir)
+        
+        tables = ColumnarExport.load(output_dir)
+        runs = tables['runs']
+        fonts = tables['dictionaries']['fonts']
+        
+        self.assertIsInstance(runs['font_size'], np.memmap)
+        self.assertEqual(runs['font_size'].dtype, np.float32)
+        sizes = runs['font_size'][~np.isnan(runs['font_size'])]
+        self.assertEqual(sorted(set(sizes.tolist())), [13.5, 20.0])
+        
+        georgia = runs['font'] == fonts.index('Georgia')
+        self.assertEqual(int(georgia.sum()), 1)
+        self.assertEqual(tables['dictionaries']['colors'][runs['color'][georgia][0]], '#123456')
+        self.assertEqual(sorted(tables['dictionaries']['decks']), ['feature.pptx', 'sample.pptx'])
+
+
+if __name__ == '__main__':
+    unittest.main()
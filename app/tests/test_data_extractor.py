@@ -0,0 +1,86 @@
+import unittest
+import os
+import sys
+import tempfile
+from unittest import mock
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'backend'))
+
+from processors.data_extractor import DataExtractor
+from processors.xml_extractor import XMLDataExtractor
+from processors.collectors import Collector, BrandingCollector
+from deck_factory import build_sample_deck
+
+
+class TestDataExtractor(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.deck_path = build_sample_deck(os.path.join(cls.temp_dir.name, 'deck.pptx'), slide_count=3)
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+    
+    def test_extract_all_data(self):
+        data = DataExtractor(self.deck_path).extract_all_data()
+        
+        self.assertEqual(len(data['slides']), 3)
+        self.assertEqual(data['slides'][0]['notes'], 'Speaker notes 1')
+        self.assertEqual(data['metadata']['slide_count'], 3)
+    
+    def test_metadata_without_loaded_deck_closes_package(self):
+        with mock.patch.object(XMLDataExtractor, 'close', autospec=True,
+                               side_effect=XMLDataExtractor.close) as close:
+            metadata = DataExtractor(self.deck_path).extract_metadata()
+        
+        self.assertEqual(metadata['slide_count'], 3)
+        close.assert_called_once()
+        self.assertIsNone(close.call_args[0][0]._archive)
+    
+    def test_iter_records_matches_extract_all_data(self):
+        extractor = DataExtractor(self.deck_path)
+        records = list(extractor.iter_records())
+        data = extractor.extract_all_data()
+        
+        self.assertEqual([r['type'] for r in records], ['slide'] * 3 + ['branding', 'metadata'])
+        self.assertEqual([r['data'] for r in records[:3]], data['slides'])
+        self.assertEqual(records[3]['data'], data['branding'])
+        self.assertEqual(records[4]['data'], data['metadata'])
+    
+    def test_branding_collector_gathers_run_fonts_and_colors(self):
+        extractor = DataExtractor(self.deck_path)
+        collected = extractor.run_collectors([BrandingCollector()])
+        runs = [
+            run for slide in extractor.extract_slides_data() for shape in slide['shapes']
+            for paragraph in shape.get('text_content', {}).get('paragraphs', []) for run in paragraph['runs']
+        ]
+        
+        fonts = {run['font_name'] for run in runs if run['font_name']}
+        colors = {run['color'] for run in runs if run['color']}
+        
+        self.assertEqual(list(collected), ['branding'])
+        self.assertEqual(sorted(collected['branding']['fonts']), sorted(fonts))
+        self.assertEqual(sorted(collected['branding']['colors']), sorted(colors))
+    
+    def test_custom_collector_shares_the_pass(self):
+        class RunCounter(Collector):
+            name = 'run_count'
+            
+            def __init__(self):
+                self.count = 0
+            
+            def on_run(self, run, shape):
+                self.count += 1
+            
+            def result(self, extractor):
+                return self.count
+        
+        data = DataExtractor(self.deck_path).run_collectors([RunCounter()])
+        
+        self.assertEqual(data['run_count'], 12)
+
+
+if __name__ == '__main__':
+    unittest.main()
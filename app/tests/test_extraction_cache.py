@@ -0,0 +1,81 @@
+import unittest
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'backend'))
+
+from processors.extraction_cache import ExtractionCache
+
+
+class TestExtractionCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def test_round_trip(self):
+        cache = ExtractionCache(self.temp_dir.name)
+        data = {'slides': [{'index': 0, 'notes': 'hello'}], 'metadata': {'title': None}}
+        
+        self.assertIsNone(cache.get('abc', 'v1'))
+        cache.put('abc', 'v1', data)
+        self.assertEqual(cache.get('abc', 'v1'), data)
+        self.assertIsNone(cache.get('abc', 'v2'))
+    
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = ExtractionCache(self.temp_dir.name)
+        payload = {'text': os.urandom(2048).hex()}
+        cache.put('first', 'v1', payload)
+        cache.put('second', 'v1', payload)
+        
+        old = time.time() - 60
+        os.utime(cache._entry_path('second', 'v1'), (old, old))
+        cache.max_bytes = os.path.getsize(cache._entry_path('first', 'v1')) * 2
+        cache.put('third', 'v1', payload)
+        
+        self.assertIsNotNone(cache.get('first', 'v1'))
+        self.assertIsNone(cache.get('second', 'v1'))
+        self.assertIsNotNone(cache.get('third', 'v1'))
+    
+    def test_corrupt_entry_is_discarded(self):
+        cache = ExtractionCache(self.temp_dir.name)
+        os.makedirs(os.path.dirname(cache._entry_path('bad', 'v1')))
+        with open(cache._entry_path('bad', 'v1'), 'wb') as f:
+            f.write(b'not gzip')
+        
+        self.assertIsNone(cache.get('bad', 'v1'))
+        self.assertFalse(os.path.exists(cache._entry_path('bad', 'v1')))
+    
+    def test_invalidate_removes_every_variant_of_a_digest(self):
+        cache = ExtractionCache(self.temp_dir.name)
+        for digest, variant in (('abc', 'v1'), ('abc', 'v2'), ('abd', 'v1')):
+            cache.put(digest, variant, {'variant': variant})
+        
+        cache.invalidate('abc')
+        
+        self.assertIsNone(cache.get('abc', 'v1'))
+        self.assertIsNone(cache.get('abc', 'v2'))
+        self.assertEqual(cache.get('abd', 'v1'), {'variant': 'v1'})
+    
+    def test_put_scans_only_when_due(self):
+        cache = ExtractionCache(self.temp_dir.name, evict_every=3)
+        scans = []
+        original_evict = cache.evict
+        cache.evict = lambda: scans.append(1) or original_evict()
+        
+        for index in range(7):
+            cache.put(f'{index:064d}', 'v1', {'index': index})
+        # First put, then every third put.
+        self.assertEqual(len(scans), 3)
+        
+        cache.max_bytes = cache._scanned_bytes + cache._bytes_since_scan + 1024
+        cache.put('f' * 64, 'v1', {'text': os.urandom(2048).hex()})
+        self.assertEqual(len(scans), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
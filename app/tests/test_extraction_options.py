@@ -0,0 +1,114 @@
+import unittest
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'backend'))
+
+from processors.data_extractor import DataExtractor
+from processors.extraction_options import ExtractionOptions
+from processors.xml_extractor import XMLDataExtractor
+from deck_factory import build_sample_deck, build_feature_deck
+
+
+class RecordingXMLDataExtractor(XMLDataExtractor):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.parsed = []
+    
+    def _parse(self, partname):
+        self.parsed.append(partname)
+        return super()._parse(partname)
+
+
+class TestExtractionOptions(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.sample_path = build_sample_deck(os.path.join(cls.temp_dir.name, 'sample.pptx'), slide_count=12)
+        cls.feature_path = build_feature_deck(os.path.join(cls.temp_dir.name, 'feature.pptx'))
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+    
+    def test_parse_slides(self):
+        self.assertEqual(ExtractionOptions.parse_slides('1-3,5'), [0, 1, 2, 4])
+        self.assertEqual(ExtractionOptions.parse_slides([2, 4]), [1, 3])
+        self.assertIsNone(ExtractionOptions.parse_slides(None))
+        self.assertEqual(len(ExtractionOptions.parse_slides('1-1000000000')), ExtractionOptions.MAX_SLIDES)
+        self.assertEqual(ExtractionOptions.parse_slides('2,99999999'), [1])
+        
+        for spec in ('0', '3-1', 'a-b', '2-'):
+            with self.assertRaises(ValueError):
+                ExtractionOptions.parse_slides(spec)
+    
+    def test_unknown_field_rejected(self):
+        with self.assertRaises(ValueError):
+            ExtractionOptions.parse('text,bogus')
+    
+    def test_projected_extraction_matches_projected_full_result(self):
+        cases = [
+            ('text', '1-10'),
+            ('metadata', None),
+            ('runs,notes', '2'),
+            ('images,tables,charts', None),
+            ('shapes,branding', None),
+            ('slides', '3-4'),
+        ]
+        
+        for path in (self.sample_path, self.feature_path):
+            full = DataExtractor(path).extract_all_data()
+            for fields, slides in cases:
+                options = ExtractionOptions.parse(fields, slides)
+                expected = options.project(full)
+                for engine in (DataExtractor, XMLDataExtractor):
+                    with self.subTest(path=os.path.basename(path), fields=fields, slides=slides, engine=engine.__name__):
+                        actual = engine(path, options=options).extract_all_data()
+                        if 'branding' in actual:
+                            for key in ('fonts', 'colors'):
+                                actual['branding'][key].sort()
+                                expected['branding'][key].sort()
+                        self.assertEqual(actual, expected)
+    
+    def test_text_projection_drops_runs(self):
+        options = ExtractionOptions.parse('text', '1')
+        data = XMLDataExtractor(self.sample_path, options=options).extract_all_data()
+        
+        self.assertEqual(list(data), ['slides'])
+        self.assertEqual(len(data['slides']), 1)
+        paragraph = data['slides'][0]['shapes'][0]['text_content']['paragraphs'][0]
+        self.assertEqual(paragraph, {'text': 'Slide 1', 'level': 0})
+    
+    def test_metadata_only_skips_slides(self):
+        options = ExtractionOptions.parse('metadata')
+        
+        extractor = DataExtractor(self.sample_path, options=options)
+        data = extractor.extract_all_data()
+        self.assertIsNone(extractor._presentation)
+        self.assertEqual(data['metadata']['slide_count'], 12)
+        
+        xml_extractor = RecordingXMLDataExtractor(self.sample_path, options=options)
+        xml_extractor.extract_all_data()
+        self.assertFalse(any('slides/' in part or 'slideLayouts/' in part for part in xml_extractor.parsed))
+    
+    def test_slide_range_parses_only_selected_slides(self):
+        options = ExtractionOptions.parse('text', '2-3')
+        extractor = RecordingXMLDataExtractor(self.sample_path, options=options)
+        data = extractor.extract_all_data()
+        
+        self.assertEqual([s['index'] for s in data['slides']], [1, 2])
+        slide_parts = [part for part in extractor.parsed if '/slides/' in part]
+        self.assertEqual(slide_parts, ['ppt/slides/slide2.xml', 'ppt/slides/slide3.xml'])
+    
+    def test_iter_records_respects_projection(self):
+        options = ExtractionOptions.parse('notes,metadata', '1')
+        records = list(XMLDataExtractor(self.sample_path, options=options).iter_records())
+        
+        self.assertEqual([r['type'] for r in records], ['slide', 'metadata'])
+        self.assertEqual(records[0]['data'], {'index': 0, 'layout': 'Title and Content', 'notes': 'Speaker notes 1'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import unittest
+import hashlib
+import io
+import os
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'backend'))
+
+from utils.file_handler import FileHandler
+
+
+class FakeUpload:
+    def __init__(self, filename, data):
+        self.filename = filename
+        self.stream = io.BytesIO(data)
+
+
+def make_zip_bytes(entries):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, data in entries.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+class TestFileHandler(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.handler = FileHandler(
+            os.path.join(self.temp_dir.name, 'uploads'),
+            os.path.join(self.temp_dir.name, 'outputs')
+        )
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def test_stream_upload_hashes_content(self):
+        data = make_zip_bytes({'ppt/presentation.xml': b'<p/>'})
+        result = self.handler.stream_uploaded_file(FakeUpload('deck.pptx', data))
+        
+        self.assertIsNotNone(result)
+        self.assertEqual(result['sha256'], hashlib.sha256(data).hexdigest())
+        self.assertEqual(result['size'], len(data))
+        self.assertTrue(os.path.exists(result['path']))
+    
+    def test_oversized_upload_is_aborted(self):
+        self.handler.MAX_FILE_SIZE = 1024
+        data = make_zip_bytes({'ppt/media/image1.bin': os.urandom(4096)})
+        
+        self.assertIsNone(self.handler.stream_uploaded_file(FakeUpload('deck.pptx', data)))
+        self.assertEqual(os.listdir(self.handler.upload_dir), [])
+    
+    def test_zip_bomb_is_rejected(self):
+        data = make_zip_bytes({'ppt/slides/slide1.xml': b'\0' * (8 * 1024 * 1024)})
+        
+        self.assertIsNone(self.handler.stream_uploaded_file(FakeUpload('deck.pptx', data)))
+        self.assertEqual(os.listdir(self.handler.upload_dir), [])
+    
+    def test_non_zip_upload_is_rejected(self):
+        result = self.handler.stream_uploaded_file(FakeUpload('deck.pptx', b'plain text'))
+        self.assertIsNone(result)
+    
+    def test_cleanup_reports_removed_files(self):
+        data = make_zip_bytes({'ppt/presentation.xml': b'<p/>'})
+        old = self.handler.stream_uploaded_file(FakeUpload('old.pptx', data))['path']
+        fresh = self.handler.stream_uploaded_file(FakeUpload('fresh.pptx', data))['path']
+        os.utime(old, (0, 0))
+        
+        removed = self.handler.cleanup_old_files(self.handler.upload_dir, max_age_hours=1)
+        
+        self.assertEqual(removed, [old])
+        self.assertTrue(os.path.exists(fresh))
+
+
+class TestContentAddressedStore(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.handler = FileHandler(
+            os.path.join(self.temp_dir.name, 'uploads'),
+            os.path.join(self.temp_dir.name, 'outputs'),
+            content_addressed=True
+        )
+        self.data = make_zip_bytes({'ppt/presentation.xml': b'<p/>'})
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def test_identical_uploads_share_one_blob(self):
+        first = self.handler.stream_uploaded_file(FakeUpload('a.pptx', self.data))
+        second = self.handler.stream_uploaded_file(FakeUpload('b.pptx', self.data))
+        
+        self.assertFalse(first['deduplicated'])
+        self.assertTrue(second['deduplicated'])
+        self.assertNotEqual(first['path'], second['path'])
+        self.assertTrue(os.path.samefile(first['path'], second['path']))
+        self.assertEqual(self.handler.store.resolve(os.path.basename(second['path'])), first['sha256'])
+    
+    def test_cached_inspection_is_shared_by_digest(self):
+        first = self.handler.stream_uploaded_file(FakeUpload('a.pptx', self.data))
+        self.handler.cache_inspection(first['sha256'], {'info': {'slide_count': 1}})
+        
+        second = self.handler.stream_uploaded_file(FakeUpload('b.pptx', self.data))
+        cached = self.handler.get_cached_inspection(second['sha256'])
+        self.assertEqual(cached['info']['slide_count'], 1)
+    
+    def test_blob_removed_with_last_reference(self):
+        first = self.handler.stream_uploaded_file(FakeUpload('a.pptx', self.data))
+        second = self.handler.stream_uploaded_file(FakeUpload('b.pptx', self.data))
+        blob_path = self.handler.store.blob_path(first['sha256'])
+        
+        self.handler.delete_file(first['path'])
+        self.assertTrue(os.path.exists(blob_path))
+        
+        os.remove(second['path'])
+        self.handler.cleanup_old_files(self.handler.upload_dir)
+        self.assertFalse(os.path.exists(blob_path))
+        self.assertIsNone(self.handler.get_cached_inspection(first['sha256']))
+
+
+if __name__ == '__main__':
+    unittest.main()
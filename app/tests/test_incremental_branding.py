@@ -0,0 +1,98 @@
+import unittest
+import os
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'backend'))
+
+from pptx import Presentation
+
+from processors.brand_profiles import BrandProfile
+from processors.branding_history import BrandingHistory
+from processors.output_generator import OutputGenerator
+from deck_factory import build_branding_corpus_deck
+
+
+def read_members(path):
+    with zipfile.ZipFile(path) as archive:
+        return {name: archive.read(name) for name in archive.namelist()}
+
+
+class TestIncrementalBranding(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.v1_path = build_branding_corpus_deck(os.path.join(cls.temp_dir.name, 'v1.pptx'))
+        
+        presentation = Presentation(cls.v1_path)
+        cls.slide_count = len(presentation.slides)
+        presentation.slides[2].shapes.add_textbox(0, 0, 914400, 457200).text_frame.text = 'Revised'
+        cls.v2_path = os.path.join(cls.temp_dir.name, 'v2.pptx')
+        presentation.save(cls.v2_path)
+        
+        presentation = Presentation(cls.v1_path)
+        slide_ids = presentation.slides._sldIdLst
+        slide_ids.insert(0, slide_ids[2])
+        cls.reordered_path = os.path.join(cls.temp_dir.name, 'reordered.pptx')
+        presentation.save(cls.reordered_path)
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+    
+    def setUp(self):
+        self.history = BrandingHistory(tempfile.mkdtemp(dir=self.temp_dir.name))
+    
+    def brand(self, path, profile=None, history=None, lineage='deck'):
+        generator = OutputGenerator(path, tempfile.mkdtemp(dir=self.temp_dir.name), profile=profile,
+                                    engine='xml', history=history, lineage=lineage)
+        return generator, generator.generate_enhanced_presentation()
+    
+    def test_unchanged_deck_reuses_every_slide(self):
+        _, full_path = self.brand(self.v1_path)
+        first, _ = self.brand(self.v1_path, history=self.history)
+        second, output_path = self.brand(self.v1_path, history=self.history)
+        
+        self.assertEqual(first.reused_slides, 0)
+        self.assertEqual(second.reused_slides, self.slide_count)
+        self.assertEqual(read_members(output_path), read_members(full_path))
+    
+    def test_only_edited_slide_is_rebranded(self):
+        _, full_path = self.brand(self.v2_path)
+        self.brand(self.v1_path, history=self.history)
+        generator, output_path = self.brand(self.v2_path, history=self.history)
+        
+        self.assertEqual(generator.reused_slides, self.slide_count - 1)
+        self.assertEqual(read_members(output_path), read_members(full_path))
+    
+    def test_reordered_first_slide_is_rebranded(self):
+        _, full_path = self.brand(self.reordered_path)
+        self.brand(self.v1_path, history=self.history)
+        generator, output_path = self.brand(self.reordered_path, history=self.history)
+        
+        self.assertEqual(generator.reused_slides, self.slide_count - 2)
+        self.assertEqual(read_members(output_path), read_members(full_path))
+    
+    def test_history_is_per_profile_and_lineage(self):
+        self.brand(self.v1_path, history=self.history)
+        
+        other_profile, _ = self.brand(self.v1_path, profile=BrandProfile.compile({'fonts': {'primary': 'Georgia'}}),
+                                      history=self.history)
+        other_lineage, _ = self.brand(self.v1_path, history=self.history, lineage='other')
+        
+        self.assertEqual(other_profile.reused_slides, 0)
+        self.assertEqual(other_lineage.reused_slides, 0)
+    
+    def test_missing_output_discards_history(self):
+        _, output_path = self.brand(self.v1_path, history=self.history)
+        os.remove(output_path)
+        
+        generator, _ = self.brand(self.v1_path, history=self.history)
+        self.assertEqual(generator.reused_slides, 0)
+        self.assertEqual(len(os.listdir(self.history.history_dir)), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
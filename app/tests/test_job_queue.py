@@ -0,0 +1,199 @@
+import unittest
+import os
+import sys
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'backend'))
+
+from utils.job_queue import JobQueue, JobWorker, JobWorkerPool
+
+
+def echo_handler(kind, params, progress):
+    # Module level so spawned pool workers can import it.
+    if params.get('fail'):
+        raise RuntimeError('boom')
+    for done in range(1, params['slides'] + 1):
+        progress(done, params['slides'])
+    return {'kind': kind, 'slides': params['slides'], 'pid': os.getpid()}
+
+
+class TestJobQueue(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.queue = JobQueue(os.path.join(self.temp_dir.name, 'jobs.db'), lease=60, max_attempts=2)
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def age_job(self, job_id, seconds):
+        conn = sqlite3.connect(self.queue.db_path)
+        with conn:
+            conn.execute('UPDATE jobs SET updated_at = updated_at - ?, finished_at = finished_at - ? WHERE id = ?',
+                         (seconds, seconds, job_id))
+        conn.close()
+    
+    def test_jobs_are_claimed_once_in_order(self):
+        first = self.queue.enqueue('process', {'n': 1})
+        second = self.queue.enqueue('process', {'n': 2})
+        
+        job = self.queue.claim()
+        self.assertEqual((job['id'], job['kind'], job['params']), (first, 'process', {'n': 1}))
+        self.assertEqual(self.queue.claim()['id'], second)
+        self.assertIsNone(self.queue.claim())
+        self.assertEqual(self.queue.counts(), {'running': 2})
+    
+    def test_claim_by_kind(self):
+        batch = self.queue.enqueue('batch', {})
+        deck = self.queue.enqueue('process', {})
+        
+        self.assertEqual(self.queue.claim(kinds=('process',))['id'], deck)
+        self.assertIsNone(self.queue.claim(kinds=('process',)))
+        self.assertEqual(self.queue.claim()['id'], batch)
+    
+    def test_progress_and_completion(self):
+        job_id = self.queue.enqueue('process', {})
+        self.assertEqual(self.queue.get(job_id)['state'], 'queued')
+        
+        claim_token = self.queue.claim()['claim_token']
+        self.assertTrue(self.queue.report_progress(job_id, claim_token, 3, 10))
+        job = self.queue.get(job_id)
+        self.assertEqual(job['state'], 'running')
+        self.assertEqual(job['progress'], {'done': 3, 'total': 10})
+        
+        self.assertTrue(self.queue.complete(job_id, claim_token, {'output_file_id': 'out.pptx'}))
+        job = self.queue.get(job_id)
+        self.assertEqual(job['state'], 'done')
+        self.assertEqual(job['result'], {'output_file_id': 'out.pptx'})
+        self.assertIsNone(self.queue.get('missing'))
+    
+    def test_stale_jobs_are_retried_then_failed(self):
+        job_id = self.queue.enqueue('process', {})
+        self.queue.claim()
+        self.assertIsNone(self.queue.claim())
+        
+        self.age_job(job_id, 120)
+        self.assertEqual(self.queue.claim()['id'], job_id)
+        self.assertEqual(self.queue.get(job_id)['attempts'], 2)
+        
+        self.age_job(job_id, 120)
+        self.assertIsNone(self.queue.claim())
+        job = self.queue.get(job_id)
+        self.assertEqual(job['state'], 'failed')
+        self.assertEqual(job['error'], 'Worker stopped responding')
+    
+    def test_superseded_claim_cannot_report_or_finish(self):
+        job_id = self.queue.enqueue('process', {})
+        stale = self.queue.claim()['claim_token']
+        self.age_job(job_id, 120)
+        current = self.queue.claim()['claim_token']
+        
+        self.assertFalse(self.queue.report_progress(job_id, stale, 1, 2))
+        self.assertFalse(self.queue.heartbeat(job_id, stale))
+        self.assertFalse(self.queue.complete(job_id, stale, {'attempt': 'stale'}))
+        self.assertEqual(self.queue.get(job_id)['state'], 'running')
+        
+        self.assertTrue(self.queue.complete(job_id, current, {'attempt': 'current'}))
+        self.assertFalse(self.queue.fail(job_id, stale, 'late'))
+        job = self.queue.get(job_id)
+        self.assertEqual((job['state'], job['result']), ('done', {'attempt': 'current'}))
+    
+    def test_remove_finished(self):
+        done = self.queue.enqueue('process', {})
+        pending = self.queue.enqueue('process', {})
+        self.queue.complete(done, self.queue.claim()['claim_token'], {})
+        self.age_job(done, 48 * 3600)
+        
+        self.assertEqual(self.queue.remove_finished(max_age_hours=24), 1)
+        self.assertIsNone(self.queue.get(done))
+        self.assertIsNotNone(self.queue.get(pending))
+
+
+class TestJobWorker(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.queue = JobQueue(os.path.join(self.temp_dir.name, 'jobs.db'))
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def test_run_once(self):
+        ok = self.queue.enqueue('process', {'slides': 50})
+        failing = self.queue.enqueue('process', {'slides': 1, 'fail': True})
+        worker = JobWorker(self.queue, echo_handler, progress_interval=3600)
+        
+        self.assertTrue(worker.run_once())
+        self.assertTrue(worker.run_once())
+        self.assertFalse(worker.run_once())
+        
+        job = self.queue.get(ok)
+        self.assertEqual(job['state'], 'done')
+        self.assertEqual(job['progress'], {'done': 50, 'total': 50})
+        self.assertEqual(job['result']['slides'], 50)
+        self.assertEqual(self.queue.get(failing)['state'], 'failed')
+        self.assertEqual(self.queue.get(failing)['error'], 'boom')
+    
+    def test_heartbeat_keeps_a_slow_job_claimed(self):
+        queue = JobQueue(self.queue.db_path, lease=1)
+        job_id = queue.enqueue('process', {})
+        claims = []
+        
+        def slow_handler(kind, params, progress):
+            # Reports no progress for several leases while another worker polls.
+            for _ in range(6):
+                time.sleep(0.5)
+                claims.append(queue.claim())
+            return {'ok': True}
+        
+        self.assertTrue(JobWorker(queue, slow_handler).run_once())
+        
+        self.assertEqual(claims, [None] * 6)
+        job = queue.get(job_id)
+        self.assertEqual((job['state'], job['attempts']), ('done', 1))
+    
+    def test_worker_pool(self):
+        pool = JobWorkerPool(self.queue.db_path, echo_handler, workers=2)
+        job_ids = [self.queue.enqueue('process', {'slides': 5}) for _ in range(4)]
+        pool.ensure_started()
+        try:
+            deadline = time.monotonic() + 60
+            while time.monotonic() < deadline and self.queue.counts() != {'done': 4}:
+                time.sleep(0.1)
+        finally:
+            pool.stop()
+        
+        self.assertEqual(self.queue.counts(), {'done': 4})
+        for job_id in job_ids:
+            self.assertNotEqual(self.queue.get(job_id)['result']['pid'], os.getpid())
+    
+    def test_fresh_pool_resumes_pending_jobs(self):
+        idle = JobWorkerPool(self.queue.db_path, echo_handler, workers=1)
+        self.assertFalse(idle.start_if_pending())
+        
+        # Jobs left behind by a previous server: one claimed by a worker
+        # that died long ago, one still queued.
+        abandoned = self.queue.enqueue('process', {'slides': 2})
+        self.queue.claim()
+        conn = sqlite3.connect(self.queue.db_path)
+        with conn:
+            conn.execute('UPDATE jobs SET updated_at = updated_at - 3600 WHERE id = ?', (abandoned,))
+        conn.close()
+        queued = self.queue.enqueue('process', {'slides': 3})
+        
+        pool = JobWorkerPool(self.queue.db_path, echo_handler, workers=1)
+        self.assertTrue(pool.start_if_pending())
+        try:
+            deadline = time.monotonic() + 60
+            while time.monotonic() < deadline and self.queue.counts() != {'done': 2}:
+                time.sleep(0.1)
+        finally:
+            pool.stop()
+        
+        self.assertEqual(self.queue.get(queued)['state'], 'done')
+        self.assertEqual(self.queue.get(abandoned)['state'], 'done')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+import os
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'backend'))
+
+from lxml import etree
+from pptx import Presentation
+from pptx.oxml.ns import qn
+
+from processors.brand_profiles import BrandProfile
+from processors.output_generator import OutputGenerator
+from deck_factory import build_feature_deck, build_branding_corpus_deck
+
+
+class TestMasterBrandingWriter(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.corpus_path = build_branding_corpus_deck(os.path.join(cls.temp_dir.name, 'corpus.pptx'))
+        cls.feature_path = build_feature_deck(os.path.join(cls.temp_dir.name, 'feature.pptx'))
+        cls.profile = BrandProfile.compile({'fonts': {'primary': 'Georgia'}})
+        cls.outputs = {}
+        for mode in OutputGenerator.MODES:
+            generator = OutputGenerator(cls.corpus_path, tempfile.mkdtemp(dir=cls.temp_dir.name),
+                                        profile=cls.profile, mode=mode)
+            cls.outputs[mode] = generator.generate_enhanced_presentation()
+        cls.archive = zipfile.ZipFile(cls.outputs['master'])
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.archive.close()
+        cls.temp_dir.cleanup()
+    
+    def part(self, name):
+        return etree.fromstring(self.archive.read(name))
+    
+    def test_theme_rewritten(self):
+        theme = self.part('ppt/theme/theme1.xml')
+        
+        fonts = theme.findall(f".//{qn('a:fontScheme')}/*/{qn('a:latin')}")
+        self.assertEqual({font.get('typeface') for font in fonts}, {'Georgia'})
+        accent = theme.find(f".//{qn('a:clrScheme')}/{qn('a:accent1')}/{qn('a:srgbClr')}")
+        self.assertEqual(accent.get('val'), '0066CC')
+    
+    def test_master_text_styles(self):
+        master = self.part('ppt/slideMasters/slideMaster1.xml')
+        title = master.find(f".//{qn('p:titleStyle')}/{qn('a:lvl1pPr')}")
+        body_levels = master.findall(f".//{qn('p:bodyStyle')}/*")
+        
+        self.assertEqual(title.get('algn'), 'ctr')
+        self.assertEqual(title.find(qn('a:defRPr')).get('sz'), '4400')
+        self.assertEqual(title.find(qn('a:defRPr')).get('b'), '1')
+        self.assertEqual(title.find(f"{qn('a:defRPr')}/{qn('a:latin')}").get('typeface'), '+mj-lt')
+        self.assertEqual({level.find(qn('a:defRPr')).get('sz') for level in body_levels}, {'1800'})
+        self.assertEqual(master.find(f".//{qn('p:bg')}//{qn('a:srgbClr')}").get('val'), 'FFFFFF')
+    
+    def test_only_conflicting_overrides_removed(self):
+        slide = self.part('ppt/slides/slide2.xml')
+        rPrs = slide.findall(f".//{qn('a:r')}/{qn('a:rPr')}")
+        
+        # b="0" already matches the body style and stays; the theme color and
+        # gradient fill and the explicit Arial latin font contradict it.
+        self.assertEqual(rPrs[0].get('b'), '0')
+        self.assertEqual(rPrs[0].get('lang'), 'en-US')
+        self.assertIsNone(rPrs[1].find(qn('a:solidFill')))
+        self.assertIsNone(rPrs[2].find(qn('a:gradFill')))
+        self.assertIsNone(rPrs[2].find(qn('a:latin')))
+        self.assertIsNotNone(rPrs[2].find(qn('a:ea')))
+        self.assertIsNone(rPrs[3].get('sz'))
+        
+        paragraph = self.part('ppt/slides/slide3.xml').findall(f".//{qn('a:pPr')}")[0]
+        self.assertIsNone(paragraph.get('algn'))
+        self.assertIsNone(paragraph.find(qn('a:lnSpc')))
+        self.assertEqual(paragraph.get('lvl'), '1')
+    
+    def test_runs_left_without_brand_overrides(self):
+        slide = self.part('ppt/slides/slide5.xml')
+        
+        self.assertEqual(slide.findall(f".//{qn('a:latin')}"), [])
+        self.assertEqual(slide.findall(f".//{qn('a:solidFill')}"), [])
+        self.assertIsNone(slide.find(f"{qn('p:cSld')}/{qn('p:bg')}"))
+    
+    def test_output_smaller_than_shapes_mode(self):
+        self.assertLess(os.path.getsize(self.outputs['master']), os.path.getsize(self.outputs['shapes']))
+    
+    def test_feature_deck_opens(self):
+        generator = OutputGenerator(self.feature_path, tempfile.mkdtemp(dir=self.temp_dir.name), mode='master')
+        output_path = generator.generate_enhanced_presentation()
+        
+        self.assertTrue(generator.validate_output(output_path))
+        self.assertEqual(len(Presentation(output_path).slides), 5)
+    
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            OutputGenerator(self.corpus_path, self.temp_dir.name, mode='theme')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'backend'))
+
+from processors.data_extractor import DataExtractor
+from lxml import etree
+
+from processors.numeric_data import parse_number, type_table_columns, _read_points, MAX_MISSING_POINTS, NS_C
+from processors.xml_extractor import XMLDataExtractor
+from deck_factory import build_feature_deck
+
+
+class TestNumericData(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.feature_path = build_feature_deck(os.path.join(cls.temp_dir.name, 'feature.pptx'))
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+    
+    def test_parse_number(self):
+        cases = {
+            '1,200': 1200.0,
+            '(1,234.5)': -1234.5,
+            '$12': 12.0,
+            '45%': 45.0,
+            '1e3': 1000.0,
+            ' 7 ': 7.0,
+            'abc': None,
+            '': None,
+            '-': None,
+        }
+        for text, expected in cases.items():
+            self.assertEqual(parse_number(text), expected, text)
+    
+    def test_type_table_columns(self):
+        columns = type_table_columns([
+            ['Region', 'Q1', 'Q2'],
+            ['North', '1,200', '1300.5'],
+            ['South', '950', 'n/a'],
+        ])
+        
+        self.assertEqual([c['type'] for c in columns], ['text', 'number', 'number'])
+        self.assertEqual(columns[0]['values'], ['North', 'South'])
+        self.assertEqual(columns[1]['values'], [1200.0, 950.0])
+        self.assertEqual(columns[2]['values'], [1300.5, None])
+    
+    def test_point_cache_bounds(self):
+        cache = etree.fromstring(
+            f'<c:numCache xmlns:c="{NS_C}"><c:ptCount val="4000000000"/>'
+            '<c:pt idx="0"><c:v>1</c:v></c:pt><c:pt idx="-1"><c:v>2</c:v></c:pt>'
+            '<c:pt idx="2"><c:v>3</c:v></c:pt><c:pt idx="999999999"><c:v>4</c:v></c:pt></c:numCache>'
+        )
+        values = _read_points(cache, numeric=True)['values']
+        
+        self.assertEqual(len(values), 4 + MAX_MISSING_POINTS)
+        self.assertEqual(values[:3], [1.0, None, 3.0])
+        self.assertNotIn(2.0, values)
+        self.assertNotIn(4.0, values)
+    
+    def test_chart_series_from_both_engines(self):
+        for engine in (DataExtractor, XMLDataExtractor):
+            slides = engine(self.feature_path).extract_slides_data()
+            charts = [shape['chart_data'] for shape in slides[3]['shapes'] if 'chart_data' in shape]
+            
+            self.assertEqual(charts[0]['categories'], ['Q1', 'Q2', 'Q3'])
+            self.assertEqual([s['name'] for s in charts[0]['series']], ['Revenue', 'Cost'])
+            self.assertEqual(charts[0]['series'][0]['values'], [10.5, 12.0, 14.25])
+            self.assertEqual(charts[0]['series'][1]['values'], [7.0, None, 9.5])
+            self.assertEqual(charts[1]['series'][0]['values'], [0.6, 0.4])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'backend'))
+
+from processors.output_cache import OutputCache
+from processors.output_generator import OutputGenerator
+from utils.file_handler import FileHandler
+from deck_factory import build_sample_deck
+
+
+class TestOutputCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = os.path.join(self.temp_dir.name, 'outputs')
+        os.makedirs(self.output_dir)
+        self.cache = OutputCache(os.path.join(self.temp_dir.name, 'index'), self.output_dir, max_bytes=250)
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def write_output(self, name, size=100, age=0):
+        path = os.path.join(self.output_dir, name)
+        with open(path, 'wb') as f:
+            f.write(b'x' * size)
+        stamp = time.time() - age
+        os.utime(path, (stamp, stamp))
+        return path
+    
+    def test_hit_returns_output_file_id(self):
+        self.cache.put('a' * 64, 'variant', self.write_output('out.pptx'))
+        
+        self.assertEqual(self.cache.get('a' * 64, 'variant'), 'out.pptx')
+        self.assertIsNone(self.cache.get('a' * 64, 'other'))
+        self.assertIsNone(self.cache.get('b' * 64, 'variant'))
+    
+    def test_variant_separates_profile_and_mode(self):
+        variants = {
+            OutputCache.variant('h1', 'shapes'),
+            OutputCache.variant('h2', 'shapes'),
+            OutputCache.variant('h1', 'master')
+        }
+        self.assertEqual(len(variants), 3)
+    
+    def test_removed_output_is_a_miss(self):
+        path = self.write_output('out.pptx')
+        self.cache.put('a' * 64, 'variant', path)
+        os.remove(path)
+        
+        self.assertIsNone(self.cache.get('a' * 64, 'variant'))
+        self.assertEqual(os.listdir(self.cache.index_dir), [])
+    
+    def test_hit_keeps_output_from_cleanup(self):
+        handler = FileHandler(os.path.join(self.temp_dir.name, 'uploads'), self.output_dir)
+        self.cache.put('a' * 64, 'variant', self.write_output('used.pptx'))
+        self.cache.put('b' * 64, 'variant', self.write_output('stale.pptx'))
+        for name in ('used.pptx', 'stale.pptx'):
+            os.utime(os.path.join(self.output_dir, name), (time.time() - 48 * 3600,) * 2)
+        
+        self.cache.get('a' * 64, 'variant')
+        handler.cleanup_old_files(self.output_dir, max_age_hours=24)
+        
+        self.assertEqual(os.listdir(self.output_dir), ['used.pptx'])
+        self.assertEqual(self.cache.evict(), 1)
+        self.assertEqual(self.cache.get('a' * 64, 'variant'), 'used.pptx')
+    
+    def test_eviction_by_age_and_size(self):
+        self.cache.put('a' * 64, 'variant', self.write_output('old.pptx', age=25 * 3600))
+        self.assertIsNone(self.cache.get('a' * 64, 'variant'))
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, 'old.pptx')))
+        
+        self.cache.put('b' * 64, 'variant', self.write_output('first.pptx', age=30))
+        self.cache.put('c' * 64, 'variant', self.write_output('second.pptx', age=20))
+        self.cache.get('b' * 64, 'variant')
+        self.cache.put('d' * 64, 'variant', self.write_output('third.pptx', age=10))
+        
+        self.assertEqual(sorted(os.listdir(self.output_dir)), ['first.pptx', 'third.pptx'])
+        self.assertIsNone(self.cache.get('c' * 64, 'variant'))
+    
+    def test_put_scans_only_when_due(self):
+        cache = OutputCache(self.cache.index_dir, self.output_dir, max_bytes=1000, evict_every=3)
+        scans = []
+        original_evict = cache.evict
+        cache.evict = lambda: scans.append(1) or original_evict()
+        
+        for index in range(7):
+            cache.put(f'{index:064d}', 'variant', self.write_output(f'{index}.pptx'))
+        # First put, then every third put.
+        self.assertEqual(len(scans), 3)
+        
+        cache.put('f' * 64, 'variant', self.write_output('big.pptx', size=500))
+        self.assertEqual(len(scans), 4)
+
+
+class TestOutputNames(unittest.TestCase):
+    def test_outputs_saved_in_the_same_second_do_not_collide(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            deck_path = build_sample_deck(os.path.join(temp_dir, 'deck.pptx'))
+            output_dir = os.path.join(temp_dir, 'outputs')
+            paths = {OutputGenerator(deck_path, output_dir).generate_enhanced_presentation() for _ in range(3)}
+            
+            self.assertEqual(len(paths), 3)
+            self.assertEqual(len(os.listdir(output_dir)), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
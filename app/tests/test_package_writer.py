@@ -0,0 +1,124 @@
+import unittest
+import io
+import os
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'backend'))
+
+from pptx import Presentation
+
+from processors.output_generator import OutputGenerator
+from processors.package_writer import PassthroughPackageWriter
+from deck_factory import build_feature_deck
+
+
+def read_members(path):
+    with zipfile.ZipFile(path) as archive:
+        return [(name, archive.read(name)) for name in archive.namelist()]
+
+
+def raw_member(path, name):
+    with zipfile.ZipFile(path) as archive:
+        info = archive.getinfo(name)
+        archive.fp.seek(info.header_offset + 26)
+        name_length = int.from_bytes(archive.fp.read(2), 'little')
+        extra_length = int.from_bytes(archive.fp.read(2), 'little')
+        archive.fp.seek(name_length + extra_length, 1)
+        return archive.fp.read(info.compress_size)
+
+
+class _Unseekable(io.RawIOBase):
+    # Forces zipfile to write data descriptors, as streaming zip writers do.
+    def __init__(self, target):
+        self.target = target
+    
+    def writable(self):
+        return True
+    
+    def write(self, data):
+        return self.target.write(data)
+
+
+class TestPassthroughPackageWriter(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.deck_path = build_feature_deck(os.path.join(cls.temp_dir.name, 'feature.pptx'))
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+    
+    def branded(self, deck_path, mode='shapes'):
+        generator = OutputGenerator(deck_path, tempfile.mkdtemp(dir=self.temp_dir.name), engine='xml', mode=mode)
+        output_path = generator.generate_enhanced_presentation()
+        reference_path = os.path.join(generator.output_dir, 'reference.pptx')
+        generator.output_presentation.save(reference_path)
+        return generator, output_path, reference_path
+    
+    def test_members_match_presentation_save(self):
+        for mode in OutputGenerator.MODES:
+            with self.subTest(mode=mode):
+                generator, output_path, reference_path = self.branded(self.deck_path, mode)
+                
+                self.assertEqual(read_members(output_path), read_members(reference_path))
+                self.assertGreater(generator.package_stats['copied'], 0)
+                self.assertGreater(generator.package_stats['written'], 0)
+                Presentation(output_path)
+    
+    def test_unchanged_members_keep_source_bytes(self):
+        _, output_path, _ = self.branded(self.deck_path)
+        with zipfile.ZipFile(self.deck_path) as archive:
+            media = [name for name in archive.namelist() if name.startswith('ppt/media/')]
+        
+        self.assertTrue(media)
+        for name in media:
+            self.assertEqual(raw_member(output_path, name), raw_member(self.deck_path, name))
+        self.assertNotEqual(raw_member(output_path, 'ppt/slides/slide1.xml'),
+                            raw_member(self.deck_path, 'ppt/slides/slide1.xml'))
+    
+    def test_source_with_data_descriptors(self):
+        streamed_path = os.path.join(self.temp_dir.name, 'streamed.pptx')
+        with open(streamed_path, 'wb') as f, zipfile.ZipFile(_Unseekable(f), 'w', zipfile.ZIP_DEFLATED) as target:
+            for name, blob in read_members(self.deck_path):
+                target.writestr(name, blob)
+        
+        presentation = Presentation(streamed_path)
+        output_path = os.path.join(self.temp_dir.name, 'streamed-copy.pptx')
+        stats = PassthroughPackageWriter.save(presentation, output_path, streamed_path)
+        
+        self.assertEqual(stats['written'], 0)
+        with zipfile.ZipFile(output_path) as archive:
+            self.assertIsNone(archive.testzip())
+        self.assertEqual(dict(read_members(output_path)), dict(read_members(self.deck_path)))
+    
+    def test_falls_back_when_zipfile_internals_change(self):
+        # Stand-ins for a Python release that renames or resizes the
+        # local-header internals the copy reads.
+        changes = {
+            'missing constant': lambda: delattr(zipfile, '_FH_FILENAME_LENGTH'),
+            'header size': lambda: setattr(zipfile, 'sizeFileHeader', zipfile.sizeFileHeader - 2)
+        }
+        presentation = Presentation(self.deck_path)
+        reference_path = os.path.join(self.temp_dir.name, 'fallback-reference.pptx')
+        presentation.save(reference_path)
+        
+        for label, change in changes.items():
+            with self.subTest(change=label):
+                output_path = os.path.join(self.temp_dir.name, 'fallback.pptx')
+                with mock.patch.dict(zipfile.__dict__):
+                    change()
+                    stats = PassthroughPackageWriter.save(presentation, output_path, self.deck_path)
+                
+                self.assertEqual(stats['copied'], 0)
+                with zipfile.ZipFile(output_path) as archive:
+                    self.assertIsNone(archive.testzip())
+                self.assertEqual(read_members(output_path), read_members(reference_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import os
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'backend'))
+
+from pptx import Presentation
+
+from processors.brand_profiles import BrandProfile
+from processors.branding_history import BrandingHistory
+from processors.output_generator import OutputGenerator
+from deck_factory import build_feature_deck, build_branding_corpus_deck
+
+
+def read_members(path):
+    with zipfile.ZipFile(path) as archive:
+        return {name: archive.read(name) for name in archive.namelist()}
+
+
+class TestParallelBranding(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.decks = [
+            build_branding_corpus_deck(os.path.join(cls.temp_dir.name, 'corpus.pptx')),
+            build_feature_deck(os.path.join(cls.temp_dir.name, 'feature.pptx'))
+        ]
+        cls.profile = BrandProfile.compile({'fonts': {'primary': 'Georgia'}, 'colors': {'background': 'F0F0F0'}})
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+    
+    def brand(self, deck_path, **options):
+        options.setdefault('engine', 'xml')
+        generator = OutputGenerator(deck_path, tempfile.mkdtemp(dir=self.temp_dir.name), **options)
+        return generator, generator.generate_enhanced_presentation(profile=self.profile)
+    
+    def test_parallel_output_matches_serial(self):
+        for deck_path in self.decks:
+            with self.subTest(deck=os.path.basename(deck_path)):
+                serial, serial_path = self.brand(deck_path)
+                parallel, parallel_path = self.brand(deck_path, workers=2, parallel_threshold=1)
+                
+                self.assertFalse(serial.parallel)
+                self.assertTrue(parallel.parallel)
+                self.assertEqual(read_members(parallel_path), read_members(serial_path))
+    
+    def test_threshold_and_engine_select_serial(self):
+        below, _ = self.brand(self.decks[0], workers=2, parallel_threshold=1000)
+        pptx_engine, _ = self.brand(self.decks[0], engine='pptx', workers=2, parallel_threshold=1)
+        
+        self.assertFalse(below.parallel)
+        self.assertFalse(pptx_engine.parallel)
+    
+    def test_parallel_with_reused_slides(self):
+        presentation = Presentation(self.decks[0])
+        presentation.slides[1].shapes.add_textbox(0, 0, 914400, 457200).text_frame.text = 'Revised'
+        revised_path = os.path.join(self.temp_dir.name, 'revised.pptx')
+        presentation.save(revised_path)
+        
+        _, serial_path = self.brand(revised_path)
+        history = BrandingHistory(tempfile.mkdtemp(dir=self.temp_dir.name))
+        self.brand(self.decks[0], history=history, lineage='deck')
+        generator, output_path = self.brand(revised_path, history=history, lineage='deck',
+                                            workers=2, parallel_threshold=1)
+        
+        self.assertTrue(generator.parallel)
+        self.assertEqual(generator.reused_slides, len(presentation.slides) - 1)
+        self.assertEqual(read_members(output_path), read_members(serial_path))
+    
+    def test_progress_reports(self):
+        for options in ({}, {'workers': 2, 'parallel_threshold': 1}, {'mode': 'master'}):
+            with self.subTest(**options):
+                reports = []
+                self.brand(self.decks[0], progress=lambda done, total: reports.append((done, total)), **options)
+                
+                self.assertEqual(reports[-1], (5, 5))
+                self.assertEqual([done for done, _ in reports], sorted(done for done, _ in reports))
+
+
+if __name__ == '__main__':
+    unittest.main()
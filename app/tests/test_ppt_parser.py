@@ -1,11 +1,17 @@
 import unittest
 import os
 import sys
+import re
+import tempfile
+import zipfile
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent / 'backend'))
 
+from pptx import Presentation
 from processors.ppt_parser import PPTParser
+from processors.xml_extractor import XMLDataExtractor
+from deck_factory import build_sample_deck
 
 
 class TestPPTParser(unittest.TestCase):
@@ -28,6 +34,59 @@ class TestPPTParser(unittest.TestCase):
             if os.path.exists(test_file):
                 os.remove(test_file)
 
+    
+    def test_inspector_matches_full_load(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            deck_path = build_sample_deck(os.path.join(temp_dir, 'deck.pptx'), slide_count=4)
+            
+            inspected = PPTParser(deck_path)
+            loaded = PPTParser(deck_path)
+            loaded.load_presentation()
+            
+            self.assertEqual(inspected.get_presentation_info(), loaded.get_presentation_info())
+            self.assertEqual(inspected.validate_presentation_structure(),
+                             loaded.validate_presentation_structure())
+            self.assertIsNone(inspected.presentation)
+    
+    def test_inspector_reports_empty_deck(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            deck_path = os.path.join(temp_dir, 'empty.pptx')
+            Presentation().save(deck_path)
+            
+            parser = PPTParser(deck_path)
+            info = parser.get_presentation_info()
+            validation = parser.validate_presentation_structure()
+            
+            self.assertEqual(info['slide_count'], 0)
+            self.assertFalse(info['has_notes'])
+            self.assertFalse(validation['is_valid'])
+    
+    def test_slide_size_without_dimensions(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            deck_path = build_sample_deck(os.path.join(temp_dir, 'deck.pptx'), slide_count=1)
+            sized_path = os.path.join(temp_dir, 'unsized.pptx')
+            with zipfile.ZipFile(deck_path) as source, zipfile.ZipFile(sized_path, 'w') as target:
+                for info in source.infolist():
+                    blob = source.read(info)
+                    if info.filename == 'ppt/presentation.xml':
+                        blob = re.sub(rb'(<p:sldSz)[^/>]*', rb'\1', blob)
+                    target.writestr(info, blob)
+            
+            info = PPTParser(sized_path).get_presentation_info()
+            metadata = XMLDataExtractor(sized_path).extract_all_data()['metadata']
+            
+            self.assertEqual(info['slide_count'], 1)
+            self.assertEqual((info['slide_width'], info['slide_height']), (None, None))
+            self.assertEqual((metadata['slide_width'], metadata['slide_height']), (None, None))
+    
+    def test_is_valid_pptx_file_rejects_non_zip(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            fake_path = os.path.join(temp_dir, 'fake.pptx')
+            with open(fake_path, 'w') as f:
+                f.write('not a zip')
+            
+            self.assertFalse(PPTParser.is_valid_pptx_file(fake_path))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'backend'))
+
+from pptx.opc.package import XmlPart
+
+from processors.presentation_cache import PresentationCache
+from deck_factory import build_sample_deck, build_feature_deck
+
+
+class TestPresentationCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.deck_path = build_sample_deck(os.path.join(self.temp_dir.name, 'deck.pptx'))
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def test_get_returns_shared_instance(self):
+        cache = PresentationCache()
+        first = cache.get(self.deck_path)
+        second = cache.get(self.deck_path)
+        self.assertIs(first, second)
+        self.assertEqual(cache.get_stats()['hits'], 1)
+    
+    def test_clone_does_not_affect_cached_presentation(self):
+        cache = PresentationCache()
+        clone = cache.clone(self.deck_path)
+        clone.slides[0].shapes.title.text = 'Changed'
+        self.assertEqual(cache.get(self.deck_path).slides[0].shapes.title.text, 'Slide 1')
+    
+    def test_clone_shares_binary_blobs(self):
+        deck_path = build_feature_deck(os.path.join(self.temp_dir.name, 'feature.pptx'))
+        cache = PresentationCache()
+        
+        def blobs(presentation):
+            parts = presentation.part.package.iter_parts()
+            return {str(part.partname): part._blob for part in parts if not isinstance(part, XmlPart)}
+        
+        original = blobs(cache.get(deck_path))
+        cloned = blobs(cache.clone(deck_path))
+        
+        self.assertTrue(any(name.startswith('/ppt/media/') for name in original))
+        self.assertEqual(original.keys(), cloned.keys())
+        for name, blob in original.items():
+            self.assertIs(cloned[name], blob)
+    
+    def test_modified_file_is_reparsed(self):
+        cache = PresentationCache()
+        first = cache.get(self.deck_path)
+        build_sample_deck(self.deck_path, slide_count=5)
+        os.utime(self.deck_path, ns=(0, os.stat(self.deck_path).st_mtime_ns + 10**9))
+        second = cache.get(self.deck_path)
+        self.assertIsNot(first, second)
+        self.assertEqual(len(second.slides), 5)
+        self.assertEqual(cache.get_stats()['entries'], 1)
+    
+    def test_eviction_respects_byte_budget(self):
+        other_path = build_sample_deck(os.path.join(self.temp_dir.name, 'other.pptx'))
+        cache = PresentationCache(max_bytes=1)
+        cache.get(self.deck_path)
+        cache.get(other_path)
+        stats = cache.get_stats()
+        self.assertEqual(stats['entries'], 1)
+        cache.get(other_path)
+        self.assertEqual(cache.get_stats()['hits'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
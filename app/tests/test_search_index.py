@@ -0,0 +1,65 @@
+import unittest
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'backend'))
+
+from utils.search_index import SearchIndex
+
+
+def _slide(index, text='', notes='', cells=None):
+    shapes = [{'text_content': {'full_text': text, 'paragraphs': []}}]
+    if cells:
+        shapes.append({'table_data': {'rows': len(cells), 'columns': len(cells[0]), 'cells': cells}})
+    return {'index': index, 'layout': '', 'shapes': shapes, 'notes': notes}
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.index = SearchIndex(os.path.join(self.temp_dir.name, 'search.db'))
+        self.index.index_deck('deck-a', 'a' * 64, 'a.pptx', [
+            _slide(0, 'Quarterly revenue review'),
+            _slide(1, 'Hiring plan', notes='Mention the Zürich office'),
+            _slide(2, cells=[['Region', 'Revenue'], ['EMEA', '1,200']]),
+        ])
+        self.index.index_deck('deck-b', 'b' * 64, 'b.pptx', [_slide(0, 'Revenue forecast')])
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def test_search_returns_slide_hits_with_snippets(self):
+        results = self.index.search('revenue')
+        hits = {(r['file_id'], r['slide_index'], r['source']) for r in results}
+        
+        self.assertEqual(hits, {('deck-a', 0, 'text'), ('deck-a', 2, 'table'), ('deck-b', 0, 'text')})
+        snippet = next(r['snippet'] for r in results if r['file_id'] == 'deck-b')
+        self.assertIn('[Revenue]', snippet)
+    
+    def test_notes_prefix_and_diacritics(self):
+        self.assertEqual(self.index.search('zurich')[0]['source'], 'notes')
+        self.assertEqual(len(self.index.search('forec*')), 1)
+        self.assertEqual(self.index.search('quarterly review')[0]['slide_index'], 0)
+    
+    def test_query_syntax_is_not_interpreted(self):
+        self.assertEqual(self.index.search('revenue OR "NEAR('), [])
+        with self.assertRaises(ValueError):
+            self.index.search('   ')
+    
+    def test_known_digest_copies_rows(self):
+        self.assertTrue(self.index.index_known_digest('deck-c', 'b' * 64, 'c.pptx'))
+        self.assertFalse(self.index.index_known_digest('deck-d', 'd' * 64, 'd.pptx'))
+        
+        self.assertEqual({r['file_id'] for r in self.index.search('forecast')}, {'deck-b', 'deck-c'})
+    
+    def test_remove_drops_entries(self):
+        self.index.remove(['deck-a'])
+        
+        self.assertEqual({r['file_id'] for r in self.index.search('revenue')}, {'deck-b'})
+        self.assertEqual(self.index.get_stats(), {'decks': 1, 'entries': 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
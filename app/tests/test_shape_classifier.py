@@ -0,0 +1,108 @@
+import unittest
+import os
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'backend'))
+
+from pptx import Presentation
+from pptx.util import Inches, Pt
+
+from processors.brand_profiles import BrandProfile
+from processors.branding_engine import BrandingEngine
+from processors.shape_classifier import ShapeFeatures
+from deck_factory import build_sample_deck, build_feature_deck, build_branding_corpus_deck
+
+
+def build_random_deck(path: str, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    prs = Presentation()
+    
+    for _ in range(6):
+        slide = prs.slides.add_slide(prs.slide_layouts[rng.choice([1, 5, 6])])
+        for _ in range(12):
+            textbox = slide.shapes.add_textbox(
+                Inches(rng.uniform(0, 5)), Inches(rng.choice([0.5, 1.49, 1.5, 1.99, 2, 3, 5])),
+                Inches(rng.choice([2, 4.99, 5, 5.01, 8])), Inches(1)
+            )
+            length = rng.choice([0, 1, 48, 49, 50, 51, 120])
+            textbox.text_frame.text = ' ' * rng.randint(0, 2) + 'x' * length + ' ' * rng.randint(0, 2)
+            if length and rng.random() < 0.6:
+                textbox.text_frame.paragraphs[0].runs[0].font.size = Pt(rng.choice([12, 20, 20.5, 28, 28.5, 40]))
+    
+    prs.save(path)
+    return path
+
+
+class TestShapeClassifier(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        root = cls.temp_dir.name
+        cls.decks = [
+            build_random_deck(os.path.join(root, 'random.pptx')),
+            build_branding_corpus_deck(os.path.join(root, 'corpus.pptx')),
+            build_feature_deck(os.path.join(root, 'feature.pptx')),
+            build_sample_deck(os.path.join(root, 'sample.pptx'), slide_count=4),
+        ]
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+    
+    def assert_agrees_with_scalar(self, engine):
+        for deck in self.decks:
+            with self.subTest(deck=os.path.basename(deck)):
+                batch = engine.classify_slides(Presentation(deck).slides)
+                
+                slides = Presentation(deck).slides
+                for idx, slide in enumerate(slides):
+                    expected = [engine.determine_shape_type(shape, idx) for shape in slide.shapes]
+                    self.assertEqual(batch[idx], expected, f"slide {idx}")
+    
+    def test_agrees_with_scalar_rules(self):
+        self.assert_agrees_with_scalar(BrandingEngine())
+    
+    def test_agrees_with_custom_thresholds(self):
+        profile = BrandProfile.compile({'classification': {
+            'first_slide_title_top': 1.0,
+            'title_top': 0.75,
+            'heading_text_length': 100,
+            'heading_min_width': 4.0,
+            'title_font_size': 36,
+            'heading_font_size': 12
+        }})
+        self.assert_agrees_with_scalar(BrandingEngine(profile=profile))
+    
+    def test_thresholds_change_labels(self):
+        default = BrandingEngine().classify_slides(Presentation(self.decks[0]).slides)
+        loose = BrandProfile.compile({'classification': {'title_top': 10}})
+        titles = BrandingEngine(profile=loose).classify_slides(Presentation(self.decks[0]).slides)
+        
+        self.assertNotEqual(default, titles)
+        self.assertTrue(all(label in ('title', 'none') for slide in titles for label in slide))
+    
+    def test_inherited_placeholder_geometry(self):
+        prs = Presentation(self.decks[3])
+        features = ShapeFeatures(prs.slides)
+        title = prs.slides[0].shapes.title
+        
+        self.assertIsNone(title._element.y)
+        self.assertEqual(int(features.top[0]), title.top)
+        self.assertEqual(features.counts, [len(slide.shapes) for slide in prs.slides])
+    
+    def test_unknown_geometry_left_to_scalar(self):
+        prs = Presentation()
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        textbox = slide.shapes.add_textbox(Inches(1), Inches(1), Inches(1), Inches(1))
+        textbox.text_frame.text = 'Floating'
+        xfrm = textbox._element.spPr.xfrm
+        xfrm.getparent().remove(xfrm)
+        
+        self.assertEqual(BrandingEngine().classify_slides(prs.slides), [[None]])
+
+
+if __name__ == '__main__':
+    unittest.main()
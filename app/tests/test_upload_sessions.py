@@ -0,0 +1,102 @@
+import unittest
+import hashlib
+import io
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'backend'))
+
+from utils.file_handler import FileHandler
+from utils.upload_sessions import UploadSessionManager
+from deck_factory import build_sample_deck
+
+
+class TestUploadSessionManager(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        handler = FileHandler(
+            os.path.join(self.temp_dir.name, 'uploads'),
+            os.path.join(self.temp_dir.name, 'outputs'),
+            content_addressed=True
+        )
+        self.manager = UploadSessionManager(handler)
+        self.manager.MIN_CHUNK_SIZE = 1024
+        
+        deck_path = build_sample_deck(os.path.join(self.temp_dir.name, 'deck.pptx'))
+        with open(deck_path, 'rb') as f:
+            self.data = f.read()
+        self.chunk_size = 8 * 1024
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def _chunk(self, index):
+        start = index * self.chunk_size
+        return io.BytesIO(self.data[start:start + self.chunk_size])
+    
+    def test_out_of_order_chunks_finalize_to_same_digest(self):
+        session = self.manager.create_session('deck.pptx', len(self.data), self.chunk_size)
+        session_id = session['session_id']
+        order = list(range(session['chunk_count']))
+        order = order[1:] + order[:1]
+        
+        for index in order:
+            status = self.manager.write_chunk(session_id, index, self._chunk(index))
+        
+        self.assertTrue(status['complete'])
+        self.assertEqual(status['received_ranges'], [[0, len(self.data)]])
+        
+        saved = self.manager.finalize(session_id)
+        self.assertEqual(saved['sha256'], hashlib.sha256(self.data).hexdigest())
+        with open(saved['path'], 'rb') as f:
+            self.assertEqual(f.read(), self.data)
+    
+    def test_interrupted_chunk_retry_finalizes_to_true_digest(self):
+        session = self.manager.create_session('deck.pptx', len(self.data), self.chunk_size)
+        session_id = session['session_id']
+        
+        class DisconnectingStream(io.BytesIO):
+            # Delivers part of the chunk, then fails like a dropped client.
+            def read(self, size=-1):
+                if self.tell() >= 3000:
+                    raise OSError('client disconnected')
+                return super().read(min(size, 3000))
+        
+        self.manager.write_chunk(session_id, 0, self._chunk(0))
+        with self.assertRaises(OSError):
+            self.manager.write_chunk(session_id, 1, DisconnectingStream(self._chunk(1).getvalue()))
+        
+        for index in range(1, session['chunk_count']):
+            status = self.manager.write_chunk(session_id, index, self._chunk(index))
+        
+        self.assertTrue(status['complete'])
+        saved = self.manager.finalize(session_id)
+        self.assertEqual(saved['sha256'], hashlib.sha256(self.data).hexdigest())
+    
+    def test_status_reports_missing_ranges(self):
+        session = self.manager.create_session('deck.pptx', len(self.data), self.chunk_size)
+        session_id = session['session_id']
+        self.manager.write_chunk(session_id, 0, self._chunk(0))
+        self.manager.write_chunk(session_id, 2, self._chunk(2))
+        
+        status = self.manager.get_status(session_id)
+        self.assertEqual(status['received_ranges'][0], [0, self.chunk_size])
+        self.assertIn(1, status['missing_chunks'])
+        with self.assertRaises(ValueError):
+            self.manager.finalize(session_id)
+    
+    def test_short_chunk_is_rejected(self):
+        session = self.manager.create_session('deck.pptx', len(self.data), self.chunk_size)
+        with self.assertRaises(ValueError):
+            self.manager.write_chunk(session['session_id'], 0, io.BytesIO(b'short'))
+        self.assertEqual(self.manager.get_status(session['session_id'])['received_chunks'], [])
+    
+    def test_unknown_session(self):
+        with self.assertRaises(KeyError):
+            self.manager.get_status('../../etc')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import os
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'backend'))
+
+from processors.brand_profiles import BrandProfile
+from processors.output_generator import OutputGenerator
+from deck_factory import build_sample_deck, build_feature_deck, build_branding_corpus_deck
+
+
+class TestXMLBrandingWriter(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        root = cls.temp_dir.name
+        cls.decks = [
+            build_branding_corpus_deck(os.path.join(root, 'corpus.pptx')),
+            build_feature_deck(os.path.join(root, 'feature.pptx')),
+            build_sample_deck(os.path.join(root, 'sample.pptx'), slide_count=5),
+        ]
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+    
+    def brand(self, deck, engine, profile=None):
+        output_dir = tempfile.mkdtemp(dir=self.temp_dir.name)
+        generator = OutputGenerator(deck, output_dir, profile=profile, engine=engine)
+        with zipfile.ZipFile(generator.generate_enhanced_presentation()) as archive:
+            return {name: archive.read(name) for name in archive.namelist()}
+    
+    def assert_engines_identical(self, profile=None):
+        for deck in self.decks:
+            with self.subTest(deck=os.path.basename(deck)):
+                expected = self.brand(deck, 'pptx', profile)
+                actual = self.brand(deck, 'xml', profile)
+                
+                self.assertEqual(sorted(actual), sorted(expected))
+                for name, data in expected.items():
+                    self.assertEqual(actual[name], data, name)
+    
+    def test_matches_pptx_engine_byte_for_byte(self):
+        self.assert_engines_identical()
+    
+    def test_matches_pptx_engine_with_custom_profile(self):
+        self.assert_engines_identical(BrandProfile.compile({
+            'fonts': {'primary': 'Georgia', 'body_size': 17.5},
+            'colors': {'text_dark': '#202020'},
+            'alignment': {'body': 'justify', 'heading': 'right'},
+            'spacing': {'line_spacing': 1.05}
+        }))
+    
+    def test_corpus_is_branded(self):
+        output = self.brand(self.decks[0], 'xml')
+        slide = output['ppt/slides/slide2.xml'].decode('utf-8')
+        
+        self.assertIn('typeface="Frutiger LT"', slide)
+        self.assertNotIn('schemeClr', slide)
+        self.assertNotIn('gradFill', slide)
+    
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            OutputGenerator(self.decks[0], self.temp_dir.name, engine='fast')
+
+
+if __name__ == '__main__':
+    unittest.main()
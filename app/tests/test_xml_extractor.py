@@ -0,0 +1,74 @@
+import unittest
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'backend'))
+
+from processors.data_extractor import DataExtractor
+from processors.xml_extractor import XMLDataExtractor
+from deck_factory import build_sample_deck, build_feature_deck, build_untyped_shape_deck
+
+
+def _normalize(data):
+    # Branding fonts/colors come from sets, so their order is arbitrary.
+    data['branding']['fonts'] = sorted(data['branding']['fonts'])
+    data['branding']['colors'] = sorted(data['branding']['colors'])
+    return data
+
+
+class TestXMLDataExtractor(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.sample_path = build_sample_deck(os.path.join(cls.temp_dir.name, 'sample.pptx'), slide_count=4)
+        cls.feature_path = build_feature_deck(os.path.join(cls.temp_dir.name, 'feature.pptx'))
+        cls.untyped_path = build_untyped_shape_deck(os.path.join(cls.temp_dir.name, 'untyped.pptx'))
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+    
+    def assertEquivalent(self, path):
+        expected = _normalize(DataExtractor(path).extract_all_data())
+        actual = _normalize(XMLDataExtractor(path).extract_all_data())
+        
+        self.assertEqual(actual['metadata'], expected['metadata'])
+        self.assertEqual(actual['branding'], expected['branding'])
+        self.assertEqual(len(actual['slides']), len(expected['slides']))
+        for actual_slide, expected_slide in zip(actual['slides'], expected['slides']):
+            self.assertEqual(actual_slide, expected_slide)
+    
+    def test_sample_deck_matches_pptx_engine(self):
+        self.assertEquivalent(self.sample_path)
+    
+    def test_feature_deck_matches_pptx_engine(self):
+        self.assertEquivalent(self.feature_path)
+    
+    def test_untyped_shape_deck_matches_pptx_engine(self):
+        self.assertEquivalent(self.untyped_path)
+        shapes = XMLDataExtractor(self.untyped_path).extract_all_data()['slides'][0]['shapes']
+        self.assertEqual(shapes[-1]['type'], 'None')
+        self.assertEqual(shapes[-1]['text_content']['full_text'], 'No geometry')
+    
+    def test_feature_deck_covers_shape_kinds(self):
+        data = XMLDataExtractor(self.feature_path).extract_all_data()
+        shape_types = {shape['type'].split(' ')[0] for slide in data['slides'] for shape in slide['shapes']}
+        
+        for expected in ('PLACEHOLDER', 'PICTURE', 'AUTO_SHAPE', 'TEXT_BOX', 'GROUP', 'FREEFORM', 'TABLE', 'CHART'):
+            self.assertIn(expected, shape_types)
+        self.assertEqual(data['branding']['colors'], ['#123456'])
+    
+    def test_iter_records_matches_extract_all_data(self):
+        extractor = XMLDataExtractor(self.feature_path)
+        records = list(extractor.iter_records())
+        data = extractor.extract_all_data()
+        
+        self.assertEqual([r['type'] for r in records[-2:]], ['branding', 'metadata'])
+        self.assertEqual([r['data'] for r in records[:-2]], data['slides'])
+        self.assertEqual(records[-1]['data'], data['metadata'])
+
+
+if __name__ == '__main__':
+    unittest.main()